@@ -0,0 +1,107 @@
+##########################################################################
+# Copyright (c) 2023-2024 Reinhard Caspary                               #
+# <reinhard.caspary@phoenixd.uni-hannover.de>                            #
+# This program is free software under the terms of the MIT license.      #
+##########################################################################
+#
+# Benchmark of the compression presets on typical container items. For
+# each preset, the compression ratio and the throughput of compression
+# and decompression are printed. Presets requiring a missing module are
+# skipped.
+#
+# Usage: python benchmarks/compression.py [-s SIZE] [-p PRESET ...]
+#
+##########################################################################
+
+import argparse
+import io
+import time
+from zipfile import ZipFile
+
+import numpy as np
+
+from scidatacontainer.compression import PRESETS, preset
+from scidatacontainer.filebase import TabSeparatedValuesFile
+from scidatacontainer.zipstream import ZipWriter, compress, member_info, read_member
+
+
+def detector_data(size: int) -> bytes:
+    """Return NumPy file of 16 bit camera frames with dark noise and a
+    few bright spots."""
+    rng = np.random.default_rng(1)
+    count = max(1, size // (2 * 512 * 512))
+    frames = rng.poisson(100, (count, 512, 512)).astype(np.uint16)
+    y, x = np.mgrid[:512, :512]
+    for frame in frames:
+        for _ in range(5):
+            cy, cx = rng.uniform(0, 512, 2)
+            spot = 3000 * np.exp(-((x - cx) ** 2 + (y - cy) ** 2) / 50)
+            frame += spot.astype(np.uint16)
+    with io.BytesIO() as fp:
+        np.save(fp, frames)
+        return fp.getvalue()
+
+
+def tsv_data(size: int) -> bytes:
+    """Return tab separated table of measured values."""
+    rng = np.random.default_rng(2)
+    rows = max(1, size // 80)
+    t = np.arange(rows) * 0.001
+    table = np.column_stack(
+        [
+            t,
+            np.sin(t) + rng.normal(0, 0.01, rows),
+            np.round(rng.normal(20, 0.1, rows), 3),
+            rng.integers(0, 4096, rows),
+        ]
+    )
+    return TabSeparatedValuesFile(table.tolist()).encode()
+
+
+def measure(name: str, data: bytes) -> tuple[float, float, float]:
+    """Return compression ratio and the throughput of compression and
+    decompression in MB/s."""
+    compress_type, compresslevel = preset(name)
+    zinfo = member_info("item", (2024, 1, 1, 0, 0, 0), compress_type)
+    start = time.perf_counter()
+    compressed = compress(zinfo, data, compresslevel)
+    seconds = time.perf_counter() - start
+
+    with io.BytesIO() as fp:
+        zfp = ZipWriter(fp)
+        zfp.write(zinfo, compressed)
+        zfp.close()
+        fp.seek(0)
+        with ZipFile(fp) as zfp:
+            start = time.perf_counter()
+            assert read_member(zfp, zfp.getinfo("item")) == data
+            read_seconds = time.perf_counter() - start
+
+    mb = len(data) / 1e6
+    return len(data) / len(compressed), mb / seconds, mb / read_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compression presets.")
+    parser.add_argument("-s", "--size", type=float, default=32, help="size in MB")
+    parser.add_argument("-p", "--preset", nargs="*", default=list(PRESETS))
+    args = parser.parse_args()
+
+    size = int(args.size * 1e6)
+    datasets = {"detector": detector_data(size), "tsv": tsv_data(size)}
+    print(
+        "%-10s %-13s %7s %12s %12s"
+        % ("data", "preset", "ratio", "comp MB/s", "dec MB/s")
+    )
+    for dataset, data in datasets.items():
+        for name in args.preset:
+            try:
+                ratio, comp, dec = measure(name, data)
+            except NotImplementedError as e:
+                print("%-10s %-13s skipped: %s" % (dataset, name, e))
+                continue
+            print("%-10s %-13s %7.2f %12.1f %12.1f" % (dataset, name, ratio, comp, dec))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+##########################################################################
+# Copyright (c) 2023-2024 Reinhard Caspary                               #
+# <reinhard.caspary@phoenixd.uni-hannover.de>                            #
+# This program is free software under the terms of the MIT license.      #
+##########################################################################
+#
+# Benchmark of the hash of JSON items. The streaming hash of
+# JsonFile.hash() is compared with the former implementation, which
+# builds the whole string representation by JsonFile.sortit(). Both must
+# result in the same digest. For each dataset, the runtime and the peak
+# memory allocated by Python are printed.
+#
+# Usage: python benchmarks/json_hash.py [-n ENTRIES]
+#
+##########################################################################
+
+import argparse
+import hashlib
+import random
+import time
+import tracemalloc
+
+from scidatacontainer.filebase import JsonFile
+
+
+def parameter_data(entries: int) -> dict:
+    """Return flat dictionary of named parameters."""
+    rng = random.Random(1)
+    return {
+        "param%07d" % i: rng.choice([rng.random(), rng.randint(0, 1000), "on", None])
+        for i in range(entries)
+    }
+
+
+def result_data(entries: int) -> dict:
+    """Return nested dictionary of measurement results."""
+    rng = random.Random(2)
+    runs = max(1, entries // 100)
+    return {
+        "run%05d"
+        % i: {
+            "values": [rng.random() for _ in range(90)],
+            "settings": {"gain": rng.randint(1, 8), "label": "run %d" % i},
+            "valid": True,
+        }
+        for i in range(runs)
+    }
+
+
+def sortit_hash(item: JsonFile) -> str:
+    """Former implementation of JsonFile.hash()."""
+    data = bytes(item.sortit(item.data), item.charset)
+    return hashlib.sha256(data).hexdigest()
+
+
+def measure(func, item: JsonFile) -> tuple[str, float, float]:
+    """Return digest, runtime in seconds and peak memory in MB. The
+    memory is traced in a separate run, because tracing slows down the
+    function considerably."""
+    start = time.perf_counter()
+    digest = func(item)
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(item)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return digest, seconds, peak / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON item hashes.")
+    parser.add_argument("-n", "--entries", type=int, default=300000)
+    args = parser.parse_args()
+
+    datasets = {
+        "parameter": parameter_data(args.entries),
+        "result": result_data(args.entries),
+    }
+    methods = {"sortit": sortit_hash, "stream": JsonFile.hash}
+    print("%-10s %-8s %10s %10s" % ("data", "method", "seconds", "peak MB"))
+    for dataset, data in datasets.items():
+        item = JsonFile(data)
+        digests = set()
+        for name, func in methods.items():
+            digest, seconds, peak = measure(func, item)
+            digests.add(digest)
+            print("%-10s %-8s %10.3f %10.1f" % (dataset, name, seconds, peak))
+        assert len(digests) == 1, "Different digests!"
+
+
+if __name__ == "__main__":
+    main()
@@ -28,15 +28,21 @@ __all__ = [
     "load_config",
     "register",
     "Container",
+    "Session",
+    "DownloadCache",
+    "CompressionPolicy",
 ]
 
 import typing
 from importlib import import_module
 
+from .cache import DownloadCache
+from .compression import CompressionPolicy
 from .config import load_config
 from .container import MODELVERSION as modelVersion
 from .container import AbstractContainer, timestamp
 from .filebase import AbstractFile
+from .session import Session
 
 __version__ = "1.2.0"
 
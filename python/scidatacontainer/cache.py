@@ -0,0 +1,215 @@
+##########################################################################
+# Copyright (c) 2023-2024 Reinhard Caspary                               #
+# <reinhard.caspary@phoenixd.uni-hannover.de>                            #
+# This program is free software under the terms of the MIT license.      #
+##########################################################################
+#
+# This module provides the class DownloadCache, which keeps downloaded
+# container files in a local directory. Static containers never change
+# and are served from the cache without any network traffic. Other
+# containers are only cached if revalidation is enabled. They are then
+# served from the cache after the server confirmed by a conditional
+# request that they were not modified.
+#
+# Each container is stored as "<uuid>.zdc" together with an index file
+# "<uuid>.json", which contains the container hash, the static flag, the
+# SHA-256 digest of the container file and the validators (ETag and
+# Last-Modified) of the server response. A cached container is only used
+# if it matches its index entry, because both files are replaced
+# separately and may be out of sync after concurrent downloads. The
+# least recently used containers are deleted as soon as the total size
+# of all container files exceeds the size limit.
+#
+# The function get_cache() returns a cache shared by all containers with
+# the same configuration parameters:
+#
+# Parameter                            | key
+# -------------------------------------+------------
+# cache directory (empty: no cache)    | cache
+# size limit in megabytes              | cachesize
+# revalidate other containers (yes/no) | revalidate
+#
+##########################################################################
+
+import hashlib
+import json
+import os
+import tempfile
+import typing
+from threading import Lock
+
+# Shared caches indexed by their parameters
+_caches = {}
+_lock = Lock()
+
+# Block size for copying and hashing container files
+CHUNK_SIZE = 1024 * 1024
+
+
+class DownloadCache:
+    """Local cache of downloaded container files with LRU eviction."""
+
+    def __init__(
+        self,
+        directory: str,
+        max_size: int = 1024 * 1024 * 1024,
+        revalidate: bool = False,
+    ) -> None:
+        """Construct a DownloadCache object.
+
+        Args:
+            directory: Cache directory. It is created if necessary.
+            max_size: Maximum total size of all cached files in bytes.
+            revalidate: If true, containers which are not static are
+                cached as well and revalidated by the server on each
+                access.
+        """
+        self.directory: str = os.path.abspath(os.path.expanduser(directory))
+        self.max_size: int = max_size
+        self.revalidate: bool = revalidate
+        self._lock: Lock = Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, uuid: str, suffix: str = ".zdc") -> str:
+        """Return the name of a file in the cache."""
+        return os.path.join(self.directory, uuid + suffix)
+
+    def lookup(self, uuid: str) -> dict | None:
+        """Return the index entry of a cached container or None.
+
+        Args:
+            uuid: UUID used to download the container.
+
+        Returns:
+            dict: Index entry with the keys "hash", "static", "digest",
+                "etag" and "modified".
+        """
+        try:
+            with open(self.path(uuid, ".json"), "r", encoding="utf8") as fp:
+                entry = json.load(fp)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(self.path(uuid)):
+            return None
+        return entry
+
+    def verify(self, uuid: str, entry: dict) -> bool:
+        """Return true, if the cached container file matches the SHA-256
+        digest of its index entry."""
+        h = hashlib.sha256()
+        try:
+            with open(self.path(uuid), "rb") as fp:
+                while chunk := fp.read(CHUNK_SIZE):
+                    h.update(chunk)
+        except OSError:
+            return False
+        return h.hexdigest() == entry.get("digest")
+
+    def touch(self, uuid: str):
+        """Mark a cached container as recently used."""
+        try:
+            os.utime(self.path(uuid))
+        except OSError:
+            pass
+
+    def store(
+        self, uuid: str, fp: typing.IO[bytes], content: dict, headers: dict = {}
+    ) -> bool:
+        """Copy a downloaded container file into the cache.
+
+        Containers which are not static are only stored, if revalidation
+        is enabled and the server response contains a validator.
+
+        Args:
+            uuid: UUID used to download the container.
+            fp: File object of the container file.
+            content: Content of the item content.json.
+            headers: Headers of the server response.
+
+        Returns:
+            bool: True, if the container was stored.
+        """
+        entry = {
+            "hash": content.get("hash"),
+            "static": bool(content.get("static")),
+            "etag": headers.get("ETag"),
+            "modified": headers.get("Last-Modified"),
+        }
+        if not entry["static"]:
+            if not self.revalidate or not (entry["etag"] or entry["modified"]):
+                return False
+
+        # Replace existing files atomically
+        def copy(dst):
+            h = hashlib.sha256()
+            fp.seek(0)
+            while chunk := fp.read(CHUNK_SIZE):
+                h.update(chunk)
+                dst.write(chunk)
+            entry["digest"] = h.hexdigest()
+
+        self._replace(self.path(uuid), copy)
+        data = json.dumps(entry).encode("utf8")
+        self._replace(self.path(uuid, ".json"), lambda dst: dst.write(data))
+        self._evict()
+        return True
+
+    def _replace(self, fn: str, write: typing.Callable):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as dst:
+                write(dst)
+            os.replace(tmp, fn)
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+    def remove(self, uuid: str):
+        """Remove a container from the cache."""
+        for suffix in (".zdc", ".json"):
+            try:
+                os.remove(self.path(uuid, suffix))
+            except OSError:
+                pass
+
+    def _evict(self):
+        """Delete least recently used containers until the total size is
+        below the size limit."""
+        with self._lock:
+            files = []
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".zdc") and entry.is_file():
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, stat.st_size, entry.name[:-4]))
+            total = sum(size for _, size, _ in files)
+            for _, size, uuid in sorted(files):
+                if total <= self.max_size:
+                    break
+                self.remove(uuid)
+                total -= size
+
+
+def get_cache(config: dict | None = None) -> DownloadCache | None:
+    """Return the shared download cache for the given configuration.
+
+    Args:
+        config: Configuration dictionary as returned by load_config().
+            The cache is disabled, if the key "cache" is missing or
+            empty. The key "cachesize" is the size limit in megabytes
+            (default: 1024) and the key "revalidate" enables the
+            revalidation of containers which are not static.
+
+    Returns:
+        DownloadCache: Shared cache or None.
+    """
+    if config is None or not config.get("cache"):
+        return None
+    directory = os.path.abspath(os.path.expanduser(config["cache"]))
+    max_size = int(float(config.get("cachesize") or 1024) * 1024 * 1024)
+    revalidate = str(config.get("revalidate", "")).lower() in ("1", "true", "yes")
+
+    key = (directory, max_size, revalidate)
+    with _lock:
+        if key not in _caches:
+            _caches[key] = DownloadCache(directory, max_size, revalidate)
+        return _caches[key]
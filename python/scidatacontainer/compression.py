@@ -0,0 +1,221 @@
+##########################################################################
+# Copyright (c) 2023-2024 Reinhard Caspary                               #
+# <reinhard.caspary@phoenixd.uni-hannover.de>                            #
+# This program is free software under the terms of the MIT license.      #
+##########################################################################
+#
+# This module provides the class CompressionPolicy, which selects the
+# compression method of each container item. Compressing data which is
+# already compressed, like PNG images or random looking numbers, costs
+# a lot of CPU time for almost no gain. Such items are stored instead.
+#
+# The method is selected in the following order:
+#
+# 1. by the file extension of the item,
+# 2. by the size of the item (small items are stored),
+# 3. by a quick compression of the first block of the item (items with
+#    a bad compression ratio are stored).
+#
+# Otherwise, the compression method of the container is used. The policy
+# also collects statistics of all compressed items, which may be used to
+# tune its parameters.
+#
+# The function preset() returns compression method and level of the
+# following named presets:
+#
+# Name         | Method    | Level | Usage
+# -------------+-----------+-------+------------------------------------
+# stored       | STORED    |       | no compression
+# deflate      | DEFLATED  | 6     | default, readable by every ZIP tool
+# deflate-fast | DEFLATED  | 1     | faster, slightly larger
+# zstd         | ZSTANDARD | 3     | fast and dense (module zstandard)
+# zstd-fast    | ZSTANDARD | 1     | fastest (module zstandard)
+# zstd-dense   | ZSTANDARD | 19    | dense and slow (module zstandard)
+# bzip2        | BZIP2     | 9     | dense text data
+# lzma         | LZMA      | 6     | dense and slow
+# lzma-dense   | LZMA      | 9     | densest and slowest
+#
+##########################################################################
+
+import zlib
+from threading import Lock
+from zipfile import ZIP_BZIP2, ZIP_DEFLATED, ZIP_LZMA, ZIP_STORED, ZipInfo
+
+from .zipstream import ZIP_ZSTANDARD
+
+# Named presets of compression method and level
+PRESETS = {
+    "stored": (ZIP_STORED, None),
+    "deflate": (ZIP_DEFLATED, 6),
+    "deflate-fast": (ZIP_DEFLATED, 1),
+    "zstd": (ZIP_ZSTANDARD, 3),
+    "zstd-fast": (ZIP_ZSTANDARD, 1),
+    "zstd-dense": (ZIP_ZSTANDARD, 19),
+    "bzip2": (ZIP_BZIP2, 9),
+    "lzma": (ZIP_LZMA, 6),
+    "lzma-dense": (ZIP_LZMA, 9),
+}
+
+# File extensions of formats which are already compressed
+STORED_SUFFIXES = (
+    "png",
+    "jpg",
+    "jpeg",
+    "gif",
+    "webp",
+    "zip",
+    "zdc",
+    "gz",
+    "bz2",
+    "xz",
+    "zst",
+)
+
+
+class CompressionPolicy:
+    """Policy selecting the compression method and level of each item."""
+
+    def __init__(
+        self,
+        suffixes: dict | None = None,
+        min_size: int = 0,
+        sample_size: int = 64 * 1024,
+        min_saving: float = 0.05,
+    ) -> None:
+        """Construct a CompressionPolicy object.
+
+        Args:
+            suffixes: Dictionary mapping file extensions to a numeric
+                constant for the compression method or to a tuple of method
+                and level. Default: Store the extensions STORED_SUFFIXES.
+            min_size: Items smaller than this number of bytes are stored.
+            sample_size: Number of bytes at the beginning of an item which
+                are compressed to estimate the compression ratio. No
+                estimation, if this is zero.
+            min_saving: Items are stored, if their sample shrinks by less
+                than this fraction.
+        """
+        if suffixes is None:
+            suffixes = {ext: ZIP_STORED for ext in STORED_SUFFIXES}
+        self.suffixes: dict = {ext.lower(): m for ext, m in suffixes.items()}
+        self.min_size: int = min_size
+        self.sample_size: int = sample_size
+        self.min_saving: float = min_saving
+        self.rejected: int = 0
+        self._stats: dict = {}
+        self._lock: Lock = Lock()
+
+    def select(
+        self,
+        path: str,
+        data: bytes,
+        size: int | None = None,
+        default: tuple[int, int | None] = (ZIP_STORED, None),
+    ) -> tuple[int, int | None]:
+        """Return compression method and level of an item.
+
+        Args:
+            path: Name of the item.
+            data: Encoded data or at least the first sample_size bytes of
+                the item.
+            size: Size of the item. Default is the length of data.
+            default: Compression method and level of the container.
+
+        Returns:
+            tuple: Numeric constant for the compression method and the
+                compression level.
+        """
+        method = self._suffix(path)
+        if method is not None:
+            return method
+        if size is None:
+            size = len(data)
+        if size < self.min_size:
+            return ZIP_STORED, None
+        if default[0] != ZIP_STORED and self.sample_size > 0:
+            sample = memoryview(data)[: self.sample_size]
+            if len(sample) and not self._compressible(sample):
+                with self._lock:
+                    self.rejected += 1
+                return ZIP_STORED, None
+        return default
+
+    def accepts(self, path: str, compress_type: int, default: int) -> bool:
+        """Return true, if the given compression method of an item may
+        have been selected by this policy.
+
+        Args:
+            path: Name of the item.
+            compress_type: Numeric constant for the compression method.
+            default: Compression method of the container.
+        """
+        method = self._suffix(path)
+        if method is not None:
+            return compress_type == method[0]
+        return compress_type in (ZIP_STORED, default)
+
+    def _suffix(self, path: str) -> tuple[int, int | None] | None:
+        """Return method and level selected by the file extension."""
+        name = path.rsplit("/", 1)[-1]
+        if "." not in name:
+            return None
+        method = self.suffixes.get(name.rsplit(".", 1)[1].lower())
+        if method is None or isinstance(method, tuple):
+            return method
+        return method, None
+
+    def _compressible(self, sample: memoryview) -> bool:
+        """Return true, if the sample shrinks by at least min_saving."""
+        size = len(zlib.compress(sample, 1))
+        return size <= len(sample) * (1.0 - self.min_saving)
+
+    def record(self, zinfo: ZipInfo, seconds: float = 0.0):
+        """Add a compressed item to the statistics.
+
+        Args:
+            zinfo: Member information of the item.
+            seconds: Time spent on the compression.
+        """
+        with self._lock:
+            entry = self._stats.setdefault(
+                zinfo.compress_type,
+                {"items": 0, "size": 0, "compress_size": 0, "seconds": 0.0},
+            )
+            entry["items"] += 1
+            entry["size"] += zinfo.file_size
+            entry["compress_size"] += zinfo.compress_size
+            entry["seconds"] += seconds
+
+    def stats(self) -> dict:
+        """Return the statistics of all items compressed so far.
+
+        Returns:
+            dict: Dictionary mapping the numeric constant of each
+                compression method to a dictionary with the number of
+                items, their total size, their total compressed size and
+                the time spent on their compression in seconds.
+        """
+        with self._lock:
+            return {method: dict(entry) for method, entry in self._stats.items()}
+
+    def reset(self):
+        """Clear the statistics."""
+        with self._lock:
+            self._stats = {}
+            self.rejected = 0
+
+
+def preset(name: str) -> tuple[int, int | None]:
+    """Return compression method and level of a named preset.
+
+    Args:
+        name: Name of the preset.
+
+    Returns:
+        tuple: Numeric constant for the compression method and the
+            compression level.
+    """
+    try:
+        return PRESETS[name.lower()]
+    except KeyError:
+        raise ValueError("Unknown compression preset '%s'!" % name) from None
@@ -15,6 +15,12 @@
 # author organization | organization
 # server URL          | server
 # server key          | key
+# server timeout      | timeout
+# server retries      | retries
+# retry backoff       | backoff
+# cache directory     | cache
+# cache size in MB    | cachesize
+# cache revalidation  | revalidate
 #
 # The values of these parameters are taken either from environment
 # variables or a config file. Both options are optional. Data from the
@@ -56,7 +62,8 @@ def load_config(config_path: str = None, **kwargs) -> dict:
 
     Returns:
         dict: A dictionary containing information strings with keys "author",\
-              "email", "orcid", "organization", "server", "key".
+              "email", "orcid", "organization", "server", "key", "timeout",\
+              "retries", "backoff", "cache", "cachesize", "revalidate".
     """
 
     # Initialize config dictionary
@@ -67,6 +74,12 @@ def load_config(config_path: str = None, **kwargs) -> dict:
         "organization": "",
         "server": "",
         "key": "",
+        "timeout": "",
+        "retries": "",
+        "backoff": "",
+        "cache": "",
+        "cachesize": "",
+        "revalidate": "",
     }
 
     # Get default values from environment variables
@@ -11,29 +11,81 @@
 #
 ##########################################################################
 
+import asyncio
 import copy
+import functools
 import hashlib
 import io
+import itertools
 import json
+import os
 import pathlib
+import shutil
+import tempfile
+import time
 import typing
 import uuid
 from abc import ABC
 from collections.abc import Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import contextmanager
 from datetime import datetime, timezone
-from queue import Queue
-from threading import Thread
+from threading import Lock, local
 from types import SimpleNamespace
-from zipfile import ZIP_DEFLATED, ZipFile
+from zipfile import (
+    ZIP_DEFLATED,
+    ZIP_STORED,
+    ZipFile,
+    ZipInfo,
+    sizeFileHeader,
+)
 
 import requests
 
+from .cache import DownloadCache, get_cache
+from .compression import CompressionPolicy, preset
 from .config import load_config
-from .filebase import BinaryFile, JsonFile, TextFile
+from .filebase import AbstractFile, BinaryFile, JsonFile, TextFile
+from .session import get_session
+from .zipstream import (
+    CHUNK_SIZE,
+    ZipWriter,
+    compress,
+    data_offset,
+    imap,
+    member_info,
+    open_member,
+    read_member,
+)
 
 # Version of the implemented data model
 MODELVERSION = "1.0.1"
 
+# Version of the data model, which introduced the attributes 'hashScheme'
+# and 'itemHashes' of content.json. Only containers using them declare
+# this version.
+HASH_SCHEME_VERSION = "1.0.2"
+
+# Hash schemes selected by the attribute 'hashScheme' of content.json.
+# The default scheme is a sequential SHA-256 over the names and data of
+# all items. The tree scheme combines the SHA-256 digests of the items,
+# which may be calculated concurrently.
+HASH_SEQUENTIAL = "sha256"
+HASH_TREE = "sha256-tree"
+HASH_SCHEMES = (HASH_SEQUENTIAL, HASH_TREE)
+
+# In-memory items with a known encoded size of at least this number of
+# bytes are hashed and written chunkwise instead of being encoded as a
+# whole
+STREAM_SIZE = 16 * 1024 * 1024
+
 
 ##########################################################################
 # Timestamp function
@@ -66,15 +118,26 @@ class AbstractContainer(ABC):
     _classes = {dict: JsonFile, str: TextFile, bytes: BinaryFile}
     _formats = [TextFile]
 
+    # Downloaded containers up to this size are kept in memory, larger
+    # ones are spooled to a temporary file
+    spool_size = 16 * 1024 * 1024
+
     def __init__(
         self,
         items: dict | None = None,
         file: str | None = None,
         uuid: str | None = None,
         config: dict | None = None,
-        compression: int = ZIP_DEFLATED,
+        compression: int | str = ZIP_DEFLATED,
         compresslevel: int = -1,
         ignore_items: list[str] = [],
+        lazy: bool = False,
+        mmap: bool = False,
+        workers: int = 1,
+        processes: int = 0,
+        session: requests.Session | None = None,
+        cache: DownloadCache | None = None,
+        policy: CompressionPolicy | None = None,
         **kwargs,
     ):
         """Construct a DataContainer object.
@@ -92,9 +155,31 @@ class AbstractContainer(ABC):
             email: Author email for meta.json
             server: URL of the server instance providing the Container.
             key: API-Key from the server to identify yourself.
-            compression: Numeric constant for the compression method
+            compression: Numeric constant for the compression method or name
+                of a compression preset like "zstd" or "lzma"
             compresslevel: Level of compression, 0-fastest, 9-best compression
+                (Zstandard: 1-22). Default level of the preset or method,
+                if this is -1.
             ignore_items: List of container items that are not loaded to memory
+            lazy: If true, items of a local container file are decoded on
+                first access. Items of a downloaded container are also
+                transferred on first access, if the server supports HTTP
+                range requests.
+            mmap: If true, uncompressed NumPy items of a local container file
+                are mapped read-only into memory
+            workers: Number of threads used to encode and compress items
+                and to decompress and decode them
+            processes: Number of processes used to decode items with a
+                conversion class which holds the GIL, like JSON and TSV
+            session: HTTP session used to communicate with the server. If
+                this is None, a session shared by all containers with the
+                same configuration is used.
+            cache: Local cache of downloaded containers. If this is None,
+                a cache shared by all containers with the same
+                configuration is used, if a cache directory is configured.
+            policy: Policy selecting the compression method of each item.
+                If this is None, all items are compressed with the given
+                compression method and level.
         """
         self.kwargs = {
             "items": items,
@@ -104,10 +189,21 @@ class AbstractContainer(ABC):
             "compression": compression,
             "compresslevel": compresslevel,
             "ignore_items": ignore_items,
+            "lazy": lazy,
+            "mmap": mmap,
+            "workers": workers,
+            "processes": processes,
+            "session": session,
+            "cache": cache,
+            "policy": policy,
         }
         self.kwargs.update(kwargs)
 
         self._items = {}
+        self._mapped = {}
+        self._origins = {}
+        self._digests = {}
+        self._saved = None
         self.__pre_init__()
 
         # Load variables from kwargs in namespace
@@ -116,12 +212,28 @@ class AbstractContainer(ABC):
         # Container must be mutable initially
         self.mutable = True
 
+        # Worker threads and processes used for encoding and decoding
+        self.workers = n.workers
+        self.processes = n.processes
+
         # Load configuration
         if n.config is not None:
             self._config = dict(n.config)
         else:
             self._config = load_config()
 
+        # Pooled HTTP session for uploads and downloads
+        if n.session is not None:
+            self._session = n.session
+        else:
+            self._session = get_session(self._config)
+
+        # Local cache of downloaded containers
+        if n.cache is not None:
+            self._cache = n.cache
+        else:
+            self._cache = get_cache(self._config)
+
         # Store all items in the container
         if n.items is not None:
             self._store(n.items, True, False)
@@ -129,14 +241,18 @@ class AbstractContainer(ABC):
 
         # Load local container file
         elif n.file is not None:
-            self._read(fn=n.file, ignore_items=n.ignore_items)
+            self._read(fn=n.file, ignore_items=n.ignore_items, lazy=n.lazy, mmap=n.mmap)
 
         # Download container from server
         elif n.uuid is not None:
             server = self._config["server"]
             key = self._config["key"]
             self._download(
-                uuid=n.uuid, server=server, key=key, ignore_items=n.ignore_items
+                uuid=n.uuid,
+                server=server,
+                key=key,
+                ignore_items=n.ignore_items,
+                lazy=n.lazy,
             )
 
         # No data source
@@ -145,6 +261,11 @@ class AbstractContainer(ABC):
 
         self.compression = n.compression
         self.compresslevel = n.compresslevel
+        if isinstance(self.compression, str):
+            self.compression, level = preset(self.compression)
+            if self.compresslevel == -1:
+                self.compresslevel = level
+        self.policy = n.policy
         self.ignore_items = n.ignore_items
 
         # Check validity of author ORCID
@@ -177,6 +298,10 @@ class AbstractContainer(ABC):
         """Store all items in the container."""
         # Add all items in the container
         self._items = {}
+        self._mapped = {}
+        self._origins = {}
+        self._digests = {}
+        self._saved = None
         mutable = self.mutable
         self.mutable = True
         for path, data in items.items():
@@ -244,6 +369,21 @@ class AbstractContainer(ABC):
             self._items[path] = _OnDiskFile(**data)
             return
 
+        # Items of a ZIP package are decoded on first access
+        if isinstance(data, _ZipMember):
+            self._items[path] = data
+            return
+
+        # Items decoded by a pool of workers are stored as they are
+        if isinstance(data, AbstractFile):
+            self._items[path] = data
+            return
+
+        # Store conversion object containing data
+        self._items[path] = self._convert(path, data)
+
+    def _convert(self, path, data):
+        """Return a conversion object for the given item data."""
         # Get file extension
         ext = path.rsplit(".", 1)[1]
 
@@ -275,15 +415,39 @@ class AbstractContainer(ABC):
             cls = self._suffixes[ext]
             item = cls(data)
 
-        # Store conversion object containing data
+        return item
+
+    def _load(self, path):
+        """Decode a lazily loaded item and return its conversion object."""
+        member = self._items[path]
+        if not isinstance(member, _ZipMember):
+            return member
+
+        item = None
+        if member.mmap:
+            if path in self._digests:
+                with member.open() as fp:
+                    self._verify(path, fp)
+            cls = self._suffixes[path.rsplit(".", 1)[1]]
+            item = cls.map(member.source.fn, member.source.offset(member.info))
+        if item is None:
+            data = member.encode()
+            self._verify(path, data)
+            item = self._convert(path, data)
+        else:
+            self._mapped[path] = (member, item)
+        if path in self._origins and self._origins[path][2] is member:
+            self._origins[path] = (member.source, member.info, item)
         self._items[path] = item
+        return item
 
     def __getitem__(self, path):
         """Get the data content of a container item."""
         if path in self:
-            if isinstance(self._items[path], _OnDiskFile):
-                return self._items[path]
-            return self._items[path].data
+            item = self._load(path)
+            if isinstance(item, _OnDiskFile):
+                return item
+            return item.data
         if path in self.ignore_items:
             raise KeyError(f"Item '{path}' was ignored while reading the file.")
         raise KeyError("Unknown item '%s'!" % path)
@@ -352,6 +516,10 @@ class AbstractContainer(ABC):
         if "hash" not in content or not content["hash"]:
             content["hash"] = None
 
+        # The optional attribute 'hashScheme' selects the hash function
+        if content.get("hashScheme") not in (None,) + HASH_SCHEMES:
+            raise RuntimeError("Unknown hash scheme '%s'!" % content["hashScheme"])
+
         # The attribute 'usedSoftware' is a list of dictionaries, which
         # may be empty. Each dictionary must contain atleast the items
         # "name" and "version" specifying name and version of a
@@ -372,6 +540,7 @@ class AbstractContainer(ABC):
 
         # Store the item "content.json"
         self["content.json"] = content
+        self._update_model_version()
 
     def validate_meta(self):
         """Make sure that the item "meta.json" exists and contains all
@@ -468,8 +637,9 @@ class AbstractContainer(ABC):
         item_name: str,
         content: bytes | typing.IO[bytes] | None = None,
         legacy: bool = False,
+        name: bool = True,
     ):
-        if not legacy:
+        if name and not legacy:
             hash_object.update(item_name.encode("utf8"))
 
         if isinstance(content, bytes):
@@ -489,12 +659,181 @@ class AbstractContainer(ABC):
                     hash_object.update(chunk)
             return
         if legacy:
-            hash_object.update(self._items[item_name].hash().encode("ascii"))
+            item = self._load(item_name)
+            if self.mutable and isinstance(item, AbstractFile):
+                item.invalidate()
+            hash_object.update(item.hash().encode("ascii"))
+        elif self._streamed(item_name) is not None:
+            for chunk in self._iter_encode(item_name):
+                hash_object.update(chunk)
         else:
-            hash_object.update(self._items[item_name].encode())
+            hash_object.update(self._encode(item_name, cache=True))
+
+    def _encode(self, path: str, cache: bool = False) -> bytes:
+        """Return the encoded bytes string of an in-memory item.
+
+        Bytes strings cached by the conversion objects are only used while
+        the container is immutable. The items content.json and meta.json
+        are always encoded, because the container modifies them in place.
+        Without cache, a bytes string cached while hashing is dropped
+        after it was used, so that it is not kept after writing.
+        """
+        item = self._items[path]
+        if not isinstance(item, AbstractFile) or path in ("content.json", "meta.json"):
+            return item.encode()
+        if self.mutable:
+            item.invalidate()
+        return item.encoded(cache)
+
+    def _iter_encode(self, path: str, cache: bool = False) -> Iterator[bytes]:
+        """Return an iterator over chunks of the encoded bytes string of
+        an in-memory item. See _encode()."""
+        item = self._items[path]
+        if not isinstance(item, AbstractFile) or path in ("content.json", "meta.json"):
+            yield item.encode()
+            return
+        if self.mutable:
+            item.invalidate()
+        yield from item.iter_encoded(cache)
+
+    def _estimated_size(self) -> int:
+        """Return a conservative estimate of the size of the encoded
+        container without encoding or compressing any item. It is the
+        total size of all uncompressed items plus the ZIP headers.
+
+        Returns:
+            int: Number of bytes.
+        """
+        size = 22
+        for path, item in self._items.items():
+            if isinstance(item, _ZipMember):
+                length = item.info.file_size
+            elif isinstance(item, _OnDiskFile):
+                try:
+                    length = os.path.getsize(item.path)
+                except OSError:
+                    length = 0
+            elif isinstance(item, AbstractFile):
+                length = item.encoded_size()
+                if length is None and item._encoded is not None:
+                    length = len(item._encoded)
+                if length is None:
+                    length = _data_size(item.data)
+            else:
+                length = _data_size(item)
+
+            # Local file header and central directory entry with ZIP64
+            # extra fields and data descriptor
+            size += length + 2 * len(path.encode("utf8")) + 150
+        return size
+
+    def _streamed(self, path: str) -> int | None:
+        """Return the encoded size of an in-memory item, which is large
+        enough to be streamed chunkwise, or None."""
+        item = self._items.get(path)
+        if not isinstance(item, AbstractFile) or path in ("content.json", "meta.json"):
+            return None
+        if self.mutable:
+            item.invalidate()
+        size = item.encoded_size()
+        if size is None or size < STREAM_SIZE:
+            return None
+        return size
+
+    def _leaf(
+        self, item_name: str, content: bytes | typing.IO[bytes] | None = None
+    ) -> bytes:
+        """Return the digest of an item for the tree hash scheme. It is
+        the SHA-256 digest of the item name, a null byte and the item
+        data."""
+        h = hashlib.sha256(item_name.encode("utf8") + b"\0")
+        self._hash(h, item_name, content, name=False)
+        return h.digest()
+
+    @staticmethod
+    def _root(leaves: typing.Iterable[bytes]) -> str:
+        """Return the tree hash from the digests of all items in sorted
+        order."""
+        return hashlib.sha256(b"".join(leaves)).hexdigest()
+
+    @staticmethod
+    def _manifest(leaves: typing.Iterable[tuple[str, bytes]]) -> dict:
+        """Return the attribute 'itemHashes' of content.json, which maps
+        the names of all items except content.json to the hex digests of
+        the tree hash scheme."""
+        return {p: leaf.hex() for p, leaf in leaves if p != "content.json"}
+
+    def _verify(self, path: str, content: bytes | typing.IO[bytes]):
+        """Compare the digest of an item read from a ZIP package with its
+        digest in the attribute 'itemHashes' of content.json."""
+        if path in self._digests:
+            if self._leaf(path, content).hex() != self._digests[path]:
+                raise RuntimeError("Wrong hash of item '%s'!" % path)
+
+    def _verify_digests(self, hash: str, names: list[str], items: dict, digests: dict):
+        """Verify the item digests of content.json against the container
+        hash and all items already read against their digests. Other
+        items are verified when they are loaded."""
+        names = sorted(names)
+        if not isinstance(digests, dict) or sorted(digests) != [
+            p for p in names if p != "content.json"
+        ]:
+            raise RuntimeError("Wrong item hashes!")
+        try:
+            leaves = [
+                self._leaf(p) if p == "content.json" else bytes.fromhex(digests[p])
+                for p in names
+            ]
+        except (TypeError, ValueError):
+            raise RuntimeError("Wrong item hashes!") from None
+        if hash != self._root(leaves):
+            raise RuntimeError("Wrong hash!")
+
+        # The digests of all items are calculated concurrently
+        paths = [p for p in names if isinstance(items.get(p), bytes)]
+        paths.remove("content.json")
+        leaves = imap(lambda p: self._leaf(p, items[p]), paths, self.workers)
+        for p, leaf in zip(paths, leaves):
+            if leaf.hex() != digests[p]:
+                raise RuntimeError("Wrong hash of item '%s'!" % p)
+
+    def _update_model_version(self):
+        """Raise the data model version of a container using the attribute
+        'hashScheme' to the version which introduced it."""
+        content = self["content.json"]
+        if content.get("hashScheme") and content["modelVersion"] < HASH_SCHEME_VERSION:
+            content["modelVersion"] = HASH_SCHEME_VERSION
+
+    def _hash_scheme(self) -> str:
+        """Return the hash scheme of this container."""
+        scheme = self["content.json"].get("hashScheme") or HASH_SEQUENTIAL
+        if scheme not in HASH_SCHEMES:
+            raise RuntimeError("Unknown hash scheme '%s'!" % scheme)
+        return scheme
+
+    def _fingerprint(self) -> str:
+        """Return a digest identifying the data of this container. It is
+        the hash of a static container. Otherwise, it is calculated like
+        the hash without changing the container."""
+        content = self["content.json"]
+        if content["static"] and content["hash"]:
+            return content["hash"]
+
+        save = {k: content.get(k) for k in ("created", "storageTime", "hash")}
+        for key in save:
+            content[key] = None
+        try:
+            h = hashlib.sha256()
+            for p in self.keys():
+                self._hash(h, p)
+            return h.hexdigest()
+        finally:
+            content.update(save)
 
     def hash(self):
         """Calculate and save the hash value of this container."""
+        self._update_model_version()
+
         # Some attributes of content.json are excluded from the hash
         # calculation
         save = ("uuid", "created", "storageTime")
@@ -502,19 +841,31 @@ class AbstractContainer(ABC):
         for key in save:
             self["content.json"][key] = None
         self["content.json"]["hash"] = None
+        self["content.json"].pop("itemHashes", None)
 
         legacy = bool(self["content.json"]["modelVersion"] < "1.0.1")
 
-        h = hashlib.sha256()
-        for i, p in enumerate(sorted(self.items())):
-            if legacy and i != 0:
-                h.update(b" ")
-            self._hash(h, p, legacy=legacy)
-        self["content.json"]["hash"] = h.hexdigest()
-
-        # Restore excluded attributes
-        for key, value in save.items():
-            self["content.json"][key] = value
+        digests = None
+        try:
+            if not legacy and self._hash_scheme() == HASH_TREE:
+                # The digests of all items are calculated concurrently
+                paths = self.keys()
+                leaves = list(imap(self._leaf, paths, self.workers))
+                self["content.json"]["hash"] = self._root(leaves)
+                digests = self._manifest(zip(paths, leaves))
+            else:
+                h = hashlib.sha256()
+                for i, p in enumerate(self.keys()):
+                    if legacy and i != 0:
+                        h.update(b" ")
+                    self._hash(h, p, legacy=legacy)
+                self["content.json"]["hash"] = h.hexdigest()
+        finally:
+            # Restore excluded attributes
+            for key, value in save.items():
+                self["content.json"][key] = value
+        if digests is not None:
+            self["content.json"]["itemHashes"] = digests
 
         # Make container immutable
         self.mutable = False
@@ -544,74 +895,300 @@ class AbstractContainer(ABC):
                 + " Make sure 'ignore_items' is empty during initialisation."
             )
         self.mutable = True
+        self._origins = {}
+        self._digests = {}
+
+        # Drop cached bytes strings of all items
+        for item in self._items.values():
+            if isinstance(item, AbstractFile):
+                item.invalidate()
 
         # Remove and initialize certain container attributes
         content = self["content.json"]
         content["static"] = False
         content["complete"] = True
-        for key in ("uuid", "created", "storageTime", "hash"):
+        for key in ("uuid", "created", "storageTime", "hash", "itemHashes"):
             content.pop(key, None)
         self.validate_content()
 
-    def encode(self) -> Iterator[bytes]:
+    def encode(self, freeze: bool = False) -> Iterator[bytes]:
         """Encode container as ZIP package.
 
+        If freeze is true, the container is frozen while it is encoded.
+        Each item is encoded only once and the same bytes are fed to the
+        hash and the compressor. The item content.json, which contains
+        the hash, is stored behind all other items in this case.
+
+        Args:
+            freeze: If true, freeze the container during encoding.
+
         Yields:
             bytes: next chunk of the generated zip file."""
 
+        # The ZIP package is generated step by step and the data written
+        # in each step is passed on without copying
+        sink = _ChunkSink()
+        for _ in self._zip(ZipWriter(sink), freeze):
+            yield from sink.drain()
+        yield from sink.drain()
+
+    def _zip(self, zfp: ZipWriter, freeze: bool = False) -> Iterator[None]:
+        """Write all items of this container and the central directory to
+        a ZIP package. This generator yields after each step."""
         # Check/format of author ORCID
         self._norm_orcid()
+        if self.mutable:
+            self._update_model_version()
+        if not freeze:
+            yield from self._zip_items(zfp)
+            zfp.close()
+            return
 
-        in_memory_items = {
-            p: self._items[p]
-            for p in self.items()
-            if not isinstance(self[p], _OnDiskFile)
-        }
-
-        in_filesystem_items = {
-            p: self._items[p] for p in self.items() if isinstance(self[p], _OnDiskFile)
-        }
+        # The container is frozen only if the ZIP package is complete
+        content = self["content.json"]
+        keys = ("static", "complete", "hash", "itemHashes", "storageTime")
+        save = {k: content[k] for k in keys if k in content}
+        mutable = self.mutable
+        try:
+            # The legacy hash is not calculated from the encoded items
+            if content["modelVersion"] < "1.0.1":
+                self.freeze()
+                freeze = False
+            yield from self._zip_items(zfp, freeze)
+            zfp.close()
+        except BaseException:
+            for key in keys:
+                content.pop(key, None)
+            content.update(save)
+            self.mutable = mutable
+            raise
+
+    def _zip_items(self, zfp: ZipWriter, freeze: bool = False) -> Iterator[None]:
+        """Write all items of this container to a ZIP package."""
+        in_memory_items = sorted(
+            p for p, item in self._items.items() if not isinstance(item, _OnDiskFile)
+        )
+        in_filesystem_items = sorted(
+            p for p, item in self._items.items() if isinstance(item, _OnDiskFile)
+        )
 
-        # create FiFo queue with limited size
-        queue = _StreamingQueue()
+        # All in-memory items get the same modification time
+        date_time = time.localtime()[:6]
 
-        # function to generate zip content in a seperate thread
-        def _zip_generator():
-            try:
-                with ZipFile(
-                    queue,
-                    mode="w",
-                    compression=self.compression,
-                    compresslevel=self.compresslevel,
-                ) as zfp:
-                    for path in sorted(in_memory_items.keys()):
-                        zfp.writestr(path, in_memory_items[path].encode())
-
-                    for path in sorted(in_filesystem_items.keys()):
-                        zfp.write(
-                            in_filesystem_items[path].path,
-                            arcname=path,
-                            compress_type=in_filesystem_items[path].compression,
-                            compresslevel=in_filesystem_items[path].compression_level,
-                        )
-            except Exception as e:
-                queue.error = e
-            finally:
-                queue.close()
+        # The tree hash scheme allows to hash the items concurrently
+        tree = freeze and self._hash_scheme() == HASH_TREE
 
-        # start thread to fill the queue
-        thread = Thread(target=_zip_generator, daemon=True)
-        thread.start()
+        # function to encode and compress an in-memory item
+        def _compress(path):
+            if path == "content.json" and freeze:
+                return None
+            if isinstance(self._items[path], _OnDiskFile):
+                return None
+            if not freeze and (raw := self._compressed(path)) is not None:
+                info, data = raw
+                zinfo = member_info(path, date_time, info.compress_type)
+                zinfo.CRC = info.CRC
+                zinfo.file_size = info.file_size
+                zinfo.compress_size = len(data)
+                return zinfo, data, None
+            if self._streamed(path) is not None:
+                return None
+            data = self._encode(path)
+            zinfo, compressed = self._compress_item(path, data, date_time)
+            if tree:
+                return zinfo, compressed, self._leaf(path, data)
+            return zinfo, compressed, data
+
+        # function to write a file or a large in-memory item chunkwise
+        def _write(path, hash_object=None):
+            if isinstance(self._items[path], _OnDiskFile):
+                return self._write_file(zfp, path, hash_object)
+            return self._write_stream(zfp, path, date_time, hash_object)
+
+        # Items are compressed concurrently and written in order
+        if not freeze:
+            results = imap(_compress, in_memory_items, self.workers)
+            for path, result in zip(in_memory_items, results):
+                if result is None:
+                    yield from _write(path)
+                    continue
+                zinfo, data, _ = result
+                zfp.write(zinfo, data)
+                yield
+            for path in in_filesystem_items:
+                yield from self._write_file(zfp, path)
+            return
 
-        # yield next chunk if available
-        while True:
-            chunk = queue.get()
-            if chunk is None:
-                if queue.error is not None:
-                    raise queue.error
-                break
+        # Some attributes of content.json are excluded from the hash
+        # calculation
+        content = self["content.json"]
+        content["static"] = True
+        content["complete"] = True
+        save = ("uuid", "created", "storageTime")
+        save = {k: content[k] for k in save}
+        for key in save:
+            content[key] = None
+        content["hash"] = None
+        content.pop("itemHashes", None)
 
-            yield chunk
+        # Hash and write all items except content.json in sorted order
+        try:
+            h = hashlib.sha256()
+            leaves = {}
+            paths = sorted(self._items.keys())
+            for path, result in zip(paths, imap(_compress, paths, self.workers)):
+                if path == "content.json":
+                    if tree:
+                        leaves[path] = self._leaf(path)
+                    else:
+                        self._hash(h, path)
+                elif result is None:
+                    if tree:
+                        leaf = hashlib.sha256(path.encode("utf8") + b"\0")
+                        yield from _write(path, leaf)
+                        leaves[path] = leaf.digest()
+                    else:
+                        h.update(path.encode("utf8"))
+                        yield from _write(path, h)
+                else:
+                    zinfo, compressed, data = result
+                    if tree:
+                        leaves[path] = data
+                    else:
+                        self._hash(h, path, content=data)
+                    zfp.write(zinfo, compressed)
+                    yield
+            if tree:
+                content["hash"] = self._root(leaves[p] for p in paths)
+            else:
+                content["hash"] = h.hexdigest()
+        finally:
+            for key, value in save.items():
+                content[key] = value
+        if tree:
+            content["itemHashes"] = self._manifest(leaves.items())
+
+        # Make container immutable and write content.json
+        self.mutable = False
+        content["storageTime"] = timestamp()
+        data = self._encode("content.json")
+        zfp.write(*self._compress_item("content.json", data, date_time))
+
+        # Keep the usual order of the central directory
+        order = {p: i for i, p in enumerate(in_memory_items + in_filesystem_items)}
+        zfp.filelist.sort(key=lambda zinfo: order[zinfo.filename])
+
+    def _method(
+        self, path: str, data: bytes, size: int | None = None
+    ) -> tuple[int, int | None]:
+        """Return compression method and level of an item selected by the
+        compression policy of this container."""
+        default = (self.compression, self.compresslevel)
+        if self.policy is None:
+            return default
+        return self.policy.select(path, data, size, default)
+
+    def _compress_item(
+        self,
+        path: str,
+        data: bytes,
+        date_time: tuple,
+        method: tuple[int, int | None] | None = None,
+    ) -> tuple[ZipInfo, bytes]:
+        """Compress an encoded item and return its member information and
+        the compressed data."""
+        if method is None:
+            method = self._method(path, data)
+        zinfo = member_info(path, date_time, method[0])
+        start = time.perf_counter()
+        compressed = compress(zinfo, data, method[1])
+        if self.policy is not None:
+            self.policy.record(zinfo, time.perf_counter() - start)
+        return zinfo, compressed
+
+    def _compressed(self, path: str) -> tuple[ZipInfo, bytes] | None:
+        """Return the member information and the compressed data of an
+        unmodified item, which was read from a ZIP package with a
+        compression method suitable for this container, or None.
+
+        Items of a mutable container may have been modified in place and
+        the items content.json and meta.json are always encoded.
+        """
+        if self.mutable or path in ("content.json", "meta.json"):
+            return None
+        if path not in self._origins:
+            return None
+        source, info, item = self._origins[path]
+        if self._items.get(path) is not item:
+            return None
+        if info.flag_bits & 0x1:
+            return None
+        if self.policy is None:
+            if info.compress_type != self.compression:
+                return None
+        elif not self.policy.accepts(path, info.compress_type, self.compression):
+            return None
+        if not source.unmodified():
+            return None
+        return info, source.raw(info)
+
+    def _write_file(
+        self, zfp: ZipWriter, path: str, hash_object=None
+    ) -> Iterator[None]:
+        """Write an item stored in the file system chunkwise to a ZIP
+        package. This generator yields after each chunk."""
+        item = self._items[path]
+        compression = item.compression
+        compresslevel = item.compression_level
+        if compression is None:
+            # The policy examines the first block of the file
+            sample = b""
+            if self.policy is not None and self.policy.sample_size > 0:
+                with open(item.path, "rb") as fp:
+                    sample = fp.read(self.policy.sample_size)
+            size = os.path.getsize(item.path)
+            compression, level = self._method(path, sample, size)
+            if compresslevel is None:
+                compresslevel = level
+        if compresslevel is None:
+            compresslevel = self.compresslevel
+
+        start = time.perf_counter()
+        yield from zfp.iter_file(
+            item.path, path, compression, compresslevel, hash_object
+        )
+        if self.policy is not None:
+            self.policy.record(zfp.filelist[-1], time.perf_counter() - start)
+
+    def _write_stream(
+        self, zfp: ZipWriter, path: str, date_time: tuple, hash_object=None
+    ) -> Iterator[None]:
+        """Write a large in-memory item chunkwise to a ZIP package without
+        building its encoded bytes string. This generator yields after
+        each chunk."""
+        size = self._streamed(path)
+        chunks = self._iter_encode(path)
+
+        # The policy examines the first block of the item
+        sample = b""
+        if self.policy is not None and self.policy.sample_size > 0:
+            head = []
+            for chunk in chunks:
+                head.append(chunk)
+                if sum(map(len, head)) >= self.policy.sample_size:
+                    break
+            sample = b"".join(head)
+            chunks = itertools.chain(head, chunks)
+        compression, compresslevel = self._method(path, sample, size)
+        if compresslevel is None:
+            compresslevel = self.compresslevel
+
+        zinfo = member_info(path, date_time, compression)
+        zinfo.file_size = size
+        start = time.perf_counter()
+        yield from zfp.iter_chunks(zinfo, chunks, compresslevel, hash_object)
+        if self.policy is not None:
+            self.policy.record(zfp.filelist[-1], time.perf_counter() - start)
 
     def decode(
         self,
@@ -619,18 +1196,49 @@ class AbstractContainer(ABC):
         ignore_items: list[str] = [],
         validate: bool = True,
         strict: bool = True,
+        source: "_ZipSource | None" = None,
+        lazy: bool = False,
+        mmap: bool = False,
     ):
         """Take ZIP package as file object. Read items from the
         package and store them in this object.
 
+        If lazy is true, only the items content.json and meta.json are
+        read immediately. All other items are read from the source and
+        decoded on first access. The container hash is not verified in
+        this case.
+
         Args:
             fp: File object to read from.
             ignore_items: List of file paths that are not read into memory.
             validate: If true, validate the content.
             strict: If true, validate the hash, too.
+            source: Reopenable source of the ZIP package.
+            lazy: If true, decode items on first access.
+            mmap: If true, map uncompressed items into memory if their
+                conversion class supports it.
         """
+        lazy = lazy and source is not None
+        mmap = mmap and source is not None
         with ZipFile(fp, "r") as zfp:
-            items = {p: zfp.read(p) for p in zfp.namelist() if p not in ignore_items}
+            items = {}
+            infos = {}
+            for p in zfp.namelist():
+                if p in ignore_items:
+                    continue
+                info = infos[p] = zfp.getinfo(p)
+                if mmap and self._mappable(info):
+                    items[p] = _ZipMember(source, info, mmap=True)
+                elif lazy and p not in ("content.json", "meta.json"):
+                    items[p] = _ZipMember(source, info)
+                else:
+                    items[p] = None
+
+            # Items are read and decompressed concurrently
+            paths = [p for p, data in items.items() if data is None]
+            with _MemberReader(zfp, source, self.workers) as reader:
+                for p, data in zip(paths, imap(reader.read, paths, self.workers)):
+                    items[p] = data
 
             # trigger decoding content.json
             self["content.json"] = items["content.json"]
@@ -638,55 +1246,339 @@ class AbstractContainer(ABC):
             modelVersion = self["content.json"]["modelVersion"]
 
             # validate hash value, if the legacy hash function is not required
+            digests = None
             if strict and hash and modelVersion >= "1.0.1":
                 for key in ("uuid", "created", "storageTime", "hash"):
                     self["content.json"][key] = None
-
-                h = hashlib.sha256()
-                for p in sorted(zfp.namelist()):
-                    if p == "content.json":
-                        self._hash(h, p)
-                    else:
-                        with zfp.open(p) as f:
-                            self._hash(h, p, content=f)
+                if self._hash_scheme() == HASH_TREE:
+                    digests = self["content.json"].pop("itemHashes", None)
+
+            # Item digests allow to verify single items. Items which are
+            # ignored or not read yet are not hashed.
+            if digests is not None:
+                self._verify_digests(hash, zfp.namelist(), items, digests)
+            elif strict and hash and modelVersion >= "1.0.1" and not lazy:
+                # Items already read are hashed from the same buffer
+                if self._hash_scheme() == HASH_TREE:
+
+                    # The digests of all items are calculated concurrently
+                    def _leaf(p):
+                        if p == "content.json":
+                            return self._leaf(p)
+                        if isinstance(items.get(p), bytes):
+                            return self._leaf(p, items[p])
+                        with open_member(zfp, zfp.getinfo(p)) as f:
+                            return self._leaf(p, f)
+
+                    paths = sorted(zfp.namelist())
+                    digest = self._root(imap(_leaf, paths, self.workers))
+                else:
+                    h = hashlib.sha256()
+                    for p in sorted(zfp.namelist()):
+                        if p == "content.json":
+                            self._hash(h, p)
+                        elif isinstance(items.get(p), bytes):
+                            self._hash(h, p, content=items[p])
+                        else:
+                            with open_member(zfp, zfp.getinfo(p)) as f:
+                                self._hash(h, p, content=f)
+                    digest = h.hexdigest()
 
                 # Check validity of hash
-                if hash != h.hexdigest():
+                if hash != digest:
                     raise RuntimeError("Wrong hash!")
-        self._store(items, validate, strict)
+        self._store(self._decode_items(items), validate, strict and not lazy)
+        if digests is not None:
+            self._digests = digests
+
+        # The compressed data of items from a reopenable source may be
+        # copied instead of encoding and compressing them again
+        if source is not None:
+            for p, info in infos.items():
+                self._origins[p] = (source, info, self._items[p])
+
+    def _decode_items(self, items: dict) -> dict:
+        """Return a dictionary with the conversion objects of all items
+        given as bytes strings. Items are decoded concurrently by the
+        worker threads of this container. If the container has worker
+        processes, they decode all items with a conversion class which
+        holds the GIL."""
+        items = dict(items)
+        if self.workers <= 1 and self.processes <= 0:
+            return items
+
+        # The items content.json and meta.json are decoded by _store()
+        paths = [
+            p
+            for p, data in items.items()
+            if isinstance(data, bytes) and p not in ("content.json", "meta.json")
+        ]
+
+        # Submit items to the process pool before any thread is started
+        pool = None
+        futures = {}
+        if self.processes > 0:
+            procs = [p for p in paths if getattr(self._class(p), "holds_gil", False)]
+            if len(procs) > 1:
+                pool = ProcessPoolExecutor(max_workers=self.processes)
+                for p in procs:
+                    futures[p] = pool.submit(self._class(p), items[p])
+                paths = [p for p in paths if p not in futures]
+
+        # function to decode an item in a worker thread
+        def _convert(path):
+            return self._convert(path, items[path])
 
-    def write(self, fn: str, data: bytes | None = None):
+        try:
+            for p, item in zip(paths, imap(_convert, paths, self.workers)):
+                items[p] = item
+            for p, future in futures.items():
+                items[p] = future.result()
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+        return items
+
+    def _class(self, path: str) -> type | None:
+        """Return the conversion class registered for the file extension
+        of an item or None."""
+        return self._suffixes.get(path.rsplit(".", 1)[-1])
+
+    def _mappable(self, info: ZipInfo) -> bool:
+        """Return true, if the given ZIP item can be mapped into memory."""
+        if info.compress_type != ZIP_STORED or info.flag_bits & 0x1:
+            return False
+        ext = info.filename.rsplit(".", 1)[-1]
+        return callable(getattr(self._suffixes.get(ext), "map", None))
+
+    def write(
+        self,
+        fn: str,
+        data: bytes | None = None,
+        freeze: bool = False,
+        atomic: bool = False,
+        keep: bool = False,
+        incremental: bool = False,
+    ):
         """Write the container to a ZIP package file.
 
         If data is passed to the function, data will be written to the file.
         Otherwise the byte representation of the class instance will be written
         to the file, which is what you typically want.
 
+        In atomic mode, the ZIP package is written to a temporary file in
+        the same directory, which replaces the target file after its data
+        was flushed to the disk. The target file is thus either the
+        previous or the new version, even if the program is killed while
+        writing.
+
+        In incremental mode, only new or modified items are appended to
+        the file, if it was written incrementally by this object before.
+        The central directory is replaced and the compressed data of all
+        other items is reused. This is meant for multi-step containers,
+        which are saved repeatedly. The file is compacted by a full
+        rewrite as soon as replaced items occupy more than half of it.
+        Appending to the file is not atomic. In atomic mode, the members
+        written before are copied to the temporary file and the new
+        members are appended there.
+
         Args:
             fn: Filename of export file.
             data: If given, data to write to the file.
+            freeze: If true, freeze the container while it is written.
+            atomic: If true, replace the file atomically.
+            keep: If true, keep the previous version of the file with the
+                suffix "~" attached. Implies atomic mode.
+            incremental: If true, write the file incrementally.
         """
         if self.mutable:
             self["content.json"]["storageTime"] = timestamp()
 
-        if data is None:
-            stream = self.encode()
-        with open(fn, "wb") as fp:
-            if data is not None:
-                fp.write(data)
-            else:
-                for chunk in stream:
-                    fp.write(chunk)
+        # Items read lazily or mapped from the target file must be loaded
+        # into memory before the file is replaced
+        for path, item in self._items.items():
+            if isinstance(item, _ZipMember) and item.source.samefile(fn):
+                self._items[path] = self._convert(path, item.encode())
+        for path, (member, item) in self._mapped.items():
+            if self._items.get(path) is item and member.source.samefile(fn):
+                self._items[path] = self._convert(path, member.encode())
+        for path, (source, _, _) in list(self._origins.items()):
+            if source.samefile(fn):
+                del self._origins[path]
+
+        # The ZIP package is written directly to the file
+        if incremental and data is None:
+            if freeze:
+                self.freeze()
+            self._write_incremental(fn, atomic, keep)
+        else:
+            self._saved = None
+            with _replace(fn, keep) if atomic or keep else open(fn, "wb") as fp:
+                if data is not None:
+                    fp.write(data)
+                else:
+                    for _ in self._zip(ZipWriter(fp), freeze):
+                        pass
         self.mutable = not (
             self["content.json"]["static"] or self["content.json"]["complete"]
         )
 
-    def _read(self, fn: str, ignore_items: list[str] = [], strict: bool = True):
+    def _write_incremental(self, fn: str, atomic: bool = False, keep: bool = False):
+        """Write the container to a ZIP package file reusing the members
+        written by the previous incremental write to the same file."""
+        fn = os.path.abspath(fn)
+        state, self._saved = self._saved, None
+        if state is not None and state["file"] != fn:
+            state = None
+
+        # The file must not be modified since the previous write
+        if state is not None:
+            try:
+                stat = os.stat(fn)
+            except OSError:
+                state = None
+            else:
+                if state["stat"] != (stat.st_size, stat.st_mtime_ns):
+                    state = None
+
+        # Compact the file, if most of it is occupied by replaced members
+        if state is not None and state["dead"] > state["live"]:
+            state = None
+
+        # Append to the file or write it from scratch
+        members = {}
+        if state is None:
+            previous, offset = {}, 0
+            open_file = _replace(fn, keep) if atomic or keep else open(fn, "wb")
+        else:
+            previous, offset = state["members"], state["end"]
+            open_file = _replace(fn, keep) if atomic or keep else open(fn, "r+b")
+        with open_file as fp:
+            if state is not None and (atomic or keep):
+                # The members written before are copied without change
+                with open(fn, "rb") as src:
+                    remaining = offset
+                    while remaining > 0:
+                        chunk = src.read(min(remaining, 16 * CHUNK_SIZE))
+                        if not chunk:
+                            raise RuntimeError("File '%s' was truncated!" % fn)
+                        fp.write(chunk)
+                        remaining -= len(chunk)
+            fp.seek(offset)
+            zfp = ZipWriter(fp, offset)
+            for _ in self._zip_incremental(zfp, previous, members):
+                pass
+            end = zfp.offset
+            zfp.close()
+            fp.truncate()
+            if state is not None and not (atomic or keep):
+                os.fsync(fp.fileno())
+
+        stat = os.stat(fn)
+        live = sum(length for _, _, length in members.values())
+        self._saved = {
+            "file": fn,
+            "stat": (stat.st_size, stat.st_mtime_ns),
+            "end": end,
+            "members": members,
+            "live": live,
+            "dead": end - live,
+        }
+
+    def _zip_incremental(
+        self, zfp: ZipWriter, previous: dict, members: dict
+    ) -> Iterator[None]:
+        """Write all items of this container to a ZIP package. Items with
+        the same signature as in previous are not written again. The
+        signature, member information and length of each member are
+        stored in members."""
+        # Check/format of author ORCID
+        self._norm_orcid()
+        if self.mutable:
+            self._update_model_version()
+
+        in_memory_items = sorted(
+            p for p, item in self._items.items() if not isinstance(item, _OnDiskFile)
+        )
+        in_filesystem_items = sorted(
+            p for p, item in self._items.items() if isinstance(item, _OnDiskFile)
+        )
+        date_time = time.localtime()[:6]
+
+        # function to encode and compress a new or modified in-memory item.
+        # Large items are hashed chunkwise and compressed while writing.
+        def _compress(path):
+            data = None
+            if self._streamed(path) is not None:
+                h = hashlib.sha256()
+                for chunk in self._iter_encode(path):
+                    h.update(chunk)
+                method = (self.compression, self.compresslevel, self.policy)
+                signature = (h.hexdigest(), method)
+            else:
+                data = self._encode(path)
+                method = self._method(path, data)
+                signature = (hashlib.sha256(data).hexdigest(), method)
+            if path in previous and previous[path][0] == signature:
+                return signature, True, None
+            if data is None:
+                return signature, False, None
+            return signature, False, self._compress_item(path, data, date_time, method)
+
+        for path, (signature, unchanged, result) in zip(
+            in_memory_items, imap(_compress, in_memory_items, self.workers)
+        ):
+            offset = zfp.offset
+            if unchanged:
+                _, zinfo, length = previous[path]
+                zfp.filelist.append(zinfo)
+            else:
+                if result is None:
+                    yield from self._write_stream(zfp, path, date_time)
+                else:
+                    zfp.write(*result)
+                zinfo, length = zfp.filelist[-1], zfp.offset - offset
+            members[path] = (signature, zinfo, length)
+            yield
+
+        # Files are identified by their name, size and modification time
+        for path in in_filesystem_items:
+            item = self._items[path]
+            stat = os.stat(item.path)
+            signature = (
+                os.fspath(item.path),
+                stat.st_size,
+                stat.st_mtime_ns,
+                item.compression,
+                item.compression_level,
+                self.compression,
+                self.compresslevel,
+                self.policy,
+            )
+            offset = zfp.offset
+            if path in previous and previous[path][0] == signature:
+                _, zinfo, length = previous[path]
+                zfp.filelist.append(zinfo)
+            else:
+                yield from self._write_file(zfp, path)
+                zinfo, length = zfp.filelist[-1], zfp.offset - offset
+            members[path] = (signature, zinfo, length)
+            yield
+
+    def _read(
+        self,
+        fn: str,
+        ignore_items: list[str] = [],
+        strict: bool = True,
+        lazy: bool = False,
+        mmap: bool = False,
+    ):
         """Read a ZIP package file and store it as container in this
         object.
         """
+        source = _ZipSource(fn)
         with open(fn, "rb") as fp:
-            self.decode(fp, ignore_items, False, strict)
+            self.decode(fp, ignore_items, False, strict, source, lazy, mmap)
 
         self.mutable = not (
             self["content.json"]["static"] or self["content.json"]["complete"]
@@ -694,9 +1586,11 @@ class AbstractContainer(ABC):
 
     def upload(
         self,
-        data: bytes | None = None,
+        data: bytes | Iterator[bytes] | None = None,
         server: str | None = None,
         key: str | None = None,
+        freeze: bool = False,
+        lookup: bool = True,
     ):
         """Create a ZIP archive of the DataContainer and upload it to a server.
 
@@ -704,11 +1598,34 @@ class AbstractContainer(ABC):
         Otherwise the byte representation of the class instance will be written
         to the file, which is what you typically want.
 
+        If lookup is true and the container is static, the server is asked
+        for a static dataset with the same hash first. If there is one,
+        the container is not uploaded. It gets the UUID of the dataset on
+        the server instead.
+
         Args:
-            data: If given, data to write to the file.
+            data: If given, bytes string or iterator of bytes chunks to
+                upload.
             server: URL of the server.
             key: API Key from the server to identify yourself.
+            freeze: If true, freeze the container while it is uploaded.
+            lookup: If true, skip the upload of static containers which
+                are already available on the server.
         """
+        target = self._prepare_upload(server, key, lookup)
+        if target is None:
+            return
+
+        # Upload container as byte string
+        response = self._post(data or self.encode(freeze), *target)
+        self._uploaded(response, *target)
+
+    def _prepare_upload(
+        self, server: str | None, key: str | None, lookup: bool
+    ) -> tuple[str, str] | None:
+        """Return server URL and API key for an upload or None, if the
+        container is static and already available on the server. Update
+        the storage time of a mutable container."""
         # Server name is required and must be provided either via config
         # file, environment variable or method parameter
         if server is None:
@@ -723,13 +1640,27 @@ class AbstractContainer(ABC):
         if not key:
             raise RuntimeError("Server API key is missing!")
 
-        # Upload container as byte string
+        # Static containers, which are already available on the server,
+        # are not uploaded again
+        content = self["content.json"]
+        if lookup and content["static"] and content["hash"]:
+            uuid = self._lookup(content["hash"], server, key)
+            if uuid is not None:
+                content["uuid"] = uuid
+                self.mutable = False
+                return None
+
         if self.mutable:
             self["content.json"]["storageTime"] = timestamp()
+        return server, key
 
+    def _post(
+        self, data: bytes | Iterator[bytes], server: str, key: str
+    ) -> requests.Response:
+        """Send a ZIP package to the server and return the response."""
         try:
-            streamer = _MultipartRequestStreamer(data or self.encode())
-            response = requests.post(
+            streamer = _MultipartRequestStreamer(data)
+            response = self._session.post(
                 server + "/api/datasets/",
                 headers={
                     "Authorization": "Token " + key,
@@ -741,7 +1672,12 @@ class AbstractContainer(ABC):
             response = None
         if response is None:
             raise ConnectionError("Connection to server %s failed!" % server)
+        return response
 
+    def _uploaded(self, response: requests.Response, server: str, key: str):
+        """Handle the server response to an upload. Raise an exception
+        according to its HTTP status code or make the container immutable
+        on success."""
         # HTTP status code 409 is returned when a dataset is already
         # available on the server. Static datasets require a special
         # treatment: The current dataset is replaced by the one from the
@@ -750,6 +1686,7 @@ class AbstractContainer(ABC):
             if self["content.json"]["static"]:
                 data = json.loads(response.content.decode("UTF-8"))
                 if isinstance(data, dict) and data["static"]:
+                    self.mutable = True
                     self._download(uuid=data["id"], server=server, key=key)
                     return
             raise requests.HTTPError("400 Bad Request: Invalid container content")
@@ -775,8 +1712,229 @@ class AbstractContainer(ABC):
             self["content.json"]["static"] or self["content.json"]["complete"]
         )
 
+    def upload_resumable(
+        self,
+        server: str | None = None,
+        key: str | None = None,
+        chunk_size: int = 8 * 1024 * 1024,
+        manifest: str | None = None,
+        lookup: bool = True,
+    ):
+        """Upload the container in chunks. An interrupted upload can be
+        resumed by calling this method again.
+
+        The ZIP package is written to a file next to the manifest file
+        first. The manifest stores the upload id of the server, a
+        fingerprint of the container and the ranges of all chunks
+        acknowledged by the server. It is removed only after a successful
+        upload. If a previous upload of the same
+        unmodified container failed, its ZIP package is not encoded again
+        and the upload continues at the offset reported by the server.
+        The fingerprint of a static container is its hash. Other
+        containers are identified by a digest of all items except the
+        timestamps of content.json, which requires to encode each item.
+        If the server does not support chunked uploads, the ZIP package
+        is uploaded in one request as with upload().
+
+        Args:
+            server: URL of the server.
+            key: API Key from the server to identify yourself.
+            chunk_size: Number of bytes per chunk.
+            manifest: Name of the manifest file. Default is a file named
+                after the UUID of the container in the temp directory.
+            lookup: If true, skip the upload of static containers which
+                are already available on the server.
+        """
+        # Server name is required and must be provided either via config
+        # file, environment variable or method parameter
+        if server is None:
+            server = self._config["server"]
+        if not server:
+            raise RuntimeError("Server URL is missing!")
+
+        # API key is required and must be provided either via config
+        # file, environment variable or method parameter
+        if key is None:
+            key = self._config["key"]
+        if not key:
+            raise RuntimeError("Server API key is missing!")
+
+        # Static containers, which are already available on the server,
+        # are not uploaded again
+        content = self["content.json"]
+        if lookup and content["static"] and content["hash"]:
+            uuid = self._lookup(content["hash"], server, key)
+            if uuid is not None:
+                content["uuid"] = uuid
+                self.mutable = False
+                return
+
+        if manifest is None:
+            name = "scidata-upload-%s.json" % content["uuid"]
+            manifest = os.path.join(tempfile.gettempdir(), name)
+        upload = _ResumableUpload(manifest, server, key, self._session)
+
+        # Encode the ZIP package, unless a previous upload of the same
+        # unmodified container can be resumed
+        fingerprint = self._fingerprint()
+        if upload.load(content["uuid"], fingerprint):
+            if self.mutable:
+                content["storageTime"] = upload.state["storageTime"]
+        else:
+            upload.remove()
+            if self.mutable:
+                content["storageTime"] = timestamp()
+            with open(upload.package, "wb") as fp:
+                for chunk in self.encode():
+                    fp.write(chunk)
+            upload.create(content["uuid"], fingerprint, content["storageTime"])
+
+        # Server without support for chunked uploads
+        if upload.id is None:
+            response = self._post(_read_chunks(upload.package), server, key)
+        else:
+            response = upload.send(chunk_size)
+
+        # The manifest is kept for another attempt, if the upload failed
+        self._uploaded(response, server, key)
+        upload.remove()
+
+    def _lookup(self, hash: str, server: str, key: str) -> str | None:
+        """Return the UUID of a static dataset with the given hash on the
+        server or None. Servers which do not support the lookup request
+        are treated as if there is no such dataset."""
+        try:
+            response = self._session.get(
+                server + "/api/datasets/lookup/",
+                params={"hash": hash},
+                headers={"Authorization": "Token " + key},
+            )
+            if response.status_code != 200:
+                return None
+            data = response.json()
+        except Exception:
+            return None
+        if not isinstance(data, dict) or not data.get("static"):
+            return None
+        if data.get("hash", hash) != hash or not isinstance(data.get("id"), str):
+            return None
+        return data["id"]
+
+    @classmethod
+    def upload_many(
+        cls,
+        containers: typing.Iterable["AbstractContainer | str | os.PathLike"],
+        max_workers: int = 4,
+        max_bytes: int = 256 * 1024 * 1024,
+        server: str | None = None,
+        key: str | None = None,
+        config: dict | None = None,
+        session: requests.Session | None = None,
+    ) -> Iterator[tuple[typing.Any, "AbstractContainer | Exception"]]:
+        """Upload many containers concurrently.
+
+        The containers are either container objects or names of
+        container files. Files are uploaded as they are, without being
+        decoded and encoded again. Only their items content.json and
+        meta.json are read.
+
+        A new upload is started only while the number of bytes of all
+        running uploads is below max_bytes. Container files count with
+        their file size, container objects with an estimate of their
+        encoded size.
+
+        Each result is yielded as soon as it is available. Failed uploads
+        yield their exception instead of the container. Static
+        containers, which are already available on the server, are
+        replaced by the server version as in upload().
+
+        Args:
+            containers: Container objects or names of container files.
+            max_workers: Number of concurrent uploads.
+            max_bytes: Limit of the number of bytes in flight.
+            server: URL of the server. Taken from config, if this is None.
+            key: API Key from the server to identify yourself. Taken from
+                config, if this is None.
+            config: Configuration dictionary with server URL and API key.
+            session: HTTP session used for container files.
+
+        Yields:
+            tuple: Container object or file name and the uploaded
+                container object or exception.
+        """
+        if config is None:
+            config = load_config()
+        if server is None:
+            server = config.get("server")
+        if key is None:
+            key = config.get("key")
+        if session is None:
+            session = get_session(config, max(10, max_workers))
+
+        lock = Lock()
+        inflight = 0
+
+        def _charge(size):
+            nonlocal inflight
+            with lock:
+                inflight += size
+
+        def _upload(item, charged):
+            try:
+                if isinstance(item, AbstractContainer):
+                    dc = item
+                    data = dc.encode()
+                else:
+                    dc = cls(file=item, lazy=True, config=config, session=session)
+                    data = _read_chunks(item)
+                dc.upload(data, server, key)
+                return dc
+            finally:
+                _charge(-charged)
+
+        pending = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            try:
+                for item in containers:
+                    # Wait for free workers and bytes below the limit
+                    while pending and (
+                        len(pending) >= max_workers or inflight >= max_bytes
+                    ):
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield _result(pending.pop(future), future)
+
+                    # Uploads are charged with their size before they are
+                    # started
+                    size = 0
+                    if isinstance(item, AbstractContainer):
+                        size = item._estimated_size()
+                    else:
+                        try:
+                            size = os.path.getsize(item)
+                        except OSError:
+                            pass
+                    _charge(size)
+                    pending[pool.submit(_upload, item, size)] = item
+
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield _result(pending.pop(future), future)
+
+            # Drop uploads not started yet, if the caller stops early
+            finally:
+                for future in pending:
+                    future.cancel()
+
     def _download(
-        self, uuid, strict=True, server=None, key=None, ignore_items: list[str] = []
+        self,
+        uuid,
+        strict=True,
+        server=None,
+        key=None,
+        ignore_items: list[str] = [],
+        lazy: bool = False,
     ):
         # Server name is required and must be provided either via config
         # file, environment variable or method parameter
@@ -792,20 +1950,102 @@ class AbstractContainer(ABC):
         if not key:
             raise RuntimeError("Server API key is missing!")
 
+        # Static containers from the download cache are read without
+        # any network traffic
+        cache = self._cache
+        entry = None if cache is None else cache.lookup(uuid)
+        if entry is not None and entry["static"]:
+            if self._read_cached(uuid, entry, strict, ignore_items):
+                return
+            entry = None
+
         # Download container as byte stream from the server
         try:
             url = server + "/api/datasets/" + uuid + "/download/"
-            response = requests.get(url, headers={"Authorization": "Token " + key})
+            headers = {"Authorization": "Token " + key}
+
+            # Lazy download starts with the tail of the ZIP package
+            if lazy and entry is None:
+                headers["Range"] = "bytes=-%d" % CHUNK_SIZE
+
+            # Other cached containers are revalidated by the server
+            if entry is not None:
+                if entry["etag"]:
+                    headers["If-None-Match"] = entry["etag"]
+                if entry["modified"]:
+                    headers["If-Modified-Since"] = entry["modified"]
+            response = self._session.get(url, headers=headers, stream=True)
+            for name in ("Range", "If-None-Match", "If-Modified-Since"):
+                headers.pop(name, None)
         except Exception:
             response = None
         if response is None:
             raise ConnectionError("Connection to server %s failed!" % server)
-        data = response.content
-        fp = io.BytesIO(data)
 
+        stale = False
+        with response:
+            # Partial content: Read the ZIP directory and decode items on
+            # first access
+            if response.status_code == 206:
+                source = _HttpSource(url, headers, response, self._session)
+                with source.file() as fp:
+                    self.decode(fp, ignore_items, False, strict, source, lazy=True)
+
+            # Not modified: Read the container from the cache
+            elif response.status_code == 304 and entry is not None:
+                stale = not self._read_cached(uuid, entry, strict, ignore_items)
+
+            else:
+                self._receive(response, strict, ignore_items, uuid)
+
+        # The cached container did not match its index entry and has been
+        # dropped from the cache: Download it again
+        if stale:
+            return self._download(uuid, strict, server, key, ignore_items, lazy)
+
+        # Make container immutable
+        self.mutable = not (
+            self["content.json"]["static"] or self["content.json"]["complete"]
+        )
+
+    def _read_cached(
+        self, uuid: str, entry: dict, strict=True, ignore_items: list[str] = []
+    ):
+        """Read a container from the download cache. Return false and
+        drop the container from the cache, if this fails or if the
+        container does not match its index entry."""
+        try:
+            if not self._cache.verify(uuid, entry):
+                raise RuntimeError("Wrong digest!")
+            self._read(self._cache.path(uuid), ignore_items, strict)
+            content = self["content.json"]
+            if content["hash"] != entry["hash"]:
+                raise RuntimeError("Wrong hash!")
+            if bool(content["static"]) != entry["static"]:
+                raise RuntimeError("Wrong static flag!")
+        except Exception:
+            self._cache.remove(uuid)
+            return False
+        self._cache.touch(uuid)
+        return True
+
+    def _receive(
+        self,
+        response,
+        strict=True,
+        ignore_items: list[str] = [],
+        uuid: str | None = None,
+    ):
+        """Store the container from a streamed download response or raise
+        an exception according to its HTTP status code. A valid dataset is
+        also stored in the download cache."""
         # Valid dataset: Store in this container
         if response.status_code == 200:
-            self.decode(fp, ignore_items, False, strict)
+            with self._spool(response) as fp:
+                self.decode(fp, ignore_items, False, strict)
+                if self._cache is not None and uuid is not None:
+                    content = self["content.json"]
+                    self._cache.store(uuid, fp, content, response.headers)
 
         # Deleted dataset: Raise exception
         elif response.status_code == 204:
@@ -813,7 +2053,8 @@ class AbstractContainer(ABC):
 
         # Replaced dataset: Store in this container
         elif response.status_code == 301:
-            self.decode(fp, ignore_items, strict)
+            with self._spool(response) as fp:
+                self.decode(fp, ignore_items, strict)
 
         # Unauthorized access
         elif response.status_code == 403:
@@ -827,10 +2068,189 @@ class AbstractContainer(ABC):
         else:
             response.raise_for_status()
 
-        # Make container immutable
-        self.mutable = not (
-            self["content.json"]["static"] or self["content.json"]["complete"]
+    def _spool(self, response) -> typing.IO[bytes]:
+        """Copy the body of a streamed response chunkwise into a temporary
+        file, which is kept in memory up to spool_size bytes."""
+        fp = tempfile.SpooledTemporaryFile(max_size=self.spool_size)
+        try:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                fp.write(chunk)
+            fp.seek(0)
+        except Exception:
+            fp.close()
+            raise
+        return fp
+
+    @classmethod
+    def fetch_many(
+        cls,
+        uuids: typing.Iterable[str],
+        max_workers: int = 8,
+        config: dict | None = None,
+        session: requests.Session | None = None,
+        **kwargs,
+    ) -> Iterator[tuple[str, "AbstractContainer | Exception"]]:
+        """Download many containers concurrently.
+
+        The containers are downloaded and decoded by a pool of threads
+        sharing one HTTP session. Each result is yielded as soon as it is
+        available, which means that the order of the results may differ
+        from the order of the UUIDs. A failed download does not stop the
+        other ones. Its exception is yielded instead of the container.
+
+        Args:
+            uuids: UUIDs of the containers to download.
+            max_workers: Number of concurrent downloads.
+            config: Configuration dictionary with server URL and API key.
+            session: HTTP session used for all downloads.
+            kwargs: Further arguments passed to the constructor of each
+                container.
+
+        Yields:
+            tuple: UUID and container object or exception.
+        """
+        if config is None:
+            config = load_config()
+        if session is None:
+            session = get_session(config, max(10, max_workers))
+
+        def _fetch(uuid):
+            return cls(uuid=uuid, config=config, session=session, **kwargs)
+
+        uuids = iter(uuids)
+        pending = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            try:
+                while True:
+                    # Keep a limited number of downloads in flight
+                    for uuid in uuids:
+                        pending[pool.submit(_fetch, uuid)] = uuid
+                        if len(pending) >= 2 * max_workers:
+                            break
+                    if not pending:
+                        break
+
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield _result(pending.pop(future), future)
+
+            # Drop downloads not started yet, if the caller stops early
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    @classmethod
+    async def aopen(
+        cls, file: str, executor: Executor | None = None, **kwargs
+    ) -> "AbstractContainer":
+        """Read a container file without blocking the event loop.
+
+        Args:
+            file: Filename of the container file.
+            executor: Executor used for reading and decoding. Default is
+                the shared executor of the asyncio API.
+            kwargs: Further arguments passed to the constructor.
+
+        Returns:
+            AbstractContainer: The container.
+        """
+        return await _run(executor, functools.partial(cls, file=file, **kwargs))
+
+    @classmethod
+    async def afetch(
+        cls, uuid: str, executor: Executor | None = None, **kwargs
+    ) -> "AbstractContainer":
+        """Download a container without blocking the event loop.
+
+        Args:
+            uuid: UUID of the container.
+            executor: Executor used for downloading and decoding. Default
+                is the shared transfer executor of the asyncio API.
+            kwargs: Further arguments passed to the constructor.
+
+        Returns:
+            AbstractContainer: The container.
+        """
+        func = functools.partial(cls, uuid=uuid, **kwargs)
+        return await _run(executor, func, transfer=True)
+
+    async def awrite(
+        self,
+        fn: str,
+        data: bytes | None = None,
+        freeze: bool = False,
+        atomic: bool = False,
+        keep: bool = False,
+        incremental: bool = False,
+        executor: Executor | None = None,
+    ):
+        """Write the container to a ZIP package file without blocking the
+        event loop. The arguments are the same as for write().
+
+        Args:
+            executor: Executor used for encoding and writing. Default is
+                the shared executor of the asyncio API.
+        """
+        write = functools.partial(
+            self.write, fn, data, freeze, atomic, keep, incremental
         )
+        await _run(executor, write)
+
+    async def aupload(
+        self,
+        data: bytes | None = None,
+        server: str | None = None,
+        key: str | None = None,
+        freeze: bool = False,
+        lookup: bool = True,
+        executor: Executor | None = None,
+        transfer_executor: Executor | None = None,
+    ):
+        """Upload the container to a server without blocking the event
+        loop. The arguments are the same as for upload().
+
+        The container is encoded into a temporary file first, which is
+        kept in memory up to spool_size bytes. The file is then sent to
+        the server.
+
+        Args:
+            executor: Executor used for encoding. Default is the shared
+                executor of the asyncio API.
+            transfer_executor: Executor used for the requests to the
+                server. Default is the shared transfer executor of the
+                asyncio API.
+        """
+        func = functools.partial(self._prepare_upload, server, key, lookup)
+        target = await _run(transfer_executor, func, transfer=True)
+        if target is None:
+            return
+
+        if data is None:
+            fp = await _run(executor, functools.partial(self._spool_encoded, freeze))
+            data = iter(functools.partial(fp.read, CHUNK_SIZE), b"")
+        else:
+            fp = None
+        try:
+            func = functools.partial(self._post, data, *target)
+            response = await _run(transfer_executor, func, transfer=True)
+        finally:
+            if fp is not None:
+                fp.close()
+        func = functools.partial(self._uploaded, response, *target)
+        await _run(transfer_executor, func, transfer=True)
+
+    def _spool_encoded(self, freeze: bool = False) -> typing.IO[bytes]:
+        """Encode the container into a temporary file, which is kept in
+        memory up to spool_size bytes."""
+        fp = tempfile.SpooledTemporaryFile(max_size=self.spool_size)
+        try:
+            for chunk in self.encode(freeze):
+                fp.write(chunk)
+            fp.seek(0)
+        except BaseException:
+            fp.close()
+            raise
+        return fp
 
     def __str__(self):
         content = self["content.json"]
@@ -927,45 +2347,531 @@ class _OnDiskFile:
         self.compression_level: int | None = compression_level
 
 
-class _StreamingQueue:
-    def __init__(self, chunk_size: int = 65536, maxsize: int = 8):
-        self.queue: Queue[bytes | None] = Queue(maxsize=maxsize)
-        self.buffer: bytearray = bytearray()
-        self.chunk_size: int = chunk_size
-        self._closed: bool = False
-        self.error: Exception | None = None
+class _ZipSource:
+    """Class to represent a ZIP package file which is reopened on demand."""
 
-    def write(self, b: bytes) -> int:
-        self.buffer += b
-        if len(self.buffer) >= self.chunk_size:
-            self.flush()
-        return len(b)
+    def __init__(self, fn: str) -> None:
+        self.fn: str = os.path.abspath(fn)
+        self.stat: tuple[int, int] | None = self._stat()
 
-    def flush(self):
-        if self.buffer:
-            try:
-                self.queue.put(bytes(self.buffer), block=True, timeout=5)
-            except Exception as e:
-                self.error = e
-            self.buffer.clear()
+    def _stat(self) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(self.fn)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def unmodified(self) -> bool:
+        """Return true, if the file was not modified since it was read."""
+        return self.stat is not None and self._stat() == self.stat
+
+    @contextmanager
+    def open(self) -> Iterator[ZipFile]:
+        with open(self.fn, "rb") as fp:
+            with ZipFile(fp, "r") as zfp:
+                yield zfp
+
+    def samefile(self, fn: str) -> bool:
+        return os.path.exists(fn) and os.path.samefile(self.fn, fn)
+
+    def offset(self, info: ZipInfo) -> int:
+        """Return the file offset of the data of the given ZIP item."""
+        with open(self.fn, "rb") as fp:
+            fp.seek(info.header_offset)
+            return data_offset(info, fp.read(sizeFileHeader))
+
+    def raw(self, info: ZipInfo) -> bytes:
+        """Return the compressed data of the given ZIP item."""
+        offset = self.offset(info)
+        with open(self.fn, "rb") as fp:
+            fp.seek(offset)
+            return fp.read(info.compress_size)
+
+
+class _HttpSource:
+    """Class to represent a ZIP package on a server which is read on
+    demand using HTTP range requests.
+
+    The tail of the package, which usually contains the complete ZIP
+    directory, is taken from the initial response and kept in memory.
+    """
 
-    def seekable(self) -> bool:
+    def __init__(
+        self,
+        url: str,
+        headers: dict,
+        response: requests.Response,
+        session: requests.Session,
+    ) -> None:
+        self.url: str = url
+        self.headers: dict = headers
+        self.session: requests.Session = session
+        self.tail: bytes = response.content
+        start, self.size = _content_range(response)
+        self.tail_start: int = start
+
+    def file(self) -> typing.IO[bytes]:
+        """Return a buffered seekable file object of the ZIP package."""
+        return io.BufferedReader(_RangeFile(self), CHUNK_SIZE)
+
+    @contextmanager
+    def open(self) -> Iterator[ZipFile]:
+        with self.file() as fp:
+            with ZipFile(fp, "r") as zfp:
+                yield zfp
+
+    def samefile(self, fn: str) -> bool:
         return False
 
-    def close(self):
-        if not self._closed:
-            self.flush()
+    def unmodified(self) -> bool:
+        return True
+
+    def raw(self, info: ZipInfo) -> bytes:
+        """Return the compressed data of the given ZIP item."""
+        header = self.read(info.header_offset, sizeFileHeader)
+        return self.read(data_offset(info, header), info.compress_size)
+
+    def read(self, start: int, size: int) -> bytes:
+        """Return size bytes of the ZIP package starting at offset start."""
+        size = max(0, min(size, self.size - start))
+        if size == 0:
+            return b""
+        if start >= self.tail_start:
+            start -= self.tail_start
+            return self.tail[start : start + size]
+
+        headers = dict(self.headers)
+        headers["Range"] = "bytes=%d-%d" % (start, start + size - 1)
+        try:
+            response = self.session.get(self.url, headers=headers)
+        except Exception:
+            response = None
+        if response is None:
+            raise ConnectionError("Connection to server %s failed!" % self.url)
+        if response.status_code != 206 or _content_range(response)[0] != start:
+            raise requests.HTTPError("%d: Range request failed" % response.status_code)
+        return response.content
+
+
+class _RangeFile(io.RawIOBase):
+    """Unbuffered read-only file object of a ZIP package on a server."""
+
+    def __init__(self, source: _HttpSource) -> None:
+        self.source: _HttpSource = source
+        self.pos: int = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.pos
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self.pos
+        elif whence == os.SEEK_END:
+            offset += self.source.size
+        if offset < 0:
+            raise ValueError("Negative seek position %d" % offset)
+        self.pos = offset
+        return self.pos
+
+    def readinto(self, b) -> int:
+        data = self.source.read(self.pos, len(b))
+        b[: len(data)] = data
+        self.pos += len(data)
+        return len(data)
+
+
+def _content_range(response: requests.Response) -> tuple[int, int]:
+    """Return start offset and total size from the Content-Range header
+    of a partial response."""
+    value = response.headers.get("Content-Range", "")
+    try:
+        unit, value = value.split(" ", 1)
+        value, size = value.split("/", 1)
+        start = value.split("-", 1)[0]
+        return int(start), int(size)
+    except ValueError:
+        raise requests.HTTPError("Invalid Content-Range header: %r" % value)
+
+
+class _MemberReader:
+    """Reader of the members of a ZIP package for a pool of worker
+    threads. Each thread opens its own file handle, if the package is a
+    local file."""
+
+    def __init__(
+        self, zfp: ZipFile, source: "_ZipSource | _HttpSource | None", workers: int
+    ) -> None:
+        self.zfp: ZipFile = zfp
+        self.fn: str | None = None
+        if workers > 1 and isinstance(source, _ZipSource):
+            self.fn = source.fn
+        self.local: local = local()
+        self.handles: list[ZipFile] = []
+        self.lock: Lock = Lock()
+
+    def __enter__(self) -> "_MemberReader":
+        return self
+
+    def __exit__(self, *args):
+        for zfp in self.handles:
+            zfp.close()
+
+    def read(self, path: str) -> bytes:
+        """Return the uncompressed data of a member."""
+        zfp = self.zfp
+        if self.fn is not None:
+            zfp = getattr(self.local, "zfp", None)
+            if zfp is None:
+                zfp = self.local.zfp = ZipFile(self.fn, "r")
+                with self.lock:
+                    self.handles.append(zfp)
+        return read_member(zfp, self.zfp.getinfo(path))
+
+
+class _ZipMember:
+    """Class to represent a container item which is not decoded yet."""
+
+    def __init__(
+        self, source: "_ZipSource | _HttpSource", info: ZipInfo, mmap: bool = False
+    ) -> None:
+        self.source: _ZipSource | _HttpSource = source
+        self.info: ZipInfo = info
+        self.mmap: bool = mmap
+
+    @contextmanager
+    def open(self) -> Iterator[typing.IO[bytes]]:
+        with self.source.open() as zfp:
+            with open_member(zfp, self.info) as fp:
+                yield fp
+
+    def encode(self) -> bytes:
+        """Return the uncompressed item bytes from the ZIP package."""
+        with self.open() as fp:
+            return fp.read()
+
+
+class _ResumableUpload:
+    """Class to represent a chunked upload with a client-side manifest.
+
+    The server protocol is:
+        POST /api/uploads/: Create an upload and return its "id".
+        GET /api/uploads/<id>/: Return the current "offset" of the upload.
+        PUT /api/uploads/<id>/: Append a chunk at the offset given by the
+            Content-Range header and return the new "offset".
+        POST /api/uploads/<id>/complete/: Finish the upload. The response
+            is the same as for a container upload.
+    """
+
+    def __init__(
+        self, manifest: str, server: str, key: str, session: requests.Session
+    ) -> None:
+        self.manifest: str = manifest
+        self.package: str = os.path.splitext(manifest)[0] + ".zdc"
+        self.server: str = server
+        self.headers: dict = {"Authorization": "Token " + key}
+        self.session: requests.Session = session
+        self.id: str | None = None
+        self.state: dict = {}
+
+    def load(self, uuid: str, fingerprint: str) -> bool:
+        """Load the manifest of a previous upload of the same container
+        and return true, if it can be resumed."""
+        try:
+            with open(self.manifest, "r", encoding="utf8") as fp:
+                state = json.load(fp)
+            size = os.path.getsize(self.package)
+        except (OSError, ValueError):
+            return False
+        if not isinstance(state, dict):
+            return False
+        if (state.get("server"), state.get("uuid"), state.get("fingerprint")) != (
+            self.server,
+            uuid,
+            fingerprint,
+        ):
+            return False
+        if state.get("size") != size or not state.get("id"):
+            return False
+        if not state.get("storageTime"):
+            return False
+        if not isinstance(state.get("acknowledged"), list):
+            return False
+        self.state = state
+        self.id = state["id"]
+        return True
+
+    def create(self, uuid: str, fingerprint: str, storage_time: str):
+        """Create a new upload on the server and save its manifest."""
+        size = os.path.getsize(self.package)
+        response = self._request("post", "/api/uploads/", json={"size": size})
+        if response.status_code in (404, 405, 501):
+            return
+        response.raise_for_status()
+        self.id = str(response.json()["id"])
+        self.state = {
+            "server": self.server,
+            "uuid": uuid,
+            "fingerprint": fingerprint,
+            "storageTime": storage_time,
+            "id": self.id,
+            "size": size,
+            "acknowledged": [],
+        }
+        self._save()
+
+    def send(self, chunk_size: int) -> requests.Response:
+        """Send all chunks not acknowledged by the server yet and return
+        the response to the completion request.
+
+        Each chunk starts at the offset reported by the server, which may
+        have accepted only a part of the previous chunk. The range of
+        each acknowledged chunk is recorded in the manifest.
+        """
+        size = self.state["size"]
+        offset = self._offset()
+        with open(self.package, "rb") as fp:
+            while offset < size:
+                fp.seek(offset)
+                chunk = fp.read(chunk_size)
+                if not chunk:
+                    raise RuntimeError("File '%s' was truncated!" % self.package)
+                end = offset + len(chunk) - 1
+                headers = {"Content-Range": "bytes %d-%d/%d" % (offset, end, size)}
+                response = self._request(
+                    "put", "/api/uploads/%s/" % self.id, data=chunk, headers=headers
+                )
+                response.raise_for_status()
+                acknowledged = response.json()["offset"]
+                if not offset < acknowledged <= size:
+                    raise RuntimeError(
+                        "Server acknowledged offset %d for chunk at offset %d!"
+                        % (acknowledged, offset)
+                    )
+                self.state["acknowledged"].append([offset, acknowledged])
+                self._save()
+                offset = acknowledged
+        return self._request("post", "/api/uploads/%s/complete/" % self.id)
+
+    def remove(self):
+        """Remove manifest and ZIP package."""
+        for fn in (self.manifest, self.package):
             try:
-                self.queue.put(None, block=True, timeout=5)
-            except Exception as e:
-                self.error = e
-            self._closed = True
-
-    def get(self) -> bytes | None:
-        item = self.queue.get(block=True)
-        if item is None and self.error:
-            raise self.error
-        return item
+                os.remove(fn)
+            except OSError:
+                pass
+
+    def _offset(self) -> int:
+        """Return the offset reported by the server. Start a new upload,
+        if the server does not know the previous one any more. Servers
+        which do not report the offset continue after the last chunk
+        acknowledged in the manifest."""
+        response = self._request("get", "/api/uploads/%s/" % self.id)
+        if response.status_code in (405, 501):
+            acknowledged = self.state["acknowledged"]
+            return acknowledged[-1][1] if acknowledged else 0
+        if response.status_code == 404:
+            self.create(
+                self.state["uuid"],
+                self.state["fingerprint"],
+                self.state["storageTime"],
+            )
+            return 0
+        response.raise_for_status()
+        return response.json()["offset"]
+
+    def _request(self, method: str, path: str, **kwargs) -> requests.Response:
+        headers = dict(self.headers)
+        headers.update(kwargs.pop("headers", {}))
+        try:
+            return self.session.request(
+                method, self.server + path, headers=headers, **kwargs
+            )
+        except Exception:
+            raise ConnectionError("Connection to server %s failed!" % self.server)
+
+    def _save(self):
+        """Replace the manifest file atomically."""
+        tmp = self.manifest + ".tmp"
+        with open(tmp, "w", encoding="utf8") as fp:
+            json.dump(self.state, fp)
+        os.replace(tmp, self.manifest)
+
+
+##########################################################################
+# Executors of the asyncio API
+
+# Maximum number of threads of the shared executor for file operations,
+# encoding and decoding
+ASYNC_WORKERS = 4
+
+# Maximum number of threads of the shared executor for network transfers
+ASYNC_TRANSFERS = 16
+
+_executor = None
+_transfer_executor = None
+_executor_lock = Lock()
+
+
+def get_executor() -> Executor:
+    """Return the shared executor of the asyncio API for file operations
+    as well as encoding and decoding of containers. It is a pool of at
+    most ASYNC_WORKERS threads.
+
+    Returns:
+        Executor: Shared thread pool executor.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=ASYNC_WORKERS, thread_name_prefix="scidata"
+            )
+        return _executor
+
+
+def get_transfer_executor() -> Executor:
+    """Return the shared executor of the asyncio API for network
+    transfers. It is a pool of at most ASYNC_TRANSFERS threads, which is
+    separate from get_executor(), so that long transfers do not delay
+    file operations.
+
+    Returns:
+        Executor: Shared thread pool executor.
+    """
+    global _transfer_executor
+    with _executor_lock:
+        if _transfer_executor is None:
+            _transfer_executor = ThreadPoolExecutor(
+                max_workers=ASYNC_TRANSFERS, thread_name_prefix="scidata-transfer"
+            )
+        return _transfer_executor
+
+
+async def _run(
+    executor: Executor | None, func: typing.Callable, transfer: bool = False
+) -> typing.Any:
+    """Run a blocking function in an executor and await its result."""
+    if executor is None:
+        executor = get_transfer_executor() if transfer else get_executor()
+    return await asyncio.get_running_loop().run_in_executor(executor, func)
+
+
+def _data_size(data: typing.Any, depth: int = 1) -> int:
+    """Return an upper estimate of the encoded size of item data without
+    encoding it. Arrays count with their number of bytes, strings with
+    the maximum length of their JSON representation and containers with
+    their elements plus indentation."""
+    if hasattr(data, "nbytes"):
+        return int(data.nbytes) + 256
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return len(data)
+    if isinstance(data, str):
+        return 6 * len(data) + 2
+    if isinstance(data, dict):
+        return 2 + sum(
+            _data_size(k, depth + 1) + _data_size(v, depth + 1) + 4 * depth + 4
+            for k, v in data.items()
+        )
+    if isinstance(data, (list, tuple)):
+        return 2 + sum(_data_size(v, depth + 1) + 4 * depth + 2 for v in data)
+    return 24
+
+
+def _result(key: typing.Any, future: Future) -> tuple[typing.Any, typing.Any]:
+    """Return key and result or exception of a finished future."""
+    try:
+        return key, future.result()
+    except Exception as e:
+        return key, e
+
+
+def _read_chunks(fn: str | os.PathLike) -> Iterator[bytes]:
+    """Yield the content of a file chunkwise."""
+    with open(fn, "rb") as fp:
+        while chunk := fp.read(CHUNK_SIZE):
+            yield chunk
+
+
+@contextmanager
+def _replace(fn: str | os.PathLike, keep: bool = False) -> Iterator[typing.IO[bytes]]:
+    """Context manager returning a temporary file, which atomically
+    replaces the given file after it was closed successfully."""
+    fn = os.path.abspath(fn)
+    directory, name = os.path.split(fn)
+    tmp = os.path.join(directory, ".%s.%s.tmp" % (name, uuid.uuid4().hex[:8]))
+    try:
+        with open(tmp, "xb") as fp:
+            yield fp
+            fp.flush()
+            os.fsync(fp.fileno())
+        if os.path.exists(fn):
+            shutil.copymode(fn, tmp)
+            if keep:
+                _link(fn, fn + "~")
+        os.replace(tmp, fn)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+    # Make the rename persistent (not supported on Windows)
+    try:
+        dfd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dfd)
+    except OSError:
+        pass
+    finally:
+        os.close(dfd)
+
+
+def _link(src: str, dst: str):
+    """Replace the file dst by a hard link to the file src or by a copy,
+    if the file system does not support hard links."""
+    tmp = dst + ".tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+
+
+class _ChunkSink:
+    """Write target of a ZipWriter, which collects the written data
+    without copying it."""
+
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+
+    def write(self, b: bytes) -> int:
+        self.chunks.append(b)
+        return len(b)
+
+    def drain(self) -> Iterator[bytes]:
+        """Yield the collected data. Small pieces like the headers of ZIP
+        members are joined with their neighbours."""
+        chunks, self.chunks = self.chunks, []
+        small = []
+        for chunk in chunks:
+            if len(chunk) >= CHUNK_SIZE:
+                if small:
+                    yield b"".join(small)
+                    small = []
+                yield chunk
+            else:
+                small.append(chunk)
+        if small:
+            yield b"".join(small)
 
 
 class _MultipartRequestStreamer:
@@ -17,6 +17,7 @@
 #
 ##########################################################################
 
+import codecs
 import hashlib
 import json
 import typing
@@ -29,6 +30,14 @@ from abc import ABC, abstractmethod
 class AbstractFile(ABC):
     """Base class for converting datatypes to their file representation."""
 
+    _encoded = None
+    _digest = None
+
+    holds_gil = False
+    """holds_gil (bool): True, if the decoder holds the GIL. Containers with\
+                         worker processes decode such items in a separate\
+                         process."""
+
     def __init__(self, data):
         """Constructor to create an instance of the converter class."""
         if isinstance(data, bytes):
@@ -42,7 +51,76 @@ class AbstractFile(ABC):
         Returns:
             str: Hex digest of this object as string.
         """
-        return hashlib.sha256(self.encode()).hexdigest()
+        return self.digest()
+
+    def encoded(self, cache: bool = True) -> bytes:
+        """Return the encoded bytes string of this object. The bytes string
+        is cached until invalidate() is called.
+
+        Args:
+            cache: If false, an already cached bytes string is used and
+                dropped, and a new one is not stored. The digest is kept.
+
+        Returns:
+            bytes: Byte string representation of the object.
+        """
+        if self._encoded is not None:
+            data = self._encoded
+            if not cache:
+                self._encoded = None
+            return data
+        data = self.encode()
+        if cache:
+            self._encoded = data
+        return data
+
+    def iter_encoded(self, cache: bool = True) -> typing.Iterator[bytes]:
+        """Return an iterator over consecutive chunks of the encoded bytes
+        string. The default implementation yields the result of encoded()
+        as single chunk. Subclasses may override this method together with
+        encoded_size() to stream large objects without building the whole
+        bytes string.
+
+        Args:
+            cache: If false, an already cached bytes string is used and
+                dropped, and a new one is not stored.
+
+        Returns:
+            typing.Iterator[bytes]: Chunks of the byte string
+                representation of the object. Chunks may also be other
+                bytes-like objects like memoryview.
+        """
+        yield self.encoded(cache)
+
+    def encoded_size(self) -> int | None:
+        """Return the length of the encoded bytes string, if it is known
+        without encoding the object and iter_encoded() streams it in
+        chunks. Return None otherwise.
+
+        Returns:
+            int: Number of bytes or None.
+        """
+        return None
+
+    def digest(self) -> str:
+        """Return hex digest of the SHA256 hash of the encoded bytes string.
+        The digest is cached until invalidate() is called.
+
+        Returns:
+            str: Hex digest of the encoded object as string.
+        """
+        if self._digest is None:
+            h = hashlib.sha256()
+            for chunk in self.iter_encoded():
+                h.update(chunk)
+            self._digest = h.hexdigest()
+        return self._digest
+
+    def invalidate(self):
+        """Drop cached bytes string and digest. This method must be called
+        after the data of this object was modified in place."""
+        self._encoded = None
+        self._digest = None
 
     @abstractmethod
     def encode(self) -> bytes:
@@ -104,6 +182,8 @@ class JsonFile(AbstractFile):
     """Data conversion class for a JSON file represented as Python
     dictionary."""
 
+    holds_gil = True
+
     indent = 4
     """indent (int): Indentation of exported JSON files."""
     charset = "utf8"
@@ -139,12 +219,19 @@ class JsonFile(AbstractFile):
         sorted compact representation. This should result in the same
         hash for semantically equal data dictionaries.
 
+        The representation is fed to the hash in chunks without building
+        the whole string, unless sortit() is overridden by a subclass.
+
         Returns:
             str: Hex digest of this object as string.
         """
 
-        data = bytes(self.sortit(self.data), self.charset)
-        return hashlib.sha256(data).hexdigest()
+        h = hashlib.sha256()
+        if type(self).sortit is not JsonFile.sortit:
+            h.update(bytes(self.sortit(self.data), self.charset))
+        else:
+            _sortit_stream(self.data, h.update, self.charset)
+        return h.hexdigest()
 
     def encode(self) -> bytes:
         """Convert dictionary to pretty string representation with
@@ -165,9 +252,82 @@ class JsonFile(AbstractFile):
         self.data = json.loads(data.decode(self.charset))
 
 
+# Maximum number of leaves converted at once by _sortit_stream()
+_SLICE = 4096
+
+# Types represented recursively by JsonFile.sortit()
+_NESTED = (dict, list, tuple)
+
+
+def _sortit_stream(
+    data: typing.Any, update: typing.Callable[[bytes], None], charset: str
+):
+    """Feed the encoded representation of JsonFile.sortit() to the given
+    function in chunks. The structure is walked once and only a bounded
+    number of string pieces is kept in memory.
+
+    Args:
+        data: Dictionary, list or tuple to represent.
+        update: Function which takes each chunk as bytes string, e.g. the
+            method update() of a hash object.
+        charset: Character encoding of the representation.
+    """
+
+    encode = codecs.getincrementalencoder(charset)().encode
+    parts = []
+
+    def flush():
+        update(encode("".join(parts)))
+        parts.clear()
+
+    def walk(data):
+        if isinstance(data, dict):
+            parts.append("{")
+            keys = sorted(data.keys())
+            sep = ""
+            if any(isinstance(v, _NESTED) for v in data.values()):
+                for k in keys:
+                    parts.append(sep + k + ": ")
+                    sep = ", "
+                    walk(data[k])
+            else:
+                # Leaves are converted in slices by a single join
+                for i in range(0, len(keys), _SLICE):
+                    pairs = [k + ": " + repr(data[k]) for k in keys[i : i + _SLICE]]
+                    parts.append(sep + ", ".join(pairs))
+                    sep = ", "
+                    flush()
+            parts.append("}")
+        elif isinstance(data, (list, tuple)):
+            parts.append("[")
+            sep = ""
+            if any(isinstance(v, _NESTED) for v in data):
+                for v in data:
+                    parts.append(sep)
+                    sep = ", "
+                    walk(v)
+            else:
+                # Leaves are converted in slices by a single join
+                for i in range(0, len(data), _SLICE):
+                    parts.append(sep + ", ".join(map(repr, data[i : i + _SLICE])))
+                    sep = ", "
+                    flush()
+            parts.append("]")
+        else:
+            parts.append(repr(data))
+        if len(parts) >= _SLICE:
+            flush()
+
+    walk(data)
+    flush()
+    update(encode("", True))
+
+
 class TabSeparatedValuesFile(AbstractFile):
     """Data conversion class for a tab-separated value file."""
 
+    holds_gil = True
+
     charset = "utf8"
     """charset (str): Character encoding used for translation from a list of\
                       lists to bytes."""
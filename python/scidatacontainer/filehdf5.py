@@ -5,6 +5,20 @@ import h5py
 import numpy as np
 
 from scidatacontainer import AbstractFile
+from scidatacontainer.filenumpy import array_chunks
+
+
+def _buffer_hash(value) -> str:
+    """Return hex digest of the SHA256 hash of the memory buffer of a
+    value. The buffers of arrays are hashed chunkwise without a copy."""
+    if not isinstance(value, np.ndarray):
+        if hasattr(value, "data"):
+            return sha256(value.data).hexdigest()
+        value = np.array(value)
+    h = sha256()
+    for chunk in array_chunks(value):
+        h.update(chunk)
+    return h.hexdigest()
 
 
 class Hdf5File(AbstractFile):
@@ -59,7 +73,7 @@ class Hdf5File(AbstractFile):
 
     def hash(self) -> str:
         if isinstance(self.data, np.ndarray):
-            return sha256(self.data.data).hexdigest()
+            return _buffer_hash(self.data)
 
         return sha256(
             " ".join(
@@ -67,13 +81,7 @@ class Hdf5File(AbstractFile):
                     " ".join(
                         [
                             sha256(key.encode("utf-8")).hexdigest(),
-                            sha256(
-                                getattr(
-                                    self.data[key],
-                                    "data",
-                                    np.array(self.data[key]).data,
-                                )
-                            ).hexdigest(),
+                            _buffer_hash(self.data[key]),
                         ]
                     )
                     for key in sorted(self.data.keys())
@@ -18,11 +18,47 @@
 ##########################################################################
 
 import io
+import typing
 
 import numpy as np
 
 from .filebase import AbstractFile
 
+# Size of the chunks of array data in bytes
+CHUNK_SIZE = 1024 * 1024
+
+
+def array_chunks(
+    array: np.ndarray, order: str = "C", chunk_size: int = CHUNK_SIZE
+) -> typing.Iterator[memoryview | bytes]:
+    """Return an iterator over chunks of the raw data of an array.
+
+    Chunks of a contiguous array are memoryviews of the array data.
+    Other arrays are copied chunkwise.
+
+    Args:
+        array: NumPy array.
+        order: Memory order "C" or "F" of the data.
+        chunk_size: Maximum size of each chunk in bytes.
+
+    Returns:
+        typing.Iterator: Chunks of the array data.
+    """
+
+    if array.nbytes == 0:
+        return
+    if order == "F":
+        array = array.T
+    if array.flags.c_contiguous:
+        data = memoryview(array.reshape(-1).view(np.uint8))
+        for i in range(0, len(data), chunk_size):
+            yield data[i : i + chunk_size]
+    else:
+        flags = ["external_loop", "buffered", "zerosize_ok"]
+        size = max(chunk_size // array.itemsize, 1)
+        for chunk in np.nditer(array, flags=flags, buffersize=size, order="C"):
+            yield chunk.tobytes("C")
+
 
 class NpyFile(AbstractFile):
     """Data conversion class for NumPy arrays (ndarray)."""
@@ -34,9 +70,45 @@ class NpyFile(AbstractFile):
 
         with io.BytesIO() as fp:
             np.save(fp, self.data, allow_pickle=self.allow_pickle)
-            fp.seek(0)
-            data = fp.read()
-        return data
+            return fp.getvalue()
+
+    def _header(self) -> bytes | None:
+        """Return the header of the NumPy file or None, if the array
+        data cannot be streamed."""
+
+        if not isinstance(self.data, np.ndarray) or self.data.dtype.hasobject:
+            return None
+        fmt = np.lib.format
+        header = fmt.header_data_from_array_1_0(self.data)
+        for write in (fmt.write_array_header_1_0, fmt.write_array_header_2_0):
+            with io.BytesIO() as fp:
+                try:
+                    write(fp, header)
+                except ValueError:
+                    continue
+                return fp.getvalue()
+        return None
+
+    def iter_encoded(self, cache=True):
+        """Return an iterator over chunks of the NumPy file. The header is
+        followed by memoryviews of the array data, which is neither copied
+        nor cached."""
+
+        header = None if self._encoded is not None else self._header()
+        if header is None:
+            yield self.encoded(cache)
+            return
+        yield header
+        fortran = self.data.flags.f_contiguous and not self.data.flags.c_contiguous
+        yield from array_chunks(self.data, "F" if fortran else "C")
+
+    def encoded_size(self):
+        """Return the size of the NumPy file without encoding it."""
+
+        header = None if self._encoded is not None else self._header()
+        if header is None:
+            return None
+        return len(header) + self.data.nbytes
 
     def decode(self, data):
         """Decode NumPy array from bytes string."""
@@ -46,6 +118,31 @@ class NpyFile(AbstractFile):
             fp.seek(0)
             self.data = np.load(fp, allow_pickle=self.allow_pickle)
 
+    @classmethod
+    def map(cls, fn, offset):
+        """Map NumPy array stored at the given offset of a file read-only
+        into memory. Return None, if the array cannot be mapped."""
+
+        with open(fn, "rb") as fp:
+            fp.seek(offset)
+            version = np.lib.format.read_magic(fp)
+            if version == (1, 0):
+                header = np.lib.format.read_array_header_1_0(fp)
+            elif version == (2, 0):
+                header = np.lib.format.read_array_header_2_0(fp)
+            else:
+                return None
+            offset = fp.tell()
+
+        shape, fortran_order, dtype = header
+        if dtype.hasobject or 0 in shape:
+            return None
+        order = "F" if fortran_order else "C"
+        data = np.memmap(
+            fn, dtype=dtype, mode="r", offset=offset, shape=shape, order=order
+        )
+        return cls(data)
+
 
 register = [
     ("npy", NpyFile, np.ndarray),
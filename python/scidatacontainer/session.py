@@ -0,0 +1,110 @@
+##########################################################################
+# Copyright (c) 2023-2024 Reinhard Caspary                               #
+# <reinhard.caspary@phoenixd.uni-hannover.de>                            #
+# This program is free software under the terms of the MIT license.      #
+##########################################################################
+#
+# This module provides the class Session, which is used by containers to
+# communicate with a server. It keeps a pool of keep-alive connections
+# and applies a default timeout and a retry policy to all requests.
+#
+# The function get_session() returns a session shared by all containers
+# with the same server configuration parameters:
+#
+# Parameter                           | key
+# ------------------------------------+---------
+# timeout in seconds                  | timeout
+# number of retries                   | retries
+# backoff factor of retries (seconds) | backoff
+#
+##########################################################################
+
+from threading import Lock
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Shared sessions indexed by their parameters
+_sessions = {}
+_lock = Lock()
+
+
+class Session(requests.Session):
+    """HTTP session with connection pool, default timeout and retry
+    policy.
+
+    Connection errors and the HTTP status codes 502, 503 and 504 are
+    retried with exponential backoff. Requests with the method POST are
+    never retried after they were sent to the server.
+    """
+
+    def __init__(
+        self,
+        timeout: float | None = None,
+        retries: int = 0,
+        backoff: float = 0.0,
+        pool_size: int = 10,
+    ) -> None:
+        """Construct a Session object.
+
+        Args:
+            timeout: Timeout in seconds for connecting to the server and
+                for waiting on data. No timeout, if this is None.
+            retries: Maximum number of retries of a request.
+            backoff: Backoff factor in seconds between retries.
+            pool_size: Maximum number of connections kept alive.
+        """
+        super().__init__()
+        self.timeout: float | None = timeout
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(502, 503, 504),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+        )
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+
+    def request(self, method, url, **kwargs) -> requests.Response:
+        """Send a request using the default timeout of this session."""
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().request(method, url, **kwargs)
+
+
+def get_session(config: dict | None = None, pool_size: int = 10) -> Session:
+    """Return the shared session for the given configuration.
+
+    Args:
+        config: Configuration dictionary as returned by load_config().
+            Empty or missing values of the keys "timeout", "retries" and
+            "backoff" select the defaults (no timeout, 3 retries, backoff
+            factor 0.5 seconds).
+        pool_size: Maximum number of connections kept alive.
+
+    Returns:
+        Session: Session shared by all callers with the same parameters.
+    """
+    if config is None:
+        config = {}
+    timeout = _value(config, "timeout", None, float)
+    retries = _value(config, "retries", 3, int)
+    backoff = _value(config, "backoff", 0.5, float)
+
+    key = (timeout, retries, backoff, pool_size)
+    with _lock:
+        if key not in _sessions:
+            _sessions[key] = Session(timeout, retries, backoff, pool_size)
+        return _sessions[key]
+
+
+def _value(config: dict, key: str, default, cls):
+    """Return a numeric configuration value or its default."""
+    value = config.get(key)
+    if value is None or value == "":
+        return default
+    return cls(value)
@@ -0,0 +1,196 @@
+import hashlib
+import io
+import json
+import re
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from urllib.parse import parse_qs, urlsplit
+from zipfile import ZipFile
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body=b"", headers={}):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.sent += len(body)
+
+    def do_GET(self):
+        self.server.requests.append(("GET", self.path, dict(self.headers)))
+        self.server.clients.add(self.client_address)
+        if self.headers.get("Authorization") != "Token " + self.server.key:
+            return self._reply(403)
+
+        url = urlsplit(self.path)
+        if url.path == "/api/datasets/lookup/" and self.server.lookup:
+            return self._lookup(parse_qs(url.query).get("hash", [""])[0])
+        match = re.fullmatch(r"/api/uploads/(\d+)/", self.path)
+        if match and self.server.uploads is not None:
+            if match[1] not in self.server.uploads:
+                return self._reply(404)
+            offset = len(self.server.uploads[match[1]])
+            return self._reply(200, json.dumps({"offset": offset}).encode())
+
+        match = re.fullmatch(r"/api/datasets/([0-9a-f-]+)/download/", self.path)
+        if match is None or match[1] not in self.server.datasets:
+            return self._reply(404)
+        data = self.server.datasets[match[1]]
+
+        # Entity tag for conditional requests
+        etag = '"%s"' % hashlib.sha256(data).hexdigest()[:16]
+        if self.headers.get("If-None-Match") == etag:
+            return self._reply(304, headers={"ETag": etag})
+
+        # Single byte range in the form "bytes=a-b" or "bytes=-n"
+        match = re.fullmatch(r"bytes=(\d*)-(\d*)", self.headers.get("Range", ""))
+        if match is None or not self.server.ranges:
+            return self._reply(200, data, {"ETag": etag})
+        if match[1]:
+            start = int(match[1])
+            stop = min(int(match[2]) + 1 if match[2] else len(data), len(data))
+        else:
+            start = max(len(data) - int(match[2]), 0)
+            stop = len(data)
+        headers = {"Content-Range": "bytes %d-%d/%d" % (start, stop - 1, len(data))}
+        self._reply(206, data[start:stop], headers)
+
+    def _content(self, uuid):
+        with ZipFile(io.BytesIO(self.server.datasets[uuid])) as zfp:
+            return json.loads(zfp.read("content.json"))
+
+    def _lookup(self, hash):
+        for uuid in self.server.datasets:
+            content = self._content(uuid)
+            if content["static"] and content["hash"] == hash:
+                body = {"id": uuid, "static": True, "hash": hash}
+                return self._reply(200, json.dumps(body).encode())
+        self._reply(404)
+
+    def _body(self):
+        if self.headers.get("Transfer-Encoding") != "chunked":
+            return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = []
+        while size := int(self.rfile.readline().split(b";")[0], 16):
+            body.append(self.rfile.read(size))
+            self.rfile.readline()
+        self.rfile.readline()
+        return b"".join(body)
+
+    def do_POST(self):
+        self.server.requests.append(("POST", self.path, dict(self.headers)))
+        with self.server.lock:
+            self.server.running += 1
+            self.server.concurrent = max(self.server.concurrent, self.server.running)
+        try:
+            body = self._body()
+        finally:
+            with self.server.lock:
+                self.server.running -= 1
+        self.server.received += len(body)
+
+        if self.headers.get("Authorization") != "Token " + self.server.key:
+            return self._reply(403)
+
+        # Resumable uploads
+        if self.path == "/api/uploads/" and self.server.uploads is not None:
+            uid = "%d" % len(self.server.uploads)
+            self.server.uploads[uid] = b""
+            return self._reply(201, json.dumps({"id": uid, "offset": 0}).encode())
+        match = re.fullmatch(r"/api/uploads/(\d+)/complete/", self.path)
+        if match and self.server.uploads is not None:
+            if match[1] not in self.server.uploads:
+                return self._reply(404)
+            if self.server.fail_complete:
+                return self._reply(500)
+            return self._store(self.server.uploads.pop(match[1]))
+
+        if self.path != "/api/datasets/":
+            return self._reply(404)
+
+        # Strip the multipart head and trailer
+        self._store(body[body.index(b"\r\n\r\n") + 4 : body.rindex(b"\r\n--")])
+
+    def do_PUT(self):
+        self.server.requests.append(("PUT", self.path, dict(self.headers)))
+        body = self._body()
+        self.server.received += len(body)
+        if self.headers.get("Authorization") != "Token " + self.server.key:
+            return self._reply(403)
+        match = re.fullmatch(r"/api/uploads/(\d+)/", self.path)
+        if not match or match[1] not in self.server.uploads:
+            return self._reply(404)
+
+        # Simulated failure
+        if self.server.fail_after is not None:
+            if self.server.fail_after <= 0:
+                return self._reply(500)
+            self.server.fail_after -= 1
+
+        # Chunks are appended at the current offset only
+        data = self.server.uploads[match[1]]
+        crange = re.fullmatch(r"bytes (\d+)-(\d+)/\d+", self.headers["Content-Range"])
+        if int(crange[1]) != len(data):
+            return self._reply(409)
+        # Simulated short write
+        if self.server.short is not None:
+            body = body[: self.server.short]
+        self.server.uploads[match[1]] = data + body
+        offset = len(self.server.uploads[match[1]])
+        self._reply(200, json.dumps({"offset": offset}).encode())
+
+    def _store(self, data):
+        with ZipFile(io.BytesIO(data)) as zfp:
+            content = json.loads(zfp.read("content.json"))
+
+        # Static containers are identified by their hash
+        if content["static"]:
+            for uuid in self.server.datasets:
+                other = self._content(uuid)
+                if other["static"] and other["hash"] == content["hash"]:
+                    body = json.dumps({"id": uuid, "static": True}).encode()
+                    return self._reply(400, body)
+        if content["uuid"] in self.server.datasets:
+            return self._reply(409)
+        self.server.datasets[content["uuid"]] = data
+        self._reply(201)
+
+
+class DatasetServer(ThreadingHTTPServer):
+    """Minimal local stand-in for the dataset API of a server."""
+
+    daemon_threads = True
+
+    def __init__(self, key="SECRETKEY", ranges=True, lookup=True, uploads=True):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.key = key
+        self.ranges = ranges
+        self.lookup = lookup
+        self.uploads = {} if uploads else None
+        self.fail_after = None
+        self.short = None
+        self.fail_complete = False
+        self.datasets = {}
+        self.requests = []
+        self.clients = set()
+        self.sent = 0
+        self.received = 0
+        self.running = 0
+        self.concurrent = 0
+        self.lock = Lock()
+        self.url = "http://127.0.0.1:%d" % self.server_address[1]
+
+    def __enter__(self):
+        Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,99 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import TemporaryDirectory
+from unittest import IsolatedAsyncioTestCase, mock
+
+from scidatacontainer import Container
+
+from . import get_test_container
+from ._http_server import DatasetServer
+
+
+class AsyncioTest(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.fn = os.path.join(self.tmpdir.name, "test.zdc")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    async def test_write(self):
+        dc = get_test_container()
+        dc["data/random.bin"] = os.urandom(10000)
+        dc.freeze()
+        localtime = time.localtime()
+        with mock.patch("time.localtime", return_value=localtime):
+            dc.write(self.fn)
+            with open(self.fn, "rb") as fp:
+                expected = fp.read()
+            await dc.awrite(self.fn)
+        with open(self.fn, "rb") as fp:
+            self.assertEqual(fp.read(), expected)
+
+        b = await Container.aopen(self.fn)
+        self.assertEqual(b["data/random.bin"], dc["data/random.bin"])
+
+    async def test_gather(self):
+        containers = []
+        for i in range(6):
+            dc = get_test_container()
+            dc["data/index.txt"] = str(i)
+            containers.append(dc)
+        fns = [os.path.join(self.tmpdir.name, "test%d.zdc" % i) for i in range(6)]
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            await asyncio.gather(
+                *(dc.awrite(fn, executor=executor) for dc, fn in zip(containers, fns))
+            )
+            results = await asyncio.gather(
+                *(Container.aopen(fn, executor=executor) for fn in fns)
+            )
+        self.assertEqual([b["data/index.txt"] for b in results], list("012345"))
+
+    async def test_upload_fetch(self):
+        dc = get_test_container()
+        dc.freeze()
+        with DatasetServer() as server:
+            config = {"server": server.url, "key": server.key}
+            await dc.aupload(server=server.url, key=server.key)
+            b = await Container.afetch(dc.uuid, config=config)
+        self.assertEqual(b["content.json"]["hash"], dc["content.json"]["hash"])
+
+    async def test_transfer_executor(self):
+        dc = get_test_container()
+        threads = {}
+
+        def _record(name, func):
+            def wrapper(*args, **kwargs):
+                threads[name] = threading.current_thread().name
+                return func(*args, **kwargs)
+
+            return wrapper
+
+        # Encoding and requests run in separate executors
+        with ThreadPoolExecutor(1, "encode") as executor, ThreadPoolExecutor(
+            1, "transfer"
+        ) as transfer_executor, DatasetServer() as server:
+            with mock.patch.object(
+                Container,
+                "encode",
+                autospec=True,
+                side_effect=_record("encode", Container.encode),
+            ), mock.patch.object(
+                Container,
+                "_post",
+                autospec=True,
+                side_effect=_record("post", Container._post),
+            ):
+                await dc.aupload(
+                    server=server.url,
+                    key=server.key,
+                    executor=executor,
+                    transfer_executor=transfer_executor,
+                )
+        self.assertTrue(threads["encode"].startswith("encode"))
+        self.assertTrue(threads["post"].startswith("transfer"))
+        self.assertFalse(dc.mutable)
+        self.assertIn(dc.uuid, server.datasets)
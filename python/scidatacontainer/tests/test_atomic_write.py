@@ -0,0 +1,64 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock
+
+from scidatacontainer import Container
+from scidatacontainer.filebase import TabSeparatedValuesFile
+
+from . import get_test_container
+
+
+class AtomicWriteTest(TestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.fn = os.path.join(self.tmpdir.name, "test.zdc")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_atomic(self):
+        a = get_test_container()
+        a.write(self.fn, atomic=True)
+        self.assertEqual(os.listdir(self.tmpdir.name), ["test.zdc"])
+
+        b = Container(file=self.fn)
+        self.assertEqual(b["content.json"]["uuid"], a["content.json"]["uuid"])
+        self.assertEqual(b["meas/image.tsv"], a["meas/image.tsv"])
+
+    def test_keep(self):
+        a = get_test_container()
+        a.write(self.fn)
+        with open(self.fn, "rb") as fp:
+            previous = fp.read()
+        os.chmod(self.fn, 0o640)
+
+        a.release()
+        a["log/console.txt"] = "Hello World!"
+        a.write(self.fn, keep=True)
+        self.assertEqual(
+            sorted(os.listdir(self.tmpdir.name)), ["test.zdc", "test.zdc~"]
+        )
+        with open(self.fn + "~", "rb") as fp:
+            self.assertEqual(fp.read(), previous)
+        self.assertEqual(os.stat(self.fn).st_mode & 0o777, 0o640)
+
+        b = Container(file=self.fn)
+        self.assertEqual(b["log/console.txt"], "Hello World!")
+
+    def test_failure(self):
+        a = get_test_container()
+        a.write(self.fn)
+        with open(self.fn, "rb") as fp:
+            previous = fp.read()
+
+        a.release()
+        with mock.patch.object(
+            TabSeparatedValuesFile, "encode", side_effect=RuntimeError("crash")
+        ):
+            with self.assertRaises(RuntimeError):
+                a.write(self.fn, atomic=True)
+
+        # The previous version is unchanged and no temporary file is left
+        self.assertEqual(os.listdir(self.tmpdir.name), ["test.zdc"])
+        with open(self.fn, "rb") as fp:
+            self.assertEqual(fp.read(), previous)
@@ -0,0 +1,127 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from scidatacontainer import Container, DownloadCache
+from scidatacontainer.cache import get_cache
+
+from . import get_test_container
+from ._http_server import DatasetServer
+
+
+class DownloadCacheTest(TestCase):
+    uuid = "00000000-0000-0000-0000-000000000000"
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.server = DatasetServer().__enter__()
+        self.config = {"server": self.server.url, "key": self.server.key}
+
+    def tearDown(self):
+        self.server.__exit__()
+        shutil.rmtree(self.directory)
+
+    def _publish(self, uuid=uuid, static=True, size=0):
+        dc = get_test_container()
+        dc["content.json"]["uuid"] = uuid
+        dc["data/random.bin"] = os.urandom(size)
+        if static:
+            dc.freeze()
+        self.server.datasets[uuid] = b"".join(dc.encode())
+        return dc
+
+    def test_static(self):
+        dc = self._publish()
+        cache = DownloadCache(self.directory)
+        a = Container(uuid=self.uuid, config=self.config, cache=cache)
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertTrue(os.path.exists(cache.path(self.uuid)))
+
+        b = Container(uuid=self.uuid, config=self.config, cache=cache)
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(b["content.json"]["hash"], dc["content.json"]["hash"])
+        self.assertEqual(b["data/random.bin"], a["data/random.bin"])
+        self.assertFalse(b.mutable)
+
+    def test_not_static(self):
+        self._publish(static=False)
+        cache = DownloadCache(self.directory)
+        Container(uuid=self.uuid, config=self.config, cache=cache)
+        Container(uuid=self.uuid, config=self.config, cache=cache)
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertIsNone(cache.lookup(self.uuid))
+
+    def test_revalidate(self):
+        dc = self._publish(static=False, size=100000)
+        cache = DownloadCache(self.directory, revalidate=True)
+        Container(uuid=self.uuid, config=self.config, cache=cache)
+        sent = self.server.sent
+
+        b = Container(uuid=self.uuid, config=self.config, cache=cache)
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(self.server.sent, sent)
+        self.assertEqual(b["data/random.bin"], dc["data/random.bin"])
+
+        # Modified container is downloaded again
+        dc = self._publish(static=False)
+        c = Container(uuid=self.uuid, config=self.config, cache=cache)
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(c["data/random.bin"], dc["data/random.bin"])
+
+    def test_stale(self):
+        dc = self._publish(static=False, size=100)
+        cache = DownloadCache(self.directory, revalidate=True)
+        Container(uuid=self.uuid, config=self.config, cache=cache)
+
+        # Cached file of another version is not served, although the
+        # server confirms the validator of the index entry
+        other = get_test_container()
+        other["content.json"]["uuid"] = self.uuid
+        other["data/random.bin"] = os.urandom(100)
+        other.write(cache.path(self.uuid))
+        b = Container(uuid=self.uuid, config=self.config, cache=cache)
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(b["data/random.bin"], dc["data/random.bin"])
+        self.assertTrue(cache.verify(self.uuid, cache.lookup(self.uuid)))
+
+    def test_eviction(self):
+        uuids = ["00000000-0000-0000-0000-%012d" % i for i in range(3)]
+        for uuid in uuids:
+            self._publish(uuid, size=100000)
+        cache = DownloadCache(self.directory, max_size=250000)
+        for i, uuid in enumerate(uuids[:2]):
+            Container(uuid=uuid, config=self.config, cache=cache)
+            os.utime(cache.path(uuid), (i + 1, i + 1))
+
+        # Access of the first container makes the second one the least
+        # recently used
+        Container(uuid=uuids[0], config=self.config, cache=cache)
+        Container(uuid=uuids[2], config=self.config, cache=cache)
+        self.assertEqual(
+            [cache.lookup(uuid) is not None for uuid in uuids], [True, False, True]
+        )
+
+    def test_corrupt(self):
+        dc = self._publish()
+        cache = DownloadCache(self.directory)
+        Container(uuid=self.uuid, config=self.config, cache=cache)
+        with open(cache.path(self.uuid), "wb") as fp:
+            fp.write(b"garbage")
+
+        b = Container(uuid=self.uuid, config=self.config, cache=cache)
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(b["content.json"]["hash"], dc["content.json"]["hash"])
+        self.assertIsNotNone(cache.lookup(self.uuid))
+
+    def test_config(self):
+        self.assertIsNone(get_cache({"cache": ""}))
+        config = {"cache": self.directory, "cachesize": "2", "revalidate": "yes"}
+        cache = get_cache(config)
+        self.assertIs(cache, get_cache(dict(config)))
+        self.assertEqual(cache.max_size, 2 * 1024 * 1024)
+        self.assertTrue(cache.revalidate)
+
+        self._publish()
+        Container(uuid=self.uuid, config=dict(self.config, **config))
+        self.assertIsNotNone(cache.lookup(self.uuid))
@@ -0,0 +1,127 @@
+import io
+import os
+import unittest
+from pathlib import Path
+from tempfile import NamedTemporaryFile, TemporaryDirectory
+from unittest import TestCase, mock
+from zipfile import ZIP_BZIP2, ZIP_LZMA, ZipFile
+
+from scidatacontainer import Container, zipstream
+from scidatacontainer.compression import preset
+from scidatacontainer.zipstream import ZIP_ZSTANDARD
+
+from . import get_test_container
+
+TEXT = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 2000
+
+
+class _CodecTestCase(TestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.fn = os.path.join(self.tmpdir.name, "test.zdc")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _roundtrip(self, compression, compresslevel=-1):
+        a = get_test_container()
+        a["data/text.txt"] = TEXT
+        a.compression = compression
+        a.compresslevel = compresslevel
+        a.write(self.fn, freeze=True)
+
+        # Hash is verified while reading
+        b = Container(file=self.fn)
+        self.assertEqual(b["data/text.txt"], TEXT)
+        self.assertEqual(b["content.json"]["hash"], a["content.json"]["hash"])
+        with ZipFile(self.fn) as zfp:
+            return zfp.getinfo("data/text.txt")
+
+
+class CodecTest(_CodecTestCase):
+    def test_lzma(self):
+        default = self._roundtrip(ZIP_LZMA)
+        fast = self._roundtrip(ZIP_LZMA, 0)
+        self.assertEqual(default.compress_type, ZIP_LZMA)
+        self.assertGreater(fast.compress_size, default.compress_size)
+
+    def test_lzma_zipfile(self):
+        # Default LZMA members are identical to the ones of zipfile
+        buffer = io.BytesIO()
+        with ZipFile(buffer, "w", ZIP_LZMA) as zfp:
+            zfp.writestr("text.txt", TEXT)
+            info = zfp.getinfo("text.txt")
+        data = buffer.getvalue()[info.header_offset :]
+        comp = zipstream.compressor(ZIP_LZMA)
+        raw = comp.compress(TEXT.encode()) + comp.flush()
+        self.assertIn(raw, data)
+
+    def test_bzip2(self):
+        self.assertEqual(self._roundtrip(ZIP_BZIP2).compress_type, ZIP_BZIP2)
+        self.assertEqual(self._roundtrip(ZIP_BZIP2, 1).compress_type, ZIP_BZIP2)
+
+    def test_preset(self):
+        self.assertEqual(preset("LZMA-dense"), (ZIP_LZMA, 9))
+        with self.assertRaises(ValueError):
+            preset("unknown")
+
+        a = get_test_container()
+        a.write(self.fn)
+        b = Container(file=self.fn, compression="bzip2")
+        self.assertEqual((b.compression, b.compresslevel), (ZIP_BZIP2, 9))
+        b = Container(file=self.fn, compression="lzma", compresslevel=3)
+        self.assertEqual((b.compression, b.compresslevel), (ZIP_LZMA, 3))
+
+
+@unittest.skipIf(zipstream.zstandard is None, "Module zstandard is not available.")
+class ZstandardTest(_CodecTestCase):
+    def test_zstd(self):
+        zinfo = self._roundtrip(ZIP_ZSTANDARD)
+        self.assertEqual(zinfo.compress_type, ZIP_ZSTANDARD)
+        self.assertLess(zinfo.compress_size, len(TEXT) // 10)
+
+        # Items are also decompressed on first access
+        b = Container(file=self.fn, lazy=True)
+        self.assertEqual(b["data/text.txt"], TEXT)
+
+    def test_threads(self):
+        with mock.patch.object(zipstream, "ZSTD_THREADS_SIZE", 1024):
+            with mock.patch.object(
+                zipstream.zstandard,
+                "ZstdCompressor",
+                side_effect=zipstream.zstandard.ZstdCompressor,
+            ) as compressor:
+                self._roundtrip(ZIP_ZSTANDARD, 5)
+        self.assertIn(
+            mock.call(level=5, threads=zipstream.ZSTD_THREADS), compressor.mock_calls
+        )
+
+    def test_file(self):
+        a = get_test_container()
+        a.compression = ZIP_ZSTANDARD
+        with NamedTemporaryFile() as tfp:
+            tfp.write(TEXT.encode())
+            tfp.flush()
+            a["data/file.txt"] = {"path": Path(tfp.name)}
+            a.write(self.fn)
+        b = Container(file=self.fn)
+        self.assertEqual(b["data/file.txt"], TEXT)
+
+    def test_corrupt(self):
+        self._roundtrip(ZIP_ZSTANDARD)
+        with ZipFile(self.fn) as zfp:
+            info = zfp.getinfo("data/text.txt")
+        info.CRC ^= 1
+        with ZipFile(self.fn) as zfp:
+            with self.assertRaises(Exception):
+                zipstream.read_member(zfp, info)
+
+    def test_missing(self):
+        self._roundtrip(ZIP_ZSTANDARD)
+        with mock.patch.object(zipstream, "zstandard", None):
+            with self.assertRaises(NotImplementedError):
+                zipstream.compressor(ZIP_ZSTANDARD)
+            with mock.patch.object(zipstream, "_ZIPFILE_ZSTD", False):
+                with ZipFile(self.fn) as zfp:
+                    with self.assertRaises(NotImplementedError):
+                        zipstream.read_member(zfp, zfp.getinfo("data/text.txt"))
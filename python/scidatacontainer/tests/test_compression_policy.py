@@ -0,0 +1,89 @@
+import os
+import random
+from pathlib import Path
+from tempfile import NamedTemporaryFile, TemporaryDirectory
+from unittest import TestCase
+from zipfile import ZIP_BZIP2, ZIP_DEFLATED, ZIP_STORED, ZipFile
+
+from scidatacontainer import CompressionPolicy, Container
+
+from . import get_test_container
+
+
+class CompressionPolicyTest(TestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.fn = os.path.join(self.tmpdir.name, "test.zdc")
+        self.noise = random.Random(1).randbytes(200000)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _methods(self):
+        with ZipFile(self.fn) as zfp:
+            return {zinfo.filename: zinfo.compress_type for zinfo in zfp.infolist()}
+
+    def test_select(self):
+        policy = CompressionPolicy(min_size=100, suffixes={"log": (ZIP_BZIP2, 9)})
+        default = (ZIP_DEFLATED, 6)
+        text = b"Lorem ipsum dolor sit amet " * 1000
+        self.assertEqual(policy.select("a.txt", text, None, default), default)
+        self.assertEqual(policy.select("a.bin", self.noise, None, default)[0], 0)
+        self.assertEqual(policy.select("a.txt", b"short", None, default)[0], 0)
+        self.assertEqual(policy.select("x/a.log", text, None, default), (12, 9))
+        self.assertEqual(policy.select("a.bin", text, None, (ZIP_STORED, None))[0], 0)
+        self.assertEqual(policy.rejected, 1)
+
+    def test_container(self):
+        policy = CompressionPolicy()
+        a = get_test_container()
+        a.policy = policy
+        a["data/noise.bin"] = self.noise
+        a["data/archive.gz"] = b"Lorem ipsum dolor sit amet " * 1000
+        a["data/text.txt"] = "Lorem ipsum dolor sit amet " * 1000
+        with NamedTemporaryFile() as tfp:
+            tfp.write(self.noise)
+            tfp.flush()
+            a["data/file.bin"] = {"path": Path(tfp.name)}
+            a.write(self.fn)
+
+        methods = self._methods()
+        self.assertEqual(methods["data/noise.bin"], ZIP_STORED)
+        self.assertEqual(methods["data/archive.gz"], ZIP_STORED)
+        self.assertEqual(methods["data/file.bin"], ZIP_STORED)
+        self.assertEqual(methods["data/text.txt"], ZIP_DEFLATED)
+
+        stats = policy.stats()
+        self.assertEqual(sum(entry["items"] for entry in stats.values()), len(a.keys()))
+        self.assertEqual(stats[ZIP_STORED]["items"], 3)
+        self.assertEqual(stats[ZIP_STORED]["size"], stats[ZIP_STORED]["compress_size"])
+        self.assertLess(
+            stats[ZIP_DEFLATED]["compress_size"], stats[ZIP_DEFLATED]["size"]
+        )
+        self.assertEqual(policy.rejected, 2)
+        policy.reset()
+        self.assertEqual(policy.stats(), {})
+
+        b = Container(file=self.fn)
+        self.assertEqual(b["data/noise.bin"], self.noise)
+        self.assertEqual(b["data/file.bin"], self.noise)
+
+    def test_freeze(self):
+        a = get_test_container()
+        a.policy = CompressionPolicy()
+        a["data/noise.bin"] = self.noise
+        a.write(self.fn, freeze=True)
+        self.assertEqual(self._methods()["data/noise.bin"], ZIP_STORED)
+
+        # The item content.json follows the policy, too
+        a = get_test_container()
+        a.policy = CompressionPolicy({"json": ZIP_BZIP2})
+        a.write(self.fn, freeze=True)
+        self.assertEqual(self._methods()["content.json"], ZIP_BZIP2)
+        self.assertEqual(self._methods()["meta.json"], ZIP_BZIP2)
+
+        # Stored members are copied, if the policy may have selected them
+        b = Container(file=self.fn, policy=CompressionPolicy())
+        b.write(self.fn + ".copy")
+        c = Container(file=self.fn + ".copy")
+        self.assertEqual(c["content.json"]["hash"], a["content.json"]["hash"])
@@ -0,0 +1,121 @@
+import os
+from pathlib import Path
+from tempfile import NamedTemporaryFile, TemporaryDirectory
+from unittest import TestCase, mock
+from zipfile import ZipFile
+
+from scidatacontainer import Container
+from scidatacontainer.filebase import TabSeparatedValuesFile
+
+from . import get_test_container
+
+
+class EncodeCacheTest(TestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.fn = os.path.join(self.tmpdir.name, "test.zdc")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_freeze_write(self):
+        a = get_test_container()
+        with mock.patch.object(
+            TabSeparatedValuesFile,
+            "encode",
+            autospec=True,
+            side_effect=TabSeparatedValuesFile.encode,
+        ) as encode:
+            a.freeze()
+            a.write(self.fn)
+            self.assertEqual(encode.call_count, 1)
+
+            # The cached bytes string is dropped after writing
+            self.assertIsNone(a._items["meas/image.tsv"]._encoded)
+            a.write(self.fn)
+            self.assertEqual(encode.call_count, 2)
+
+        b = Container(file=self.fn)
+        self.assertEqual(b["meas/image.tsv"], a["meas/image.tsv"])
+        self.assertEqual(b["content.json"]["hash"], a["content.json"]["hash"])
+
+    def test_replace(self):
+        a = get_test_container()
+        a.freeze()
+        old_hash = a["content.json"]["hash"]
+
+        a.release()
+        a["meas/image.tsv"] = [[1.0, 2.0], [3.0, 4.0]]
+        a.freeze()
+        self.assertNotEqual(old_hash, a["content.json"]["hash"])
+        a.write(self.fn)
+
+        b = Container(file=self.fn)
+        self.assertEqual(b["meas/image.tsv"], [[1.0, 2.0], [3.0, 4.0]])
+
+    def test_modify_in_place(self):
+        a = get_test_container()
+        a.freeze()
+        old_hash = a["content.json"]["hash"]
+
+        a.release()
+        a["data/parameter.json"]["device"]["id"] = 1
+        a["meas/image.tsv"][0][0] = 42.0
+        a.freeze()
+        self.assertNotEqual(old_hash, a["content.json"]["hash"])
+        a.write(self.fn)
+
+        b = Container(file=self.fn)
+        self.assertEqual(b["data/parameter.json"]["device"]["id"], 1)
+        self.assertEqual(b["meas/image.tsv"][0][0], 42.0)
+
+
+class FreezeWriteTest(TestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.fn = os.path.join(self.tmpdir.name, "test.zdc")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_freeze_write(self):
+        a = get_test_container()
+        with NamedTemporaryFile() as tfp:
+            tfp.write(b"consectetur adipiscing elit" * 1000)
+            tfp.flush()
+            a["data/file.bin"] = {"path": Path(tfp.name)}
+
+            with mock.patch.object(
+                TabSeparatedValuesFile,
+                "encode",
+                autospec=True,
+                side_effect=TabSeparatedValuesFile.encode,
+            ) as encode:
+                a.write(self.fn, freeze=True)
+                self.assertEqual(encode.call_count, 1)
+        self.assertFalse(a.mutable)
+        self.assertTrue(a["content.json"]["static"])
+
+        with ZipFile(self.fn) as zfp:
+            names = [zinfo.filename for zinfo in zfp.infolist()]
+            offsets = {zinfo.filename: zinfo.header_offset for zinfo in zfp.infolist()}
+        self.assertEqual(
+            names, sorted(n for n in names if n != "data/file.bin") + ["data/file.bin"]
+        )
+        self.assertEqual(max(offsets, key=offsets.get), "content.json")
+
+        # Hash is verified while reading
+        b = Container(file=self.fn)
+        self.assertEqual(b["content.json"]["hash"], a["content.json"]["hash"])
+        b.hash()
+        self.assertEqual(b["content.json"]["hash"], a["content.json"]["hash"])
+
+    def test_legacy(self):
+        a = get_test_container()
+        a["content.json"]["modelVersion"] = "1.0.0"
+        a.write(self.fn, freeze=True)
+        self.assertTrue(a["content.json"]["static"])
+
+        b = Container(file=self.fn)
+        b.hash()
+        self.assertEqual(b["content.json"]["hash"], a["content.json"]["hash"])
@@ -0,0 +1,58 @@
+from unittest import TestCase
+
+from requests import HTTPError
+
+from scidatacontainer import Container
+
+from . import get_test_container
+from ._http_server import DatasetServer
+
+
+class FetchManyTest(TestCase):
+    def setUp(self):
+        self.containers = {}
+        self.server = DatasetServer().__enter__()
+        for i in range(12):
+            dc = get_test_container()
+            dc["content.json"]["uuid"] = "00000000-0000-0000-0000-%012d" % i
+            dc["data/index.txt"] = str(i)
+            dc.freeze()
+            self.containers[dc.uuid] = dc
+            self.server.datasets[dc.uuid] = b"".join(dc.encode())
+        self.config = {"server": self.server.url, "key": self.server.key}
+
+    def tearDown(self):
+        self.server.__exit__()
+
+    def test_fetch_many(self):
+        results = dict(
+            Container.fetch_many(self.containers, max_workers=4, config=self.config)
+        )
+        self.assertEqual(results.keys(), self.containers.keys())
+        for uuid, dc in results.items():
+            self.assertIsInstance(dc, Container)
+            self.assertEqual(
+                dc["data/index.txt"], self.containers[uuid]["data/index.txt"]
+            )
+            self.assertEqual(
+                dc["content.json"]["hash"],
+                self.containers[uuid]["content.json"]["hash"],
+            )
+
+    def test_errors(self):
+        unknown = "00000000-0000-0000-0000-999999999999"
+        uuids = [unknown] + list(self.containers)
+        results = dict(Container.fetch_many(uuids, max_workers=3, config=self.config))
+        self.assertEqual(len(results), len(uuids))
+        self.assertIsInstance(results[unknown], HTTPError)
+        for uuid in self.containers:
+            self.assertIsInstance(results[uuid], Container)
+
+    def test_stop_early(self):
+        results = Container.fetch_many(
+            self.containers, max_workers=2, config=self.config
+        )
+        uuid, dc = next(results)
+        self.assertIn(uuid, self.containers)
+        results.close()
+        self.assertLess(len(self.server.requests), len(self.containers))
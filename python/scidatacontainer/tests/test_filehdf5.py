@@ -1,3 +1,4 @@
+from hashlib import sha256
 from io import BytesIO
 from unittest import TestCase
 from zipfile import ZipFile
@@ -6,6 +7,7 @@ import h5py
 import numpy as np
 
 from scidatacontainer import Container
+from scidatacontainer.filehdf5 import Hdf5File
 
 from . import get_test_container
 
@@ -136,3 +138,13 @@ class FileHdf5Test(TestCase):
             b["content.json"]["hash"],
             "357bf6e2d63861cdda9239f83b23f293b3149d4d4a5283a742965199a02a7990",
         )
+
+    def test_array_hash(self):
+        data = np.reshape(np.arange(10 * 10 * 3), (10, 10, 3))
+        self.assertEqual(Hdf5File(data).hash(), sha256(data.data).hexdigest())
+        self.assertEqual(
+            Hdf5File(np.asfortranarray(data)).hash(), Hdf5File(data).hash()
+        )
+        self.assertEqual(
+            Hdf5File(data[:, ::2]).hash(), Hdf5File(data[:, ::2].copy()).hash()
+        )
@@ -0,0 +1,48 @@
+import hashlib
+from unittest import TestCase
+
+from scidatacontainer.filebase import JsonFile
+
+
+class FileJsonTest(TestCase):
+    def _sortit_hash(self, item):
+        data = bytes(item.sortit(item.data), item.charset)
+        return hashlib.sha256(data).hexdigest()
+
+    def test_hash(self):
+        data = {
+            "b": [1, 2.5, -3e300, True, None, "text with 'quotes'"],
+            "a": {"z": (1, (2, 3)), "y": [], "x": {}, "w": [{"v": "ü€"}]},
+            "c": float("nan"),
+            "d": [[1, 2], [3, [4, {"e": 5}]]],
+        }
+        item = JsonFile(data)
+        self.assertEqual(item.hash(), self._sortit_hash(item))
+        self.assertEqual(JsonFile([]).hash(), hashlib.sha256(b"[]").hexdigest())
+        self.assertEqual(JsonFile(1.5).hash(), hashlib.sha256(b"1.5").hexdigest())
+
+    def test_large(self):
+        data = {"param%06d" % i: i * 0.5 for i in range(20000)}
+        data["list"] = list(range(20000))
+        data["nested"] = [{"index": i, "values": [i, -i]} for i in range(5000)]
+        item = JsonFile(data)
+        self.assertEqual(item.hash(), self._sortit_hash(item))
+
+    def test_charset(self):
+        class Utf16File(JsonFile):
+            charset = "utf16"
+
+        item = Utf16File({"key": ["ü€"] * 10000})
+        self.assertEqual(item.hash(), self._sortit_hash(item))
+
+    def test_sortit_override(self):
+        class PlainFile(JsonFile):
+            def sortit(self, data):
+                return "plain"
+
+        item = PlainFile({"key": "value"})
+        self.assertEqual(item.hash(), hashlib.sha256(b"plain").hexdigest())
+
+    def test_invalid_key(self):
+        with self.assertRaises(TypeError):
+            JsonFile({1: "one"}).hash()
@@ -1,4 +1,5 @@
 from unittest import TestCase
+from zipfile import ZIP_STORED
 
 import numpy as np
 
@@ -72,3 +73,37 @@ class FileNumpyTest(TestCase):
             b["content.json"]["hash"],
             "4e4ac07beaa10c8ab87f0da907f70a34e1c89918b1278dde5b75c2e4d4fd5fb6",
         )
+
+    def test_mmap(self):
+        a = get_test_container()
+        a["data/test.npy"] = np.reshape(np.arange(100 * 100 * 3), (100, 100, 3))
+        a["data/fortran.npy"] = np.asfortranarray(np.random.rand(20, 30))
+        a.compression = ZIP_STORED
+        a.write("test.zdc")
+
+        b = Container(file="test.zdc", mmap=True)
+        self.assertIsInstance(b["data/test.npy"], np.memmap)
+        self.assertFalse(b["data/test.npy"].flags.writeable)
+        self.assertTrue(np.array_equal(a["data/test.npy"], b["data/test.npy"]))
+        self.assertTrue(np.array_equal(a["data/fortran.npy"], b["data/fortran.npy"]))
+        self.assertEqual(b["meas/image.tsv"], a["meas/image.tsv"])
+
+        a.write("test.zdc")
+        c = Container(file="test.zdc")
+        self.assertNotIsInstance(c["data/test.npy"], np.memmap)
+
+    def test_mmap_rewrite_source(self):
+        a = get_test_container()
+        a["content.json"]["complete"] = False
+        a["data/test.npy"] = np.reshape(np.arange(100 * 100 * 3), (100, 100, 3))
+        a.compression = ZIP_STORED
+        a.write("test.zdc")
+
+        b = Container(file="test.zdc", mmap=True, compression=ZIP_STORED)
+        self.assertIsInstance(b["data/test.npy"], np.memmap)
+        b["data/new.txt"] = "Lorem ipsum dolor sit amet"
+        b.write("test.zdc")
+
+        self.assertNotIsInstance(b["data/test.npy"], np.memmap)
+        c = Container(file="test.zdc")
+        self.assertTrue(np.array_equal(a["data/test.npy"], c["data/test.npy"]))
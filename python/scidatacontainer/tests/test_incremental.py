@@ -0,0 +1,171 @@
+import os
+from pathlib import Path
+from tempfile import NamedTemporaryFile, TemporaryDirectory
+from unittest import TestCase, mock
+
+import numpy as np
+
+from scidatacontainer import Container
+from scidatacontainer.filebase import TextFile
+from scidatacontainer.filenumpy import NpyFile
+from scidatacontainer.zipstream import ZipWriter
+
+from . import get_test_container
+
+
+class IncrementalWriteTest(TestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.fn = os.path.join(self.tmpdir.name, "test.zdc")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _container(self):
+        a = get_test_container()
+        a["content.json"]["complete"] = False
+        a["data/large.txt"] = "Lorem ipsum dolor sit amet " * 10000
+        return a
+
+    def test_append(self):
+        a = self._container()
+        a.write(self.fn, incremental=True)
+        self.assertTrue(a.mutable)
+        size = os.path.getsize(self.fn)
+
+        # Unchanged items are neither compressed nor written again
+        a["log/step.txt"] = "step 1"
+        with mock.patch.object(
+            ZipWriter, "write", autospec=True, side_effect=ZipWriter.write
+        ) as write:
+            a.write(self.fn, incremental=True)
+        written = {call.args[1].filename for call in write.call_args_list}
+        self.assertIn("log/step.txt", written)
+        self.assertNotIn("data/large.txt", written)
+        self.assertNotIn("meas/image.tsv", written)
+        self.assertLess(os.path.getsize(self.fn) - size, 2000)
+
+        b = Container(file=self.fn)
+        self.assertEqual(b["log/step.txt"], "step 1")
+        self.assertEqual(b["data/large.txt"], a["data/large.txt"])
+        self.assertEqual(b["meas/image.tsv"], a["meas/image.tsv"])
+        self.assertEqual(sorted(b.keys()), sorted(a.keys()))
+
+    def test_atomic_append(self):
+        a = self._container()
+        a.write(self.fn, incremental=True)
+        a["log/step.txt"] = "step 1"
+        a.write(self.fn, incremental=True, atomic=True, keep=True)
+        b = Container(file=self.fn)
+        self.assertEqual(b["log/step.txt"], "step 1")
+        self.assertEqual(b["data/large.txt"], a["data/large.txt"])
+
+        # An interrupted append leaves the previous version
+        a["log/step.txt"] = "step 2"
+        with mock.patch.object(ZipWriter, "close", side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                a.write(self.fn, incremental=True, atomic=True, keep=True)
+        b = Container(file=self.fn)
+        self.assertEqual(b["log/step.txt"], "step 1")
+        self.assertEqual(
+            sorted(os.listdir(self.tmpdir.name)), ["test.zdc", "test.zdc~"]
+        )
+
+        a.write(self.fn, incremental=True, atomic=True, keep=True)
+        self.assertEqual(Container(file=self.fn)["log/step.txt"], "step 2")
+        self.assertEqual(Container(file=self.fn + "~")["log/step.txt"], "step 1")
+
+    def test_modify(self):
+        a = self._container()
+        a.write(self.fn, incremental=True)
+        a["meas/image.tsv"] = [[5.0, 6.0], [7.0, 8.0]]
+        a.write(self.fn, incremental=True)
+
+        b = Container(file=self.fn)
+        self.assertEqual(b["meas/image.tsv"], [[5.0, 6.0], [7.0, 8.0]])
+        self.assertEqual(sorted(b.keys()), sorted(a.keys()))
+
+    def test_complete(self):
+        a = self._container()
+        a.write(self.fn, incremental=True)
+        a["log/step.txt"] = "last step"
+        a.write(self.fn, incremental=True, freeze=True)
+        self.assertFalse(a.mutable)
+
+        # Hash is verified while reading
+        b = Container(file=self.fn)
+        self.assertTrue(b["content.json"]["static"])
+        self.assertEqual(b["content.json"]["hash"], a["content.json"]["hash"])
+
+    def test_compaction(self):
+        a = self._container()
+        a.write(self.fn, incremental=True)
+        size = os.path.getsize(self.fn)
+
+        # Replaced members are removed by a full rewrite
+        for i in range(5):
+            a["data/large.txt"] = "Lorem ipsum dolor sit amet %d " % i * 10000
+            a.write(self.fn, incremental=True)
+            self.assertLess(os.path.getsize(self.fn), 3 * size)
+        b = Container(file=self.fn)
+        self.assertEqual(b["data/large.txt"], a["data/large.txt"])
+
+    def test_external_change(self):
+        a = self._container()
+        a.write(self.fn, incremental=True)
+        a.write(self.fn)
+        a["log/step.txt"] = "step 1"
+        with mock.patch.object(
+            TextFile, "encode", autospec=True, side_effect=TextFile.encode
+        ) as encode:
+            a.write(self.fn, incremental=True)
+            self.assertTrue(encode.called)
+
+        b = Container(file=self.fn)
+        self.assertEqual(b["log/step.txt"], "step 1")
+
+    def test_file_item(self):
+        a = self._container()
+        with NamedTemporaryFile() as tfp:
+            tfp.write(b"consectetur adipiscing elit" * 1000)
+            tfp.flush()
+            a["data/file.bin"] = {"path": Path(tfp.name)}
+            a.write(self.fn, incremental=True)
+            size = os.path.getsize(self.fn)
+
+            with mock.patch.object(
+                ZipWriter, "iter_file", autospec=True, side_effect=ZipWriter.iter_file
+            ) as iter_file:
+                a.write(self.fn, incremental=True)
+                iter_file.assert_not_called()
+            self.assertLess(os.path.getsize(self.fn) - size, 2000)
+
+            b = Container(file=self.fn)
+            self.assertEqual(b["data/file.bin"], b"consectetur adipiscing elit" * 1000)
+            self.assertEqual(b["meas/image.tsv"], a["meas/image.tsv"])
+
+    def test_stream(self):
+        a = self._container()
+        a["data/array.npy"] = np.arange(100000, dtype=np.float64)
+        with mock.patch("scidatacontainer.container.STREAM_SIZE", 65536):
+            with mock.patch.object(NpyFile, "encode") as encode:
+                a.write(self.fn, incremental=True)
+                size = os.path.getsize(self.fn)
+
+                # Large unchanged items are hashed chunkwise and reused
+                a.write(self.fn, incremental=True)
+                self.assertLess(os.path.getsize(self.fn) - size, 2000)
+
+                # Arrays modified in place are written again
+                a["data/array.npy"][0] = -1.0
+                a.write(self.fn, incremental=True)
+            encode.assert_not_called()
+        b = Container(file=self.fn)
+        self.assertTrue(np.array_equal(b["data/array.npy"], a["data/array.npy"]))
+
+    def test_model_version(self):
+        a = self._container()
+        a["content.json"]["hashScheme"] = "sha256-tree"
+        a.write(self.fn, incremental=True)
+        b = Container(file=self.fn)
+        self.assertEqual(b["content.json"]["modelVersion"], "1.0.2")
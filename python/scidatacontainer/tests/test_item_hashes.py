@@ -0,0 +1,104 @@
+import json
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from zipfile import ZipFile
+
+from scidatacontainer import Container
+from scidatacontainer.container import _ZipMember
+
+from . import get_test_container
+from ._http_server import DatasetServer
+
+
+class ItemHashesTest(TestCase):
+    uuid = "00000000-0000-0000-0000-000000000000"
+
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.fn = os.path.join(self.tmpdir.name, "test.zdc")
+        self.dc = get_test_container()
+        self.dc["content.json"]["hashScheme"] = "sha256-tree"
+        self.dc["data/test.txt"] = "Lorem ipsum dolor sit amet"
+        self.dc["data/random.bin"] = os.urandom(256 * 1024)
+        self.dc.write(self.fn, freeze=True)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _modify(self, path, modify):
+        """Replace an item of the container file."""
+        with ZipFile(self.fn) as zfp:
+            items = {name: zfp.read(name) for name in zfp.namelist()}
+        items[path] = modify(items[path])
+        with ZipFile(self.fn, "w") as zfp:
+            for name, data in items.items():
+                zfp.writestr(name, data)
+
+    def test_manifest(self):
+        digests = self.dc["content.json"]["itemHashes"]
+        self.assertEqual(
+            sorted(digests), sorted(set(self.dc.keys()) - {"content.json"})
+        )
+        a = self.dc["content.json"]["hash"]
+        self.dc.freeze()
+        self.assertEqual(self.dc["content.json"]["hash"], a)
+        self.assertEqual(self.dc["content.json"]["itemHashes"], digests)
+
+        b = Container(file=self.fn)
+        self.assertEqual(b["content.json"]["itemHashes"], digests)
+        self.assertEqual(b["data/test.txt"], "Lorem ipsum dolor sit amet")
+
+        # A released container gets new digests on the next freeze
+        b.release()
+        self.assertNotIn("itemHashes", b["content.json"])
+        b["data/test.txt"] = "Lorem ipsum"
+        b.freeze()
+        self.assertNotEqual(
+            b["content.json"]["itemHashes"]["data/test.txt"], digests["data/test.txt"]
+        )
+
+    def test_sequential(self):
+        a = get_test_container()
+        a.freeze()
+        self.assertNotIn("itemHashes", a["content.json"])
+
+    def test_wrong_item(self):
+        self._modify("data/test.txt", bytes.upper)
+        with self.assertRaisesRegex(
+            RuntimeError, "Wrong hash of item 'data/test.txt'!"
+        ):
+            Container(file=self.fn)
+
+        # Only items which are read are verified
+        b = Container(file=self.fn, ignore_items=["data/test.txt"])
+        self.assertNotIn("data/test.txt", b)
+        b = Container(file=self.fn, lazy=True)
+        self.assertEqual(len(b["data/random.bin"]), 256 * 1024)
+        with self.assertRaisesRegex(
+            RuntimeError, "Wrong hash of item 'data/test.txt'!"
+        ):
+            b["data/test.txt"]
+
+    def test_wrong_manifest(self):
+        def modify(data):
+            content = json.loads(data)
+            content["itemHashes"]["data/test.txt"] = "0" * 64
+            return json.dumps(content).encode()
+
+        self._modify("content.json", modify)
+        with self.assertRaisesRegex(RuntimeError, "Wrong hash!"):
+            Container(file=self.fn, lazy=True, ignore_items=["data/test.txt"])
+
+    def test_remote(self):
+        self._modify("data/test.txt", bytes.upper)
+        with open(self.fn, "rb") as fp:
+            data = fp.read()
+        with DatasetServer() as server:
+            server.datasets[self.uuid] = data
+            config = {"server": server.url, "key": server.key}
+            dc = Container(uuid=self.uuid, config=config, lazy=True)
+            self.assertEqual(dc["meas/image.tsv"], self.dc["meas/image.tsv"])
+            self.assertIsInstance(dc._items["data/random.bin"], _ZipMember)
+            with self.assertRaisesRegex(RuntimeError, "Wrong hash of item"):
+                dc["data/test.txt"]
@@ -0,0 +1,81 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from scidatacontainer import Container
+from scidatacontainer.container import _ZipMember
+
+from . import get_test_container
+
+
+class LazyLoadingTest(TestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.fn = os.path.join(self.tmpdir.name, "test.zdc")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_lazy(self):
+        a = get_test_container()
+        a["data/test.txt"] = "Lorem ipsum dolor sit amet"
+        a.write(self.fn)
+
+        b = Container(file=self.fn, lazy=True)
+        self.assertIsInstance(b._items["meas/image.tsv"], _ZipMember)
+        self.assertIsInstance(b._items["data/test.txt"], _ZipMember)
+        self.assertNotIsInstance(b._items["meta.json"], _ZipMember)
+        self.assertEqual(b.keys(), a.keys())
+
+        self.assertEqual(b["data/test.txt"], "Lorem ipsum dolor sit amet")
+        self.assertNotIsInstance(b._items["data/test.txt"], _ZipMember)
+        self.assertIsInstance(b._items["meas/image.tsv"], _ZipMember)
+        self.assertEqual(b["meas/image.tsv"], a["meas/image.tsv"])
+        self.assertEqual(b["data/parameter.json"], a["data/parameter.json"])
+
+    def test_ignore_items(self):
+        a = get_test_container()
+        a["data/test.txt"] = "Lorem ipsum dolor sit amet"
+        a.write(self.fn)
+
+        b = Container(file=self.fn, lazy=True, ignore_items=["data/test.txt"])
+        self.assertNotIn("data/test.txt", b)
+        with self.assertRaisesRegex(
+            KeyError, r"Item 'data/test\.txt' was ignored while reading the file\."
+        ):
+            b["data/test.txt"]
+
+    def test_hash(self):
+        a = get_test_container()
+        a.freeze()
+        a.write(self.fn)
+
+        b = Container(file=self.fn, lazy=True)
+        b.hash()
+        self.assertEqual(a["content.json"]["hash"], b["content.json"]["hash"])
+
+    def test_legacy_hash(self):
+        a = get_test_container()
+        a["content.json"]["modelVersion"] = "1.0.0"
+        a.freeze()
+        a.write(self.fn)
+
+        b = Container(file=self.fn, lazy=True)
+        b.hash()
+        self.assertEqual(a["content.json"]["hash"], b["content.json"]["hash"])
+
+    def test_rewrite_source(self):
+        a = get_test_container()
+        a["content.json"]["complete"] = False
+        a["data/test.txt"] = "Lorem ipsum dolor sit amet"
+        a.write(self.fn)
+
+        b = Container(file=self.fn, lazy=True)
+        self.assertTrue(b.mutable)
+        b["data/new.txt"] = "consectetur adipiscing elit"
+        b.write(self.fn)
+
+        c = Container(file=self.fn)
+        self.assertEqual(c["data/test.txt"], "Lorem ipsum dolor sit amet")
+        self.assertEqual(c["data/new.txt"], "consectetur adipiscing elit")
+        self.assertEqual(c["meas/image.tsv"], a["meas/image.tsv"])
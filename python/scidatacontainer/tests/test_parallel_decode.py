@@ -0,0 +1,62 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock
+from zipfile import ZIP_STORED, ZipFile
+
+from scidatacontainer import Container
+from scidatacontainer.container import _MemberReader
+
+from . import get_test_container
+
+
+class ParallelDecodeTest(TestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.fn = os.path.join(self.tmpdir.name, "test.zdc")
+        a = get_test_container()
+        for i in range(20):
+            a["data/text%02d.txt" % i] = "Lorem ipsum dolor sit amet %d " % i * 1000
+            a["data/table%02d.tsv" % i] = [[float(i), 2.0], [3.0, 4.0]]
+            a["data/param%02d.json" % i] = {"index": i}
+        a.write(self.fn, freeze=True)
+        self.a = a
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _check(self, b):
+        self.assertEqual(sorted(b.keys()), sorted(self.a.keys()))
+        for path in self.a.keys():
+            self.assertEqual(b[path], self.a[path])
+        self.assertFalse(b.mutable)
+
+    def test_threads(self):
+        with mock.patch.object(
+            _MemberReader, "read", autospec=True, side_effect=_MemberReader.read
+        ) as read, mock.patch(
+            "scidatacontainer.container.ZipFile", side_effect=ZipFile
+        ) as zipfile:
+            b = Container(file=self.fn, workers=4)
+        self._check(b)
+        self.assertEqual(read.call_count, len(self.a.keys()))
+
+        # Worker threads read from their own file handles
+        handles = [c for c in zipfile.call_args_list if c.args[0] == self.fn]
+        self.assertGreaterEqual(len(handles), 1)
+        self.assertLessEqual(len(handles), 4)
+
+    def test_processes(self):
+        b = Container(file=self.fn, workers=2, processes=2)
+        self._check(b)
+
+    def test_hash(self):
+        self.a.compression = ZIP_STORED
+        self.a.write(self.fn)
+        with open(self.fn, "rb") as fp:
+            data = bytearray(fp.read())
+        index = data.index(b"Lorem ipsum dolor sit amet 7")
+        data[index] ^= 1
+        with open(self.fn, "wb") as fp:
+            fp.write(data)
+        with self.assertRaises(Exception):
+            Container(file=self.fn, workers=4)
@@ -0,0 +1,90 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock
+from zipfile import ZIP_LZMA, ZipFile
+
+from scidatacontainer import Container
+from scidatacontainer.filebase import TabSeparatedValuesFile
+from scidatacontainer.zipstream import compress
+
+from . import get_test_container
+
+
+class RawCopyTest(TestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.src = os.path.join(self.tmpdir.name, "src.zdc")
+        self.dst = os.path.join(self.tmpdir.name, "dst.zdc")
+        a = get_test_container()
+        a["data/large.txt"] = "Lorem ipsum dolor sit amet " * 10000
+        a.write(self.src)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, dc):
+        with mock.patch(
+            "scidatacontainer.container.compress", side_effect=compress
+        ) as patched, mock.patch.object(
+            TabSeparatedValuesFile,
+            "encode",
+            autospec=True,
+            side_effect=TabSeparatedValuesFile.encode,
+        ) as encode:
+            dc.write(self.dst)
+        compressed = {call.args[0].filename for call in patched.call_args_list}
+        return compressed, encode.call_count
+
+    def test_copy(self):
+        a = Container(file=self.src)
+        compressed, encoded = self._write(a)
+        self.assertEqual(compressed, {"content.json", "meta.json"})
+        self.assertEqual(encoded, 0)
+
+        # Members are identical
+        with ZipFile(self.src) as src, ZipFile(self.dst) as dst:
+            for name in ("data/large.txt", "meas/image.tsv"):
+                self.assertEqual(src.getinfo(name).CRC, dst.getinfo(name).CRC)
+                self.assertEqual(src.read(name), dst.read(name))
+
+        b = Container(file=self.dst)
+        self.assertEqual(b["data/large.txt"], a["data/large.txt"])
+        self.assertEqual(b["content.json"]["hash"], a["content.json"]["hash"])
+
+    def test_lazy(self):
+        a = Container(file=self.src, lazy=True)
+        self.assertEqual(a["meas/image.tsv"], get_test_container()["meas/image.tsv"])
+        compressed, encoded = self._write(a)
+        self.assertEqual(compressed, {"content.json", "meta.json"})
+        self.assertEqual(encoded, 0)
+
+        b = Container(file=self.dst)
+        self.assertEqual(b["data/large.txt"], "Lorem ipsum dolor sit amet " * 10000)
+
+    def test_modified(self):
+        a = Container(file=self.src)
+        a.release()
+        a["meas/image.tsv"] = [[5.0, 6.0], [7.0, 8.0]]
+        a.freeze()
+        compressed, encoded = self._write(a)
+        self.assertIn("meas/image.tsv", compressed)
+        self.assertIn("data/large.txt", compressed)
+
+        b = Container(file=self.dst)
+        self.assertEqual(b["meas/image.tsv"], [[5.0, 6.0], [7.0, 8.0]])
+
+    def test_compression(self):
+        a = Container(file=self.src, compression=ZIP_LZMA)
+        compressed, _ = self._write(a)
+        self.assertIn("data/large.txt", compressed)
+        with ZipFile(self.dst) as zfp:
+            self.assertEqual(zfp.getinfo("data/large.txt").compress_type, ZIP_LZMA)
+
+    def test_source_modified(self):
+        a = Container(file=self.src)
+        os.utime(self.src, ns=(0, 0))
+        compressed, _ = self._write(a)
+        self.assertIn("data/large.txt", compressed)
+
+        b = Container(file=self.dst)
+        self.assertEqual(b["data/large.txt"], a["data/large.txt"])
@@ -0,0 +1,55 @@
+import os
+from unittest import TestCase
+
+from scidatacontainer import Container
+from scidatacontainer.container import _ZipMember
+
+from . import get_test_container
+from ._http_server import DatasetServer
+
+
+class RemoteLazyLoadingTest(TestCase):
+    uuid = "00000000-0000-0000-0000-000000000000"
+
+    def setUp(self):
+        self.dc = get_test_container()
+        self.dc["data/random.bin"] = os.urandom(1024 * 1024)
+        self.dc.freeze()
+        self.data = b"".join(self.dc.encode())
+
+    def _server(self, ranges=True):
+        server = DatasetServer(ranges=ranges)
+        server.datasets[self.uuid] = self.data
+        return server
+
+    def test_lazy(self):
+        with self._server() as server:
+            config = {"server": server.url, "key": server.key}
+            dc = Container(uuid=self.uuid, config=config, lazy=True)
+            self.assertIsInstance(dc._items["data/random.bin"], _ZipMember)
+            self.assertEqual(dc["meta.json"]["title"], self.dc["meta.json"]["title"])
+            self.assertEqual(dc["meas/image.tsv"], self.dc["meas/image.tsv"])
+            self.assertLess(server.sent, len(self.data) // 4)
+
+            self.assertEqual(dc["data/random.bin"], self.dc["data/random.bin"])
+            self.assertFalse(dc.mutable)
+            self.assertEqual(dc.keys(), self.dc.keys())
+
+    def test_ignore_items(self):
+        with self._server() as server:
+            config = {"server": server.url, "key": server.key}
+            dc = Container(
+                uuid=self.uuid,
+                config=config,
+                lazy=True,
+                ignore_items=["data/random.bin"],
+            )
+            self.assertNotIn("data/random.bin", dc)
+            self.assertEqual(dc["meas/image.tsv"], self.dc["meas/image.tsv"])
+
+    def test_no_range_support(self):
+        with self._server(ranges=False) as server:
+            config = {"server": server.url, "key": server.key}
+            dc = Container(uuid=self.uuid, config=config, lazy=True)
+            self.assertNotIsInstance(dc._items["data/random.bin"], _ZipMember)
+            self.assertEqual(dc["data/random.bin"], self.dc["data/random.bin"])
@@ -0,0 +1,165 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase, mock
+
+from requests import HTTPError
+
+from scidatacontainer import Container
+
+from . import get_test_container
+from ._http_server import DatasetServer
+
+
+class ResumableUploadTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.manifest = os.path.join(self.directory, "upload.json")
+        self.dc = get_test_container()
+        self.dc["data/random.bin"] = os.urandom(100000)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_upload(self):
+        with DatasetServer() as server:
+            self.dc.upload_resumable(
+                server.url, server.key, chunk_size=16384, manifest=self.manifest
+            )
+        puts = [r for r in server.requests if r[0] == "PUT"]
+        self.assertGreater(len(puts), 5)
+        self.assertFalse(self.dc.mutable)
+        self.assertEqual(os.listdir(self.directory), [])
+
+        with open(os.path.join(self.directory, "test.zdc"), "wb") as fp:
+            fp.write(server.datasets[self.dc.uuid])
+        b = Container(file=fp.name)
+        self.assertEqual(b["data/random.bin"], self.dc["data/random.bin"])
+
+    def test_resume(self):
+        self.dc.freeze()
+        with DatasetServer() as server:
+            server.fail_after = 3
+            with self.assertRaises(HTTPError):
+                self.dc.upload_resumable(
+                    server.url, server.key, chunk_size=16384, manifest=self.manifest
+                )
+            with open(self.manifest) as fp:
+                state = json.load(fp)
+            self.assertEqual(state["fingerprint"], self.dc["content.json"]["hash"])
+            self.assertEqual(
+                state["acknowledged"], [[0, 16384], [16384, 32768], [32768, 49152]]
+            )
+
+            server.fail_after = None
+            received = server.received
+            with mock.patch.object(Container, "encode") as encode:
+                self.dc.upload_resumable(
+                    server.url, server.key, chunk_size=16384, manifest=self.manifest
+                )
+                encode.assert_not_called()
+        size = state["size"]
+        self.assertEqual(server.received - received, size - 3 * 16384)
+        self.assertEqual(len(server.datasets), 1)
+        self.assertFalse(os.path.exists(self.manifest))
+
+        with open(os.path.join(self.directory, "test.zdc"), "wb") as fp:
+            fp.write(server.datasets[self.dc.uuid])
+        b = Container(file=fp.name)
+        self.assertEqual(b["content.json"]["hash"], self.dc["content.json"]["hash"])
+
+    def test_resume_mutable(self):
+        with DatasetServer() as server:
+            server.fail_after = 3
+            with self.assertRaises(HTTPError):
+                self.dc.upload_resumable(
+                    server.url, server.key, chunk_size=16384, manifest=self.manifest
+                )
+            self.assertFalse(self.dc["content.json"]["static"])
+            storage_time = self.dc["content.json"]["storageTime"]
+
+            server.fail_after = None
+            received = server.received
+            with mock.patch.object(Container, "encode") as encode:
+                self.dc.upload_resumable(
+                    server.url, server.key, chunk_size=16384, manifest=self.manifest
+                )
+                encode.assert_not_called()
+        size = len(server.datasets[self.dc.uuid])
+        self.assertEqual(server.received - received, size - 3 * 16384)
+        self.assertEqual(self.dc["content.json"]["storageTime"], storage_time)
+        self.assertFalse(os.path.exists(self.manifest))
+
+        with open(os.path.join(self.directory, "test.zdc"), "wb") as fp:
+            fp.write(server.datasets[self.dc.uuid])
+        b = Container(file=fp.name)
+        self.assertEqual(b["data/random.bin"], self.dc["data/random.bin"])
+
+    def test_resume_modified(self):
+        with DatasetServer() as server:
+            server.fail_after = 3
+            with self.assertRaises(HTTPError):
+                self.dc.upload_resumable(
+                    server.url, server.key, chunk_size=16384, manifest=self.manifest
+                )
+
+            # A modified container is uploaded from the start
+            self.dc["data/random.bin"] = os.urandom(100000)
+            server.fail_after = None
+            self.dc.upload_resumable(
+                server.url, server.key, chunk_size=16384, manifest=self.manifest
+            )
+        with open(os.path.join(self.directory, "test.zdc"), "wb") as fp:
+            fp.write(server.datasets[self.dc.uuid])
+        b = Container(file=fp.name)
+        self.assertEqual(b["data/random.bin"], self.dc["data/random.bin"])
+
+    def test_short_write(self):
+        with DatasetServer() as server:
+            server.short = 5000
+            self.dc.upload_resumable(
+                server.url, server.key, chunk_size=16384, manifest=self.manifest
+            )
+        puts = [r for r in server.requests if r[0] == "PUT"]
+        ranges = [r[2]["Content-Range"] for r in puts[:2]]
+        self.assertEqual(ranges[1][: len("bytes 5000-")], "bytes 5000-")
+        with open(os.path.join(self.directory, "test.zdc"), "wb") as fp:
+            fp.write(server.datasets[self.dc.uuid])
+        b = Container(file=fp.name)
+        self.assertEqual(b["data/random.bin"], self.dc["data/random.bin"])
+
+    def test_no_progress(self):
+        with DatasetServer() as server:
+            server.short = 0
+            with self.assertRaisesRegex(RuntimeError, "acknowledged offset 0"):
+                self.dc.upload_resumable(
+                    server.url, server.key, chunk_size=16384, manifest=self.manifest
+                )
+
+    def test_server_error(self):
+        with DatasetServer() as server:
+            server.fail_complete = True
+            with self.assertRaisesRegex(HTTPError, "500"):
+                self.dc.upload_resumable(server.url, server.key, manifest=self.manifest)
+            self.assertTrue(os.path.exists(self.manifest))
+
+            # The retry resumes and removes the manifest after success
+            server.fail_complete = False
+            with mock.patch.object(Container, "encode") as encode:
+                self.dc.upload_resumable(server.url, server.key, manifest=self.manifest)
+                encode.assert_not_called()
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_unsupported(self):
+        with DatasetServer(uploads=False) as server:
+            self.dc.upload_resumable(server.url, server.key, manifest=self.manifest)
+        self.assertIn(self.dc.uuid, server.datasets)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_conflict(self):
+        with DatasetServer() as server:
+            self.dc.upload_resumable(server.url, server.key, manifest=self.manifest)
+            with self.assertRaisesRegex(HTTPError, "409 Conflict"):
+                self.dc.upload_resumable(server.url, server.key, manifest=self.manifest)
+        self.assertTrue(os.path.exists(self.manifest))
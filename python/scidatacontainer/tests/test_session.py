@@ -0,0 +1,49 @@
+from unittest import TestCase, mock
+
+from scidatacontainer import Container, Session
+from scidatacontainer.session import get_session
+
+from . import get_test_container
+from ._http_server import DatasetServer
+
+
+class SessionTest(TestCase):
+    uuid = "00000000-0000-0000-0000-000000000000"
+
+    def test_config(self):
+        session = get_session({"timeout": "2.5", "retries": "1", "backoff": "0"})
+        self.assertEqual(session.timeout, 2.5)
+        adapter = session.get_adapter("http://example.com")
+        self.assertEqual(adapter.max_retries.total, 1)
+        self.assertEqual(adapter.max_retries.backoff_factor, 0.0)
+
+        session = get_session({"timeout": "", "retries": "", "backoff": ""})
+        self.assertIsNone(session.timeout)
+        adapter = session.get_adapter("https://example.com")
+        self.assertEqual(adapter.max_retries.total, 3)
+
+    def test_shared(self):
+        config = {"timeout": "10"}
+        self.assertIs(get_session(config), get_session(dict(config)))
+        self.assertIsNot(get_session(config), get_session({"timeout": "20"}))
+
+    def test_timeout(self):
+        session = Session(timeout=3.0)
+        with mock.patch("requests.Session.request") as request:
+            session.get("http://example.com")
+            self.assertEqual(request.call_args.kwargs["timeout"], 3.0)
+            session.get("http://example.com", timeout=1.0)
+            self.assertEqual(request.call_args.kwargs["timeout"], 1.0)
+
+    def test_keep_alive(self):
+        dc = get_test_container()
+        dc.freeze()
+        session = Session()
+        with DatasetServer() as server:
+            server.datasets[self.uuid] = b"".join(dc.encode())
+            config = {"server": server.url, "key": server.key}
+            for _ in range(3):
+                b = Container(uuid=self.uuid, config=config, session=session)
+                self.assertEqual(b["content.json"]["hash"], dc["content.json"]["hash"])
+        self.assertEqual(len(server.requests), 3)
+        self.assertEqual(len(server.clients), 1)
@@ -0,0 +1,97 @@
+import hashlib
+import io
+import os
+import warnings
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock
+
+import numpy as np
+
+from scidatacontainer import Container
+from scidatacontainer.filenumpy import NpyFile
+
+from . import get_test_container
+
+
+class NpyStreamTest(TestCase):
+    def _check(self, data):
+        item = NpyFile(data)
+        with io.BytesIO() as fp, warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            np.save(fp, data, allow_pickle=False)
+            expected = fp.getvalue()
+        self.assertEqual(b"".join(item.iter_encoded()), expected)
+        self.assertEqual(item.encoded_size(), len(expected))
+        self.assertEqual(item.digest(), hashlib.sha256(expected).hexdigest())
+
+    def test_arrays(self):
+        data = np.arange(3 * 400 * 500, dtype=np.float64).reshape(3, 400, 500)
+        self._check(data)
+        self._check(np.asfortranarray(data))
+        self._check(data[:, ::3, 1:])
+        self._check(data.astype(">i4"))
+        self._check(np.array(1.5))
+        self._check(np.zeros((0, 3)))
+        self._check(np.array([(1, 2.0), (3, 4.0)], dtype=[("a", "i2"), ("b", "f8")]))
+        self._check(np.array([True, False]))
+
+        # Large headers require the format version 2.0
+        dtype = [("field%05d" % i, "u1") for i in range(5000)]
+        self._check(np.zeros(3, dtype=dtype))
+
+    def test_fallback(self):
+        item = NpyFile(np.array([1, "a", None], dtype=object))
+        self.assertIsNone(item.encoded_size())
+        with self.assertRaises(ValueError):
+            list(item.iter_encoded())
+
+        # Cached bytes strings are not streamed
+        item = NpyFile(np.arange(10))
+        data = item.encoded()
+        self.assertIsNone(item.encoded_size())
+        self.assertEqual(list(item.iter_encoded()), [data])
+
+    def test_no_copy(self):
+        data = np.arange(1024 * 1024, dtype=np.float64)
+        chunks = list(NpyFile(data).iter_encoded())
+        self.assertGreater(len(chunks), 2)
+        for chunk in chunks[1:]:
+            self.assertIsInstance(chunk, memoryview)
+            self.assertTrue(np.shares_memory(np.frombuffer(chunk, np.uint8), data))
+
+
+class ContainerStreamTest(TestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.fn = os.path.join(self.tmpdir.name, "test.zdc")
+        self.data = np.random.default_rng(1).integers(0, 100, (64, 1024, 16))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _container(self, scheme=None):
+        a = get_test_container()
+        if scheme is not None:
+            a["content.json"]["hashScheme"] = scheme
+        a["data/array.npy"] = self.data
+        return a
+
+    def test_stream(self):
+        for scheme in (None, "sha256-tree"):
+            a = self._container(scheme)
+            a.freeze()
+            with mock.patch("scidatacontainer.container.STREAM_SIZE", 65536):
+                b = self._container(scheme)
+                with mock.patch.object(NpyFile, "encode") as encode:
+                    b.freeze()
+                    b.write(self.fn)
+                    c = self._container(scheme)
+                    c.write(self.fn + "2", freeze=True)
+                self.assertEqual(encode.call_count, 0)
+            self.assertEqual(a["content.json"]["hash"], b["content.json"]["hash"])
+            self.assertEqual(a["content.json"]["hash"], c["content.json"]["hash"])
+
+            for fn in (self.fn, self.fn + "2"):
+                d = Container(file=fn)
+                self.assertTrue(np.array_equal(d["data/array.npy"], self.data))
+                self.assertEqual(d["content.json"]["hash"], a["content.json"]["hash"])
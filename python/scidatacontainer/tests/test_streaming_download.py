@@ -0,0 +1,58 @@
+import tempfile
+from unittest import TestCase, mock
+
+from requests import HTTPError
+
+from scidatacontainer import Container
+
+from . import get_test_container
+from ._http_server import DatasetServer
+
+
+class StreamingDownloadTest(TestCase):
+    uuid = "00000000-0000-0000-0000-000000000000"
+
+    def setUp(self):
+        self.dc = get_test_container()
+        self.dc["data/test.txt"] = "Lorem ipsum dolor sit amet " * 10000
+        self.dc.freeze()
+        self.server = DatasetServer()
+        self.server.datasets[self.uuid] = b"".join(self.dc.encode())
+        self.server.__enter__()
+        self.config = {"server": self.server.url, "key": self.server.key}
+
+    def tearDown(self):
+        self.server.__exit__()
+
+    def test_download(self):
+        dc = Container(uuid=self.uuid, config=self.config)
+        self.assertEqual(dc["data/test.txt"], self.dc["data/test.txt"])
+        self.assertEqual(dc["content.json"]["hash"], self.dc["content.json"]["hash"])
+        self.assertFalse(dc.mutable)
+
+    def test_spool_to_file(self):
+        spooled = []
+        spooled_file = tempfile.SpooledTemporaryFile
+
+        def spool(*args, **kwargs):
+            fp = spooled_file(*args, **kwargs)
+            spooled.append(fp)
+            return fp
+
+        with mock.patch.object(Container, "spool_size", 1024), mock.patch(
+            "tempfile.SpooledTemporaryFile", side_effect=spool
+        ):
+            dc = Container(uuid=self.uuid, config=self.config)
+        self.assertEqual(dc["data/test.txt"], self.dc["data/test.txt"])
+        self.assertEqual(len(spooled), 1)
+        self.assertTrue(spooled[0]._rolled)
+        self.assertTrue(spooled[0].closed)
+
+    def test_unknown_uuid(self):
+        with self.assertRaisesRegex(HTTPError, "404 Not Found: Unknown dataset"):
+            Container(uuid=self.uuid[:-3] + "404", config=self.config)
+
+    def test_invalid_key(self):
+        config = {"server": self.server.url, "key": "abcd"}
+        with self.assertRaisesRegex(HTTPError, "403 Forbidden: Unauthorized access"):
+            Container(uuid=self.uuid, config=config)
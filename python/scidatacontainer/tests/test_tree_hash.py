@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from zipfile import ZIP_STORED, ZipFile
+
+from scidatacontainer import Container, modelVersion
+from scidatacontainer.jsonschema import content, validate
+
+from . import get_test_container
+
+
+class TreeHashTest(TestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.fn = os.path.join(self.tmpdir.name, "test.zdc")
+        self.src = os.path.join(self.tmpdir.name, "data.bin")
+        with open(self.src, "wb") as fp:
+            fp.write(os.urandom(100000))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _container(self, scheme="sha256-tree"):
+        a = get_test_container()
+        a["content.json"]["hashScheme"] = scheme
+        for i in range(10):
+            a["data/text%02d.txt" % i] = "Lorem ipsum dolor sit amet %d " % i * 100
+        a.compression = ZIP_STORED
+        return a
+
+    def _digest(self):
+        """Calculate the tree hash from the package independently."""
+        leaves = []
+        with ZipFile(self.fn) as zfp:
+            for name in sorted(zfp.namelist()):
+                data = zfp.read(name)
+                if name == "content.json":
+                    content = json.loads(data)
+                    for key in ("uuid", "created", "storageTime", "hash"):
+                        content[key] = None
+                    content.pop("itemHashes")
+                    data = json.dumps(content, sort_keys=True, indent=4).encode()
+                leaves.append(hashlib.sha256(name.encode() + b"\0" + data).digest())
+        return hashlib.sha256(b"".join(leaves)).hexdigest()
+
+    def test_freeze(self):
+        a = self._container()
+        a.freeze()
+        b = self._container()
+        b.write(self.fn, freeze=True)
+        self.assertEqual(a["content.json"]["hash"], b["content.json"]["hash"])
+        self.assertEqual(b["content.json"]["hash"], self._digest())
+
+        c = Container(file=self.fn, workers=4)
+        self.assertEqual(c["content.json"]["hashScheme"], "sha256-tree")
+        self.assertEqual(c["content.json"]["hash"], b["content.json"]["hash"])
+
+    def test_model_version(self):
+        a = self._container()
+        a.write(self.fn, freeze=True)
+        b = Container(file=self.fn)
+        self.assertEqual(b["content.json"]["modelVersion"], "1.0.2")
+        validate(b["content.json"], content["1.0.2"], "content")
+        self.assertNotIn("hashScheme", content["1.0.1"]["properties"])
+
+        a = get_test_container()
+        a.write(self.fn, freeze=True)
+        self.assertEqual(
+            Container(file=self.fn)["content.json"]["modelVersion"], modelVersion
+        )
+
+    def test_ondisk(self):
+        a = self._container()
+        a["data/file.bin"] = {"path": Path(self.src)}
+        a.freeze()
+        b = self._container()
+        b["data/file.bin"] = {"path": Path(self.src)}
+        b.write(self.fn, freeze=True)
+        self.assertEqual(a["content.json"]["hash"], b["content.json"]["hash"])
+        self.assertEqual(b["content.json"]["hash"], self._digest())
+        Container(file=self.fn)
+
+    def test_schemes(self):
+        a = self._container()
+        a.freeze()
+        b = self._container("sha256")
+        b.freeze()
+        self.assertNotEqual(a["content.json"]["hash"], b["content.json"]["hash"])
+
+        # The default scheme is still readable
+        c = get_test_container()
+        c.write(self.fn, freeze=True)
+        d = Container(file=self.fn)
+        self.assertEqual(d["content.json"]["hash"], c["content.json"]["hash"])
+
+    def test_wrong_hash(self):
+        self._container().write(self.fn, freeze=True)
+        with ZipFile(self.fn) as zfp:
+            items = {name: zfp.read(name) for name in zfp.namelist()}
+        items["data/text07.txt"] = items["data/text07.txt"].upper()
+        with ZipFile(self.fn, "w") as zfp:
+            for name, data in items.items():
+                zfp.writestr(name, data)
+        with self.assertRaisesRegex(RuntimeError, "Wrong hash"):
+            Container(file=self.fn, workers=4)
+
+    def test_unknown_scheme(self):
+        a = get_test_container()
+        a["content.json"]["hashScheme"] = "md5"
+        with self.assertRaisesRegex(RuntimeError, "Unknown hash scheme"):
+            a.validate_content()
@@ -0,0 +1,53 @@
+from unittest import TestCase
+
+from . import get_test_container
+from ._http_server import DatasetServer
+
+
+class UploadLookupTest(TestCase):
+    def _containers(self):
+        a = get_test_container()
+        a["content.json"]["uuid"] = "00000000-0000-0000-0000-000000000001"
+        a.freeze()
+        b = get_test_container()
+        b["content.json"]["uuid"] = "00000000-0000-0000-0000-000000000002"
+        b.freeze()
+        self.assertEqual(a["content.json"]["hash"], b["content.json"]["hash"])
+        return a, b
+
+    def _posts(self, server):
+        return [r for r in server.requests if r[0] == "POST"]
+
+    def test_duplicate(self):
+        a, b = self._containers()
+        with DatasetServer() as server:
+            a.upload(server=server.url, key=server.key)
+            received = server.received
+            b.upload(server=server.url, key=server.key)
+        self.assertEqual(len(self._posts(server)), 1)
+        self.assertEqual(server.received, received)
+        self.assertEqual(b.uuid, a.uuid)
+        self.assertFalse(b.mutable)
+
+    def test_new(self):
+        a, _ = self._containers()
+        with DatasetServer() as server:
+            a.upload(server=server.url, key=server.key)
+        self.assertEqual(len(self._posts(server)), 1)
+        self.assertIn(a.uuid, server.datasets)
+
+    def test_no_lookup(self):
+        a, b = self._containers()
+        with DatasetServer() as server:
+            a.upload(server=server.url, key=server.key)
+            b.upload(server=server.url, key=server.key, lookup=False)
+        self.assertEqual(len(self._posts(server)), 2)
+        self.assertEqual(b.uuid, a.uuid)
+
+    def test_unsupported(self):
+        a, b = self._containers()
+        with DatasetServer(lookup=False) as server:
+            a.upload(server=server.url, key=server.key)
+            b.upload(server=server.url, key=server.key)
+        self.assertEqual(len(self._posts(server)), 2)
+        self.assertEqual(b.uuid, a.uuid)
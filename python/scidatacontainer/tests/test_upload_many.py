@@ -0,0 +1,109 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock
+
+from requests import HTTPError
+
+from scidatacontainer import Container
+from scidatacontainer.filebase import TabSeparatedValuesFile
+
+from . import get_test_container
+from ._http_server import DatasetServer
+
+
+def _container(i, size=0):
+    dc = get_test_container()
+    dc["content.json"]["uuid"] = "00000000-0000-0000-0000-%012d" % i
+    dc["data/random.bin"] = os.urandom(size)
+    return dc
+
+
+class UploadManyTest(TestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.server = DatasetServer().__enter__()
+        self.config = {"server": self.server.url, "key": self.server.key}
+
+    def tearDown(self):
+        self.server.__exit__()
+        self.tmpdir.cleanup()
+
+    def test_upload_many(self):
+        containers = [_container(i) for i in range(8)]
+        results = list(
+            Container.upload_many(containers, max_workers=4, config=self.config)
+        )
+        self.assertEqual(len(results), 8)
+        for item, dc in results:
+            self.assertIs(item, dc)
+            self.assertFalse(dc.mutable)
+        self.assertEqual(set(self.server.datasets), {dc.uuid for dc in containers})
+
+    def test_files(self):
+        files = []
+        for i in range(4):
+            fn = os.path.join(self.tmpdir.name, "test%d.zdc" % i)
+            _container(i, 1000).write(fn)
+            files.append(fn)
+        results = dict(Container.upload_many(files, config=self.config))
+        for fn in files:
+            self.assertIsInstance(results[fn], Container)
+            with open(fn, "rb") as fp:
+                self.assertEqual(self.server.datasets[results[fn].uuid], fp.read())
+
+    def test_max_bytes(self):
+        files = []
+        for i in range(6):
+            fn = os.path.join(self.tmpdir.name, "test%d.zdc" % i)
+            _container(i, 100000).write(fn)
+            files.append(fn)
+        results = dict(
+            Container.upload_many(
+                files, max_workers=6, max_bytes=1000, config=self.config
+            )
+        )
+        self.assertEqual(len(results), 6)
+        self.assertEqual(self.server.concurrent, 1)
+
+    def test_max_bytes_containers(self):
+        containers = [_container(i, 100000) for i in range(6)]
+        with mock.patch.object(
+            TabSeparatedValuesFile,
+            "encode",
+            autospec=True,
+            side_effect=TabSeparatedValuesFile.encode,
+        ) as encode:
+            for dc in containers:
+                self.assertGreater(dc._estimated_size(), 100000)
+            self.assertEqual(encode.call_count, 0)
+
+            # Each container is encoded once by its worker thread
+            results = list(
+                Container.upload_many(
+                    containers, max_workers=6, max_bytes=1000, config=self.config
+                )
+            )
+            self.assertEqual(encode.call_count, 6)
+        self.assertEqual(len(results), 6)
+        self.assertEqual(self.server.concurrent, 1)
+
+    def test_errors(self):
+        a = _container(1)
+        b = _container(2)
+        b["content.json"]["uuid"] = a.uuid
+        c = _container(3)
+        c.freeze()
+        d = _container(4)
+        d.freeze()
+        results = list(Container.upload_many([a, c], config=self.config))
+        results += list(Container.upload_many([b, d], config=self.config))
+        results = {id(item): result for item, result in results}
+
+        self.assertIs(results[id(a)], a)
+        self.assertIs(results[id(c)], c)
+        self.assertIsInstance(results[id(b)], HTTPError)
+        self.assertIn("409 Conflict", str(results[id(b)]))
+
+        # Static duplicate is replaced by the server version
+        self.assertIs(results[id(d)], d)
+        self.assertEqual(d.uuid, c.uuid)
@@ -0,0 +1,171 @@
+import io
+import os
+import time
+from pathlib import Path
+from tempfile import NamedTemporaryFile, TemporaryDirectory
+from unittest import TestCase, mock
+from zipfile import ZIP_BZIP2, ZIP_DEFLATED, ZIP_LZMA, ZIP_STORED, ZipFile, ZipInfo
+
+from scidatacontainer import Container
+from scidatacontainer.zipstream import ZipWriter, compress, member_info
+
+from . import get_test_container
+
+
+class _Unseekable:
+    def __init__(self):
+        self.buffer = io.BytesIO()
+
+    def write(self, data):
+        return self.buffer.write(data)
+
+    def flush(self):
+        pass
+
+    def getvalue(self):
+        return self.buffer.getvalue()
+
+
+class ZipWriterTest(TestCase):
+    date_time = (2024, 5, 17, 12, 30, 44)
+    members = {
+        "content.json": b'{"a": 1}',
+        "data/random.bin": bytes(range(256)) * 1000,
+        "data/ümlaut.txt": "Grüße".encode("utf-8") * 100,
+        "data/empty.txt": b"",
+    }
+
+    def _zipfile(self, compress_type, compresslevel=None):
+        sink = _Unseekable()
+        with ZipFile(sink, "w", compresslevel=compresslevel) as zfp:
+            for path, data in self.members.items():
+                zinfo = ZipInfo(path, self.date_time)
+                zinfo.compress_type = compress_type
+                zfp.writestr(zinfo, data, compresslevel=compresslevel)
+        return sink.getvalue()
+
+    def _zipwriter(self, compress_type, compresslevel=None):
+        sink = _Unseekable()
+        writer = ZipWriter(sink)
+        for path, data in self.members.items():
+            zinfo = member_info(path, self.date_time, compress_type)
+            writer.write(zinfo, compress(zinfo, data, compresslevel))
+        writer.close()
+        return sink.getvalue()
+
+    def test_identical(self):
+        for compress_type in (ZIP_STORED, ZIP_DEFLATED, ZIP_BZIP2, ZIP_LZMA):
+            with self.subTest(compress_type=compress_type):
+                self.assertEqual(
+                    self._zipfile(compress_type), self._zipwriter(compress_type)
+                )
+        self.assertEqual(
+            self._zipfile(ZIP_DEFLATED, 1), self._zipwriter(ZIP_DEFLATED, 1)
+        )
+
+    def test_write_file(self):
+        with NamedTemporaryFile() as tfp:
+            tfp.write(bytes(range(256)) * 1000)
+            tfp.flush()
+
+            sink = _Unseekable()
+            with ZipFile(sink, "w", compression=ZIP_DEFLATED) as zfp:
+                zfp.write(tfp.name, "data/test.bin")
+            expected = sink.getvalue()
+
+            sink = _Unseekable()
+            writer = ZipWriter(sink)
+            writer.write_file(tfp.name, "data/test.bin", ZIP_DEFLATED)
+            writer.close()
+            self.assertEqual(expected, sink.getvalue())
+
+
+class ParallelEncodeTest(TestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.fn = os.path.join(self.tmpdir.name, "test.zdc")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_identical(self):
+        a = get_test_container()
+        for i in range(20):
+            a["data/text%02d.txt" % i] = "Lorem ipsum dolor sit amet " * (100 * i)
+
+        with NamedTemporaryFile() as tfp:
+            tfp.write(b"consectetur adipiscing elit" * 1000)
+            tfp.flush()
+            a["data/file.bin"] = {"path": Path(tfp.name)}
+            a.freeze()
+
+            localtime = time.localtime()
+            with mock.patch("time.localtime", return_value=localtime):
+                a.workers = 1
+                sequential = b"".join(a.encode())
+                a.workers = 4
+                parallel = b"".join(a.encode())
+
+        self.assertEqual(sequential, parallel)
+
+        with open(self.fn, "wb") as fp:
+            fp.write(parallel)
+        b = Container(file=self.fn)
+        self.assertEqual(b["data/text19.txt"], a["data/text19.txt"])
+        self.assertEqual(b["content.json"]["hash"], a["content.json"]["hash"])
+
+
+class DirectEncodeTest(TestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.fn = os.path.join(self.tmpdir.name, "test.zdc")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_write_encode(self):
+        a = get_test_container()
+        a["data/text.txt"] = "Lorem ipsum dolor sit amet " * 100000
+        with NamedTemporaryFile() as tfp:
+            tfp.write(b"consectetur adipiscing elit" * 100000)
+            tfp.flush()
+            a["data/file.bin"] = {"path": Path(tfp.name)}
+            a.freeze()
+
+            localtime = time.localtime()
+            with mock.patch("time.localtime", return_value=localtime):
+                with mock.patch("threading.Thread.start") as start:
+                    chunks = list(a.encode())
+                    a.write(self.fn)
+                start.assert_not_called()
+
+        with open(self.fn, "rb") as fp:
+            self.assertEqual(fp.read(), b"".join(chunks))
+        self.assertGreater(len(chunks), 2)
+
+        b = Container(file=self.fn)
+        self.assertEqual(b["data/text.txt"], a["data/text.txt"])
+        self.assertEqual(b["content.json"]["hash"], a["content.json"]["hash"])
+
+    def test_freeze_failure(self):
+        a = get_test_container()
+        a["data/text.txt"] = "Lorem ipsum dolor sit amet"
+        content = dict(a["content.json"], storageTime=None)
+        with mock.patch.object(ZipWriter, "close", side_effect=OSError):
+            with self.assertRaises(OSError):
+                a.write(self.fn, freeze=True)
+        self.assertTrue(a.mutable)
+        self.assertEqual(dict(a["content.json"], storageTime=None), content)
+        self.assertFalse(a["content.json"]["static"])
+        self.assertIsNone(a["content.json"]["hash"])
+
+        # An abandoned encoder does not freeze the container either
+        chunks = a.encode(freeze=True)
+        next(chunks)
+        chunks.close()
+        self.assertTrue(a.mutable)
+        self.assertEqual(dict(a["content.json"], storageTime=None), content)
+
+        a.write(self.fn, freeze=True)
+        self.assertFalse(a.mutable)
+        self.assertTrue(a["content.json"]["static"])
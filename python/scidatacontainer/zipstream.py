@@ -0,0 +1,546 @@
+##########################################################################
+# Copyright (c) 2023-2024 Reinhard Caspary                               #
+# <reinhard.caspary@phoenixd.uni-hannover.de>                            #
+# This program is free software under the terms of the MIT license.      #
+##########################################################################
+#
+# This module provides the class ZipWriter, which writes a ZIP package
+# to an unseekable stream. In contrast to zipfile.ZipFile, the members
+# are passed as already compressed data. This allows to compress the
+# members concurrently and to write them in a deterministic order. The
+# output is identical to the one of zipfile.ZipFile writing the same
+# members to an unseekable stream.
+#
+# Besides the compression methods of zipfile, the method Zstandard is
+# supported, if the Python module zstandard is available. Large members
+# are compressed by all CPU cores in this case. The function
+# open_member() reads Zstandard members, which are not supported by
+# zipfile before Python 3.14.
+#
+##########################################################################
+
+import bz2
+import copy
+import io
+import lzma
+import struct
+import typing
+import zipfile
+import zlib
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from zipfile import (
+    ZIP64_LIMIT,
+    ZIP64_VERSION,
+    ZIP_BZIP2,
+    ZIP_DEFLATED,
+    ZIP_FILECOUNT_LIMIT,
+    ZIP_LZMA,
+    ZIP_STORED,
+    BZIP2_VERSION,
+    LZMA_VERSION,
+    BadZipFile,
+    ZipFile,
+    ZipInfo,
+    sizeEndCentDir64,
+    sizeFileHeader,
+    stringCentralDir,
+    stringEndArchive,
+    stringEndArchive64,
+    stringEndArchive64Locator,
+    structCentralDir,
+    structEndArchive,
+    structEndArchive64,
+    structEndArchive64Locator,
+    structFileHeader,
+    stringFileHeader,
+)
+
+try:
+    import zstandard
+except ModuleNotFoundError:
+    zstandard = None
+
+# Zstandard compression method
+ZIP_ZSTANDARD = 93
+ZSTANDARD_VERSION = 63
+
+# Number of threads used by Zstandard for members of at least the given
+# size (-1: number of CPU cores)
+ZSTD_THREADS = -1
+ZSTD_THREADS_SIZE = 4 * 1024 * 1024
+
+# Zipfile supports Zstandard since Python 3.14
+_ZIPFILE_ZSTD = getattr(zipfile, "ZIP_ZSTANDARD", None) == ZIP_ZSTANDARD
+
+# General purpose flags of a ZIP member
+_MASK_COMPRESS_OPTION_1 = 0x02
+_MASK_USE_DATA_DESCRIPTOR = 0x08
+_MASK_UTF_FILENAME = 0x800
+
+# Signature of a data descriptor
+_DD_SIGNATURE = 0x08074B50
+
+# Size of data chunks read from files
+CHUNK_SIZE = 65536
+
+
+def compressor(
+    compress_type: int, compresslevel: int | None = None, size: int | None = None
+):
+    """Return a compressor object for the given compression method or
+    None for uncompressed data.
+
+    Compression levels outside of the valid range (BZIP2 and LZMA: 0-9,
+    Zstandard: 1-22) select the default level of the method. Zstandard
+    requires the module zstandard and raises NotImplementedError like
+    zipfile for unsupported methods otherwise.
+
+    Args:
+        compress_type: Numeric constant for the compression method.
+        compresslevel: Level of compression.
+        size: Expected size of the uncompressed data, if known.
+    """
+    if compress_type == ZIP_DEFLATED:
+        if compresslevel is None:
+            compresslevel = zlib.Z_DEFAULT_COMPRESSION
+        return zlib.compressobj(compresslevel, zlib.DEFLATED, -15)
+    elif compress_type == ZIP_BZIP2:
+        if compresslevel is None or not 1 <= compresslevel <= 9:
+            return bz2.BZ2Compressor()
+        return bz2.BZ2Compressor(compresslevel)
+    elif compress_type == ZIP_LZMA:
+        if compresslevel is None or not 0 <= compresslevel <= 9:
+            return _LZMACompressor()
+        return _LZMACompressor(compresslevel)
+    elif compress_type == ZIP_ZSTANDARD:
+        if zstandard is None:
+            raise NotImplementedError(
+                "Zstandard compression requires module zstandard!"
+            )
+        if compresslevel is None or not 1 <= compresslevel <= 22:
+            compresslevel = 3
+        threads = 0
+        if size is not None and size >= ZSTD_THREADS_SIZE:
+            threads = ZSTD_THREADS
+        comp = zstandard.ZstdCompressor(level=compresslevel, threads=threads)
+        return comp.compressobj(size=-1 if size is None else size)
+    return None
+
+
+class _LZMACompressor:
+    """LZMA compressor for ZIP members with a given preset level. The
+    member data starts with the version of the LZMA SDK and the
+    properties of the LZMA1 filter."""
+
+    def __init__(self, preset: int = lzma.PRESET_DEFAULT) -> None:
+        filters = [{"id": lzma.FILTER_LZMA1, "preset": preset}]
+
+        # The .lzma format starts with the same five bytes of properties
+        props = lzma.compress(b"", lzma.FORMAT_ALONE, filters=filters)[:5]
+        self._header: bytes = struct.pack("<BBH", 9, 4, len(props)) + props
+        self._comp = lzma.LZMACompressor(lzma.FORMAT_RAW, filters=filters)
+
+    def compress(self, data: bytes) -> bytes:
+        header, self._header = self._header, b""
+        return header + self._comp.compress(data)
+
+    def flush(self) -> bytes:
+        header, self._header = self._header, b""
+        return header + self._comp.flush()
+
+
+def member_info(
+    zinfo: ZipInfo | str,
+    date_time: tuple | None = None,
+    compress_type: int = ZIP_DEFLATED,
+) -> ZipInfo:
+    """Prepare the ZipInfo object of a new member.
+
+    Args:
+        zinfo: ZipInfo object or name of the member.
+        date_time: Modification time of the member.
+        compress_type: Numeric constant for the compression method.
+
+    Returns:
+        ZipInfo: Member information ready for ZipWriter.
+    """
+    if not isinstance(zinfo, ZipInfo):
+        zinfo = ZipInfo(zinfo, date_time)
+    zinfo.compress_type = compress_type
+    zinfo.flag_bits = _MASK_USE_DATA_DESCRIPTOR
+    if compress_type == ZIP_LZMA:
+        zinfo.flag_bits |= _MASK_COMPRESS_OPTION_1
+    elif compress_type == ZIP_ZSTANDARD:
+        zinfo.extract_version = max(zinfo.extract_version, ZSTANDARD_VERSION)
+        zinfo.create_version = max(zinfo.create_version, ZSTANDARD_VERSION)
+    if not zinfo.external_attr:
+        zinfo.external_attr = 0o600 << 16
+    zinfo.CRC = 0
+    zinfo.compress_size = 0
+    return zinfo
+
+
+def compress(zinfo: ZipInfo, data: bytes, compresslevel: int | None = None) -> bytes:
+    """Compress the data of a member and store CRC and sizes in the
+    given ZipInfo object.
+
+    Args:
+        zinfo: Member information prepared by member_info().
+        data: Uncompressed data of the member.
+        compresslevel: Level of compression.
+
+    Returns:
+        bytes: Compressed data of the member.
+    """
+    zinfo.file_size = len(data)
+    zinfo.CRC = zlib.crc32(data)
+    comp = compressor(zinfo.compress_type, compresslevel, len(data))
+    if comp is not None:
+        data = comp.compress(data) + comp.flush()
+    zinfo.compress_size = len(data)
+    return data
+
+
+def data_offset(info: ZipInfo, header: bytes) -> int:
+    """Return the offset of the data of a member from its local file
+    header.
+
+    Args:
+        info: Member information from the central directory.
+        header: Local file header of the member.
+    """
+    if len(header) != sizeFileHeader or header[:4] != stringFileHeader:
+        raise BadZipFile("Bad magic number for file header")
+
+    # Skip file name and extra field of the local file header
+    header = struct.unpack(structFileHeader, header)
+    return info.header_offset + sizeFileHeader + header[10] + header[11]
+
+
+def open_member(zfp: ZipFile, info: ZipInfo) -> typing.IO[bytes]:
+    """Open a member of a ZIP package for reading. In contrast to
+    ZipFile.open(), Zstandard members are supported by all Python
+    versions.
+
+    Args:
+        zfp: ZIP package opened for reading.
+        info: Member information.
+
+    Returns:
+        File object of the uncompressed member data.
+    """
+    if info.compress_type != ZIP_ZSTANDARD or _ZIPFILE_ZSTD:
+        return zfp.open(info)
+    if zstandard is None:
+        raise NotImplementedError("Zstandard decompression requires module zstandard!")
+
+    # Read the raw member data as if it was stored without compression
+    raw = copy.copy(info)
+    raw.compress_type = ZIP_STORED
+    raw.file_size = info.compress_size
+    raw.CRC = None
+    with zfp.open(raw) as fp:
+        data = fp.read()
+    data = zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    if len(data) != info.file_size or zlib.crc32(data) != info.CRC:
+        raise BadZipFile("Bad CRC-32 for file %r" % info.filename)
+    return io.BytesIO(data)
+
+
+def read_member(zfp: ZipFile, info: ZipInfo) -> bytes:
+    """Return the uncompressed data of a member of a ZIP package. See
+    open_member()."""
+    with open_member(zfp, info) as fp:
+        return fp.read()
+
+
+def imap(func: Callable, iterable: Iterable, workers: int = 1) -> Iterator[typing.Any]:
+    """Apply func to all elements of iterable using a pool of worker
+    threads and yield the results in the order of the elements.
+
+    The number of pending results is limited to twice the number of
+    workers.
+
+    Args:
+        func: Function to apply.
+        iterable: Arguments of the function.
+        workers: Number of worker threads.
+    """
+    if workers is None or workers <= 1:
+        yield from map(func, iterable)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for value in iterable:
+            pending.append(pool.submit(func, value))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class ZipWriter:
+    """Writer for ZIP packages on unseekable streams."""
+
+    def __init__(self, fp: typing.IO[bytes], offset: int = 0) -> None:
+        """Construct a ZipWriter object.
+
+        Args:
+            fp: File object with a write() method.
+            offset: Current position in the ZIP package, if members are
+                appended to existing data.
+        """
+        self.fp: typing.IO[bytes] = fp
+        self.offset: int = offset
+        self.filelist: list[ZipInfo] = []
+
+    def _write(self, data: bytes):
+        self.fp.write(data)
+        self.offset += len(data)
+
+    def _header(self, zinfo: ZipInfo) -> bool:
+        """Write local file header and return the ZIP64 flag."""
+        # Compressed size can be larger than uncompressed size
+        zip64 = zinfo.file_size * 1.05 > ZIP64_LIMIT
+        zinfo.header_offset = self.offset
+        self._write(zinfo.FileHeader(zip64))
+        return zip64
+
+    def _descriptor(self, zinfo: ZipInfo, zip64: bool):
+        """Write data descriptor and register the member."""
+        if not zip64:
+            if zinfo.file_size > ZIP64_LIMIT:
+                raise RuntimeError("File size too large, try using force_zip64")
+            if zinfo.compress_size > ZIP64_LIMIT:
+                raise RuntimeError("Compressed size too large, try using force_zip64")
+        fmt = "<LLQQ" if zip64 else "<LLLL"
+        self._write(
+            struct.pack(
+                fmt, _DD_SIGNATURE, zinfo.CRC, zinfo.compress_size, zinfo.file_size
+            )
+        )
+        self.filelist.append(zinfo)
+
+    def write(self, zinfo: ZipInfo, data: bytes):
+        """Write a member with compressed data.
+
+        Args:
+            zinfo: Member information with CRC and sizes as returned
+                from compress().
+            data: Compressed data of the member.
+        """
+        zip64 = self._header(zinfo)
+        self._write(data)
+        self._descriptor(zinfo, zip64)
+
+    def write_file(
+        self,
+        fn: str,
+        arcname: str,
+        compress_type: int = ZIP_DEFLATED,
+        compresslevel: int | None = None,
+        hash_object=None,
+    ):
+        """Compress a file chunkwise and write it as member.
+
+        Args:
+            fn: Name of the file.
+            arcname: Name of the member in the ZIP package.
+            compress_type: Numeric constant for the compression method.
+            compresslevel: Level of compression.
+            hash_object: If given, the uncompressed data is fed to this
+                hash object, too.
+        """
+        for _ in self.iter_file(fn, arcname, compress_type, compresslevel, hash_object):
+            pass
+
+    def iter_file(
+        self,
+        fn: str,
+        arcname: str,
+        compress_type: int = ZIP_DEFLATED,
+        compresslevel: int | None = None,
+        hash_object=None,
+    ) -> Iterator[None]:
+        """Compress a file chunkwise and write it as member. This
+        generator yields after each chunk.
+
+        Args:
+            fn: Name of the file.
+            arcname: Name of the member in the ZIP package.
+            compress_type: Numeric constant for the compression method.
+            compresslevel: Level of compression.
+            hash_object: If given, the uncompressed data is fed to this
+                hash object, too.
+        """
+        zinfo = member_info(ZipInfo.from_file(fn, arcname), None, compress_type)
+        with open(fn, "rb") as fp:
+            chunks = iter(lambda: fp.read(CHUNK_SIZE), b"")
+            yield from self.iter_chunks(zinfo, chunks, compresslevel, hash_object)
+
+    def iter_chunks(
+        self,
+        zinfo: ZipInfo,
+        chunks: Iterable[bytes],
+        compresslevel: int | None = None,
+        hash_object=None,
+    ) -> Iterator[None]:
+        """Compress consecutive chunks of data and write them as member.
+        This generator yields after each chunk.
+
+        Args:
+            zinfo: Member information as returned from member_info(). Its
+                attribute file_size must be set to the expected size,
+                which selects ZIP64 extensions and compressor threads.
+            chunks: Iterable of bytes-like objects.
+            compresslevel: Level of compression.
+            hash_object: If given, the uncompressed data is fed to this
+                hash object, too.
+        """
+        comp = compressor(zinfo.compress_type, compresslevel, zinfo.file_size)
+        zip64 = self._header(zinfo)
+        size = 0
+        for chunk in chunks:
+            size += len(chunk)
+            zinfo.CRC = zlib.crc32(chunk, zinfo.CRC)
+            if hash_object is not None:
+                hash_object.update(chunk)
+            if comp is not None:
+                chunk = comp.compress(chunk)
+            zinfo.compress_size += len(chunk)
+            self._write(chunk)
+            yield
+        if comp is not None:
+            chunk = comp.flush()
+            zinfo.compress_size += len(chunk)
+            self._write(chunk)
+        zinfo.file_size = size
+        self._descriptor(zinfo, zip64)
+
+    def close(self):
+        """Write the central directory and the end record."""
+        start_dir = self.offset
+        for zinfo in self.filelist:
+            self._central_directory(zinfo)
+        end_dir = self.offset
+
+        count = len(self.filelist)
+        size = end_dir - start_dir
+        offset = start_dir
+        if count > ZIP_FILECOUNT_LIMIT or offset > ZIP64_LIMIT or size > ZIP64_LIMIT:
+            # Need to write the ZIP64 end-of-archive records
+            self._write(
+                struct.pack(
+                    structEndArchive64,
+                    stringEndArchive64,
+                    sizeEndCentDir64 - 12,
+                    ZIP64_VERSION,
+                    ZIP64_VERSION,
+                    0,
+                    0,
+                    count,
+                    count,
+                    size,
+                    offset,
+                )
+            )
+            self._write(
+                struct.pack(
+                    structEndArchive64Locator, stringEndArchive64Locator, 0, end_dir, 1
+                )
+            )
+            count = min(count, 0xFFFF)
+            size = min(size, 0xFFFFFFFF)
+            offset = min(offset, 0xFFFFFFFF)
+
+        self._write(
+            struct.pack(
+                structEndArchive, stringEndArchive, 0, 0, count, count, size, offset, 0
+            )
+        )
+        if hasattr(self.fp, "flush"):
+            self.fp.flush()
+
+    def _central_directory(self, zinfo: ZipInfo):
+        """Write the central directory entry of a member."""
+        dt = zinfo.date_time
+        dosdate = (dt[0] - 1980) << 9 | dt[1] << 5 | dt[2]
+        dostime = dt[3] << 11 | dt[4] << 5 | (dt[5] // 2)
+
+        extra = []
+        if zinfo.file_size > ZIP64_LIMIT or zinfo.compress_size > ZIP64_LIMIT:
+            extra.append(zinfo.file_size)
+            extra.append(zinfo.compress_size)
+            file_size = 0xFFFFFFFF
+            compress_size = 0xFFFFFFFF
+        else:
+            file_size = zinfo.file_size
+            compress_size = zinfo.compress_size
+
+        if zinfo.header_offset > ZIP64_LIMIT:
+            extra.append(zinfo.header_offset)
+            header_offset = 0xFFFFFFFF
+        else:
+            header_offset = zinfo.header_offset
+
+        extra_data = zinfo.extra
+        min_version = 0
+        if extra:
+            # Prepend a ZIP64 field to the extra fields
+            extra_data = struct.pack(
+                "<HH" + "Q" * len(extra), 1, 8 * len(extra), *extra
+            ) + _strip_extra(extra_data, 1)
+            min_version = ZIP64_VERSION
+
+        if zinfo.compress_type == ZIP_BZIP2:
+            min_version = max(BZIP2_VERSION, min_version)
+        elif zinfo.compress_type == ZIP_LZMA:
+            min_version = max(LZMA_VERSION, min_version)
+
+        extract_version = max(min_version, zinfo.extract_version)
+        create_version = max(min_version, zinfo.create_version)
+        try:
+            filename = zinfo.filename.encode("ascii")
+            flag_bits = zinfo.flag_bits
+        except UnicodeEncodeError:
+            filename = zinfo.filename.encode("utf-8")
+            flag_bits = zinfo.flag_bits | _MASK_UTF_FILENAME
+
+        centdir = struct.pack(
+            structCentralDir,
+            stringCentralDir,
+            create_version,
+            zinfo.create_system,
+            extract_version,
+            zinfo.reserved,
+            flag_bits,
+            zinfo.compress_type,
+            dostime,
+            dosdate,
+            zinfo.CRC,
+            compress_size,
+            file_size,
+            len(filename),
+            len(extra_data),
+            len(zinfo.comment),
+            0,
+            zinfo.internal_attr,
+            zinfo.external_attr,
+            header_offset,
+        )
+        self._write(centdir + filename + extra_data + zinfo.comment)
+
+
+def _strip_extra(extra: bytes, xid: int) -> bytes:
+    """Remove all extra fields with the given id."""
+    result = []
+    i = 0
+    while i + 4 <= len(extra):
+        tag, size = struct.unpack("<HH", extra[i : i + 4])
+        if tag != xid:
+            result.append(extra[i : i + 4 + size])
+        i += 4 + size
+    return b"".join(result)